@@ -2,18 +2,52 @@
 # This backend manages projects, tasks, and provides analytics
 # Lines: 1000+
 
-from fastapi import FastAPI, HTTPException, Depends, Query, Path, Body, status
+from fastapi import FastAPI, HTTPException, Depends, Query, Path, Body, Header, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Dict, Any
-from datetime import datetime, timedelta
+from typing import Annotated, List, Literal, Optional, Dict, Any, Union
+from datetime import datetime, date, timedelta
 from enum import Enum
 import mysql.connector
 from mysql.connector import Error, pooling
+from mysql.connector.errors import PoolError
 import logging
 import json
-from contextlib import contextmanager
+import asyncio
+import base64
+import csv
+import hashlib
+import inspect
+import io
+import os
+import re
+import sqlite3
+import time
+from decimal import Decimal, ROUND_HALF_UP
+from abc import ABC, abstractmethod
+from bisect import bisect_left, bisect_right, insort
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from functools import lru_cache, partial
+from contextvars import ContextVar
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+
+try:
+    import aiomysql
+except ImportError:  # optional: only needed when DB_DRIVER=aiomysql
+    aiomysql = None
+
+try:
+    import redis.asyncio as redis_asyncio
+except ImportError:  # optional: only needed when PROJECT_CACHE_SHARED is a redis:// URL
+    redis_asyncio = None
+
+try:
+    import orjson
+except ImportError:  # optional: FAST_JSON falls back to the json module without it
+    orjson = None
 
 # ===== LOGGING SETUP =====
 logging.basicConfig(
@@ -42,7 +76,49 @@ class PriorityLevel(str, Enum):
     HIGH = "high"
     CRITICAL = "critical"
 
+class TaskInclude(str, Enum):
+    """How much task data to embed in project responses"""
+    NONE = "none"
+    SUMMARY = "summary"
+    FULL = "full"
+
+class SearchScope(str, Enum):
+    """Which tables a search covers"""
+    ALL = "all"
+    PROJECTS = "projects"
+    TASKS = "tasks"
+
+class SearchMode(str, Enum):
+    """Full-text matching mode"""
+    NATURAL = "natural"
+    PREFIX = "prefix"
+
+class ExportFormat(str, Enum):
+    """Export file format"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+class BatchMode(str, Enum):
+    """How a batch handles a failing operation"""
+    ATOMIC = "atomic"
+    INDEPENDENT = "independent"
+
+class BatchOutcome(str, Enum):
+    """What became of one batch operation"""
+    COMMITTED = "committed"
+    FAILED = "failed"
+    ROLLED_BACK = "rolled_back"
+    NOT_EXECUTED = "not_executed"
+
 # ===== PYDANTIC MODELS FOR VALIDATION =====
+def _date_text(value):
+    """Render DATE/TIMESTAMP column values the way the API has always returned them"""
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
 class TaskBase(BaseModel):
     """Base model for task with comprehensive validation"""
     title: str = Field(..., min_length=3, max_length=255, description="Task title")
@@ -75,12 +151,28 @@ class TaskUpdate(BaseModel):
     priority: Optional[PriorityLevel] = None
     description: Optional[str] = None
 
+class TaskBulkUpdate(TaskUpdate):
+    """Model for one task update inside a bulk request"""
+    id: int = Field(..., gt=0)
+
+class TaskBulkRequest(BaseModel):
+    """Model for bulk task writes against one project"""
+    create: List[TaskCreate] = Field([], max_length=1000)
+    update: List[TaskBulkUpdate] = Field([], max_length=1000)
+    delete: List[int] = Field([], max_length=1000)
+
 class Task(TaskBase):
     """Model for task responses"""
     id: int
     project_id: int
+    version: int = Field(1, description="Row version; send it back quoted in If-Match to make a write conditional")
     created_at: Optional[str] = None
 
+    @validator('deadline', 'created_at', pre=True)
+    def format_dates(cls, v):
+        """Accept date and datetime values read from the database"""
+        return _date_text(v)
+
     class Config:
         from_attributes = True
 
@@ -121,12 +213,28 @@ class ProjectUpdate(BaseModel):
     team: Optional[List[str]] = None
     category: Optional[str] = None
 
+class TaskSummary(BaseModel):
+    """Model for per-status task counts of a project"""
+    total: int = 0
+    pending: int = 0
+    in_progress: int = 0
+    completed: int = 0
+
 class Project(ProjectBase):
     """Model for project responses"""
     id: int
     progress: int = 0
     tasks: List[Task] = []
+    task_summary: Optional[TaskSummary] = None
+    tasks_url: Optional[str] = Field(None, description="Paged list of every task when `tasks` was cut short")
+    version: int = Field(1, description="Row version; send it back quoted in If-Match to make a write conditional")
     created_at: Optional[str] = None
+    archived_at: Optional[str] = None
+
+    @validator('deadline', 'created_at', 'archived_at', pre=True)
+    def format_dates(cls, v):
+        """Accept date and datetime values read from the database"""
+        return _date_text(v)
 
     class Config:
         from_attributes = True
@@ -142,6 +250,128 @@ class ProjectStats(BaseModel):
     average_progress: float
     total_budget: float
 
+class TaskBulkResult(BaseModel):
+    """Model for bulk task write responses"""
+    created: List[Task] = []
+    updated: List[int] = []
+    deleted: List[int] = []
+
+class BatchProjectCreate(BaseModel):
+    """Batch operation creating a project, as POST /api/projects"""
+    op: Literal["project.create"]
+    body: ProjectCreate
+
+class BatchProjectUpdate(BaseModel):
+    """Batch operation updating a project, as PUT /api/projects/{project_id}"""
+    op: Literal["project.update"]
+    project_id: int = Field(..., gt=0)
+    if_match: Optional[str] = None
+    body: ProjectUpdate
+
+class BatchProjectDelete(BaseModel):
+    """Batch operation deleting a project, as DELETE /api/projects/{project_id}"""
+    op: Literal["project.delete"]
+    project_id: int = Field(..., gt=0)
+    if_match: Optional[str] = None
+
+class BatchTaskCreate(BaseModel):
+    """Batch operation creating a task, as POST /api/projects/{project_id}/tasks"""
+    op: Literal["task.create"]
+    project_id: int = Field(..., gt=0)
+    body: TaskCreate
+
+class BatchTaskUpdate(BaseModel):
+    """Batch operation updating a task, as PUT /api/projects/{project_id}/tasks/{task_id}"""
+    op: Literal["task.update"]
+    project_id: int = Field(..., gt=0)
+    task_id: int = Field(..., gt=0)
+    if_match: Optional[str] = None
+    body: TaskUpdate
+
+class BatchTaskDelete(BaseModel):
+    """Batch operation deleting a task, as DELETE /api/projects/{project_id}/tasks/{task_id}"""
+    op: Literal["task.delete"]
+    project_id: int = Field(..., gt=0)
+    task_id: int = Field(..., gt=0)
+    if_match: Optional[str] = None
+
+BatchOperation = Annotated[
+    Union[BatchProjectCreate, BatchProjectUpdate, BatchProjectDelete,
+          BatchTaskCreate, BatchTaskUpdate, BatchTaskDelete],
+    Field(discriminator="op")
+]
+
+class BatchRequest(BaseModel):
+    """Model for an ordered list of project and task writes run in one transaction"""
+    mode: BatchMode = BatchMode.ATOMIC
+    operations: List[BatchOperation] = Field(..., min_length=1, max_length=100)
+
+class BatchResult(BaseModel):
+    """Model for the outcome of one batch operation"""
+    index: int
+    status: int = Field(..., description="Status code the single-operation endpoint would have returned")
+    outcome: BatchOutcome
+    body: Any = None
+    etag: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    """Model for batch responses; there is one result per operation, in request order"""
+    committed: bool
+    results: List[BatchResult]
+
+class MemberWorkload(BaseModel):
+    """Model for one assignee's workload across all projects"""
+    assignee: str
+    total_tasks: int
+    pending_tasks: int
+    in_progress_tasks: int
+    completed_tasks: int
+    overdue_tasks: int
+    projects_count: int
+
+class AssignmentSummary(BaseModel):
+    """Model for one assignee's tasks within one project"""
+    assignee: str
+    project_id: int
+    project_name: str
+    project_status: ProjectStatus
+    total_tasks: int
+    pending_tasks: int
+    in_progress_tasks: int
+    completed_tasks: int
+    overdue_tasks: int
+
+class DueTask(BaseModel):
+    """Model for an open task listed by deadline"""
+    id: int
+    project_id: int
+    title: str
+    status: TaskStatus
+    priority: PriorityLevel
+    assignee: Optional[str] = None
+    deadline: date
+    days_until_deadline: int
+
+class SyncResult(BaseModel):
+    """Model for delta sync responses"""
+    token: Optional[str] = Field(None, description="Token for the next sync; only set on the last page")
+    projects: List[Project] = []
+    tasks: List[Task] = []
+    deleted_projects: List[int] = []
+    deleted_tasks: List[int] = []
+
+class SearchHit(BaseModel):
+    """Model for a single full-text search result"""
+    kind: str = Field(..., description="'project' or 'task'")
+    id: int
+    project_id: int
+    title: str
+    snippet: Optional[str] = None
+    status: str
+    priority: str
+    category: Optional[str] = None
+    score: float
+
 class ErrorResponse(BaseModel):
     """Model for error responses"""
     error: str
@@ -150,560 +380,4763 @@ class ErrorResponse(BaseModel):
 
 # ===== DATABASE CONFIGURATION =====
 DB_CONFIG = {
-    'host': 'localhost',
-    'user': 'root',
-    'password': 'password',
-    'database': 'project_manager',
+    'host': os.getenv("DB_HOST", "localhost"),
+    'port': int(os.getenv("DB_PORT", "3306")),
+    'user': os.getenv("DB_USER", "root"),
+    'password': os.getenv("DB_PASSWORD", "password"),
+    'database': os.getenv("DB_NAME", "project_manager"),
     'autocommit': False,
     'auth_plugin': 'mysql_native_password'
 }
 
-connection_pool = None
+# Read replica for GET requests; leave DB_READ_HOST empty to read from the primary
+DB_READ_CONFIG = {
+    **DB_CONFIG,
+    'host': os.getenv("DB_READ_HOST", ""),
+    'port': int(os.getenv("DB_READ_PORT", str(DB_CONFIG['port']))),
+    'user': os.getenv("DB_READ_USER", DB_CONFIG['user']),
+    'password': os.getenv("DB_READ_PASSWORD", DB_CONFIG['password'])
+}
 
-def init_connection_pool():
-    """Initialize database connection pool"""
-    global connection_pool
-    try:
-        connection_pool = pooling.MySQLConnectionPool(
-            pool_name="pmpool",
-            pool_size=10,
-            pool_reset_session=True,
-            **DB_CONFIG
-        )
-        logger.info("Database connection pool initialized successfully")
-    except Error as e:
-        logger.error(f"Error creating connection pool: {e}")
-        raise
+# "mysql-connector" runs the blocking driver on the threadpool,
+# "aiomysql" talks to MySQL natively on the event loop,
+# "sqlite" uses an embedded database file for local runs and benchmarks
+DB_DRIVER = os.getenv("DB_DRIVER", "mysql-connector")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+# Requests that may wait for a connection once every pooled one is checked
+# out; beyond that requests are shed with 503 at once
+DB_POOL_QUEUE_SIZE = int(os.getenv("DB_POOL_QUEUE_SIZE", "50"))
+# Seconds a queued request waits for a connection before it is shed with 503
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "5"))
+# Size of the read pool; defaults to DB_POOL_SIZE. With SQLite, setting it
+# opens a separate pool of reader connections on the same WAL database.
+DB_READ_POOL_SIZE = int(os.getenv("DB_READ_POOL_SIZE", "0"))
+SQLITE_PATH = os.getenv("SQLITE_PATH", "project_manager.db")
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "5"))
 
-@contextmanager
-def get_db_connection():
-    """Context manager for database connections"""
-    conn = None
-    try:
-        conn = connection_pool.get_connection()
-        yield conn
-        conn.commit()
-    except Error as e:
-        if conn:
-            conn.rollback()
-        logger.error(f"Database error: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Database operation failed"
-        )
-    finally:
-        if conn and conn.is_connected():
-            conn.close()
+# After a successful write a client reads from the primary for this many
+# seconds, long enough for the replica to catch up with its own writes
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "5"))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", "5"))
 
-# ===== FASTAPI APPLICATION INITIALIZATION =====
-app = FastAPI(
-    title="Enterprise Project Management API",
-    description="Professional-grade API for comprehensive project management",
-    version="1.0.0",
-    docs_url="/api/docs",
-    redoc_url="/api/redoc"
-)
+PRIMARY = "primary"
+REPLICA = "replica"
 
-# ===== CORS MIDDLEWARE =====
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-    max_age=3600
-)
+if DB_DRIVER == "sqlite":
+    REPLICA_ENABLED = DB_READ_POOL_SIZE > 0
+    REPLICA_LAGS = False
+else:
+    REPLICA_ENABLED = bool(DB_READ_CONFIG['host'])
+    REPLICA_LAGS = True
 
-# ===== STARTUP AND SHUTDOWN EVENTS =====
-@app.on_event("startup")
-async def startup_event():
-    """Initialize database on startup"""
-    try:
-        init_connection_pool()
-        init_db()
-        logger.info("Application started successfully")
-    except Exception as e:
-        logger.error(f"Startup error: {e}")
-        raise
+# Open pools by role; the replica pool exists only while it is reachable
+db_pools = {}
+replica_healthy = False
+background_tasks = []
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    """Cleanup on shutdown"""
-    global connection_pool
-    if connection_pool:
-        try:
-            connection_pool.close()
-            logger.info("Database pool closed")
-        except Exception as e:
-            logger.error(f"Error closing pool: {e}")
+# Pool that db_session() uses by default, set per request by ReadRoutingMiddleware
+read_routing: ContextVar[str] = ContextVar("read_routing", default=PRIMARY)
 
-# ===== DATABASE INITIALIZATION =====
-def init_db():
-    """Initialize database with tables"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        try:
-            # Create projects table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS projects (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    name VARCHAR(255) NOT NULL UNIQUE,
-                    description TEXT,
-                    status ENUM('planning', 'in-progress', 'completed') DEFAULT 'planning',
-                    progress INT DEFAULT 0 CHECK (progress >= 0 AND progress <= 100),
-                    deadline DATE,
-                    priority ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
-                    budget DECIMAL(15, 2) DEFAULT 0,
-                    team JSON,
-                    category VARCHAR(100),
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    INDEX idx_status (status),
-                    INDEX idx_priority (priority),
-                    INDEX idx_created_at (created_at)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """)
-
-            # Create tasks table
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS tasks (
-                    id INT AUTO_INCREMENT PRIMARY KEY,
-                    project_id INT NOT NULL,
-                    title VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    status ENUM('pending', 'in-progress', 'completed') DEFAULT 'pending',
-                    deadline DATE,
-                    assignee VARCHAR(255),
-                    priority ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
-                    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
-                    INDEX idx_project_id (project_id),
-                    INDEX idx_status (status)
-                ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
-            """)
-
-            conn.commit()
-            logger.info("Database tables initialized")
-        except Error as e:
-            conn.rollback()
-            logger.error(f"Error initializing database: {e}")
+class DatabaseError(Exception):
+    """Driver-independent database error raised by database sessions"""
+    pass
 
-# ===== HEALTH CHECK ENDPOINT =====
-@app.get("/api/health", tags=["Health"])
-async def health_check():
-    """Health check endpoint"""
-    try:
-        with get_db_connection() as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-        return {
-            "status": "ok",
-            "message": "API is running",
-            "timestamp": datetime.now().isoformat()
-        }
-    except Exception as e:
-        logger.error(f"Health check failed: {e}")
-        return JSONResponse(
-            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-            content={"status": "error", "detail": str(e)}
-        )
+class BaseSession:
+    """Statement API shared by the driver-specific sessions
 
-# ===== PROJECT ENDPOINTS =====
+    Subclasses implement _statement and _statement_many; every statement
+    issued through this API is timed and counted for the metrics registry.
+    """
 
-@app.get("/api/projects", response_model=List[Project], tags=["Projects"])
-def get_all_projects(
-    status_filter: Optional[str] = Query(None, alias="status"),
-    priority_filter: Optional[str] = Query(None, alias="priority"),
-    skip: int = Query(0, ge=0),
-    limit: int = Query(100, ge=1, le=1000)
-):
-    """Get all projects with optional filtering"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
+    dialect = "mysql"
+
+    def __init__(self, conn):
+        self.conn = conn
+        self.pool = None
+        self.role = PRIMARY
+        self.lastrowid = None
+        self.rowcount = 0
+        self.gate = None
+        self.after_commit = []
+        # Per-project task counter deltas held back by flush_task_counts
+        # callers (batches); None writes them immediately
+        self.task_counts = None
+
+    async def _timed(self, query: str, param_count: int, awaitable):
+        started = time.perf_counter()
         try:
-            query = "SELECT * FROM projects WHERE 1=1"
-            params = []
+            return await awaitable
+        finally:
+            record_statement(query, param_count, time.perf_counter() - started)
 
-            if status_filter:
-                query += " AND status = %s"
-                params.append(status_filter)
+    async def execute(self, query: str, params=()) -> int:
+        """Execute a statement and return the affected row count"""
+        await self._timed(query, len(params), self._statement(query, params, None))
+        return self.rowcount
 
-            if priority_filter:
-                query += " AND priority = %s"
-                params.append(priority_filter)
+    async def executemany(self, query: str, seq_params) -> int:
+        """Execute a statement once per parameter set and return the affected row count"""
+        seq_params = list(seq_params)
+        await self._timed(query, len(seq_params), self._statement_many(query, seq_params))
+        return self.rowcount
+
+    async def fetchone(self, query: str, params=()) -> Optional[Dict[str, Any]]:
+        """Execute a query and return its first row"""
+        return await self._timed(query, len(params), self._statement(query, params, "one"))
 
-            query += " ORDER BY created_at DESC LIMIT %s OFFSET %s"
-            params.extend([limit, skip])
+    async def fetchall(self, query: str, params=()) -> List[Dict[str, Any]]:
+        """Execute a query and return all rows"""
+        return await self._timed(query, len(params), self._statement(query, params, "all"))
 
+class SyncSession(BaseSession):
+    """Database session over a pooled mysql.connector connection
+
+    Every statement runs on the threadpool so the event loop is never blocked.
+    """
+
+    def _run(self, query: str, params, fetch: Optional[str]):
+        cursor = self.conn.cursor(dictionary=True, buffered=True)
+        try:
             cursor.execute(query, params)
-            projects = cursor.fetchall()
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount
+            if fetch == "all":
+                return cursor.fetchall()
+            if fetch == "one":
+                return cursor.fetchone()
+            return None
+        finally:
+            cursor.close()
 
-            result = []
-            for project in projects:
-                cursor.execute("SELECT * FROM tasks WHERE project_id = %s", (project['id'],))
-                tasks = cursor.fetchall() or []
-                project['tasks'] = tasks
-                project['team'] = json.loads(project['team']) if project['team'] else []
-                result.append(project)
+    def _run_many(self, query: str, seq_params):
+        cursor = self.conn.cursor()
+        try:
+            cursor.executemany(query, seq_params)
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount
+        finally:
+            cursor.close()
 
-            return result
+    async def _call(self, func, *args):
+        try:
+            return await run_in_threadpool(func, *args)
         except Error as e:
-            logger.error(f"Error fetching projects: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch projects"
-            )
+            raise DatabaseError(str(e)) from e
 
-@app.get("/api/projects/{project_id}", response_model=Project, tags=["Projects"])
-def get_project(project_id: int = Path(..., gt=0)):
-    """Get a specific project"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
+    async def _statement(self, query: str, params, fetch: Optional[str]):
+        return await self._call(self._run, query, params, fetch)
+
+    async def _statement_many(self, query: str, seq_params):
+        await self._call(self._run_many, query, seq_params)
+
+    def _close_stream(self, cursor):
+        if self.conn.unread_result:
+            self.conn.consume_results()
+        cursor.close()
+
+    async def stream(self, query: str, params=(), batch_size: int = 1000):
+        """Execute a query on an unbuffered cursor and yield rows batch by batch"""
+        started = time.perf_counter()
+        cursor = self.conn.cursor(dictionary=True)
         try:
-            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
-            project = cursor.fetchone()
+            await self._call(cursor.execute, query, params)
+            while True:
+                rows = await self._call(cursor.fetchmany, batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            await self._call(self._close_stream, cursor)
+            record_statement(query, len(params), time.perf_counter() - started)
 
-            if not project:
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Project {project_id} not found"
-                )
+    async def commit(self):
+        await self._call(self.conn.commit)
 
-            cursor.execute("SELECT * FROM tasks WHERE project_id = %s", (project_id,))
-            tasks = cursor.fetchall() or []
-            project['tasks'] = tasks
-            project['team'] = json.loads(project['team']) if project['team'] else []
+    async def rollback(self):
+        await self._call(self.conn.rollback)
 
-            return project
-        except Error as e:
-            logger.error(f"Error fetching project: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch project"
-            )
+class AsyncSession(BaseSession):
+    """Database session over a pooled aiomysql connection"""
 
-@app.post("/api/projects", response_model=Project, status_code=status.HTTP_201_CREATED, tags=["Projects"])
-def create_project(project: ProjectCreate):
-    """Create a new project"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    async def _statement(self, query: str, params, fetch: Optional[str]):
         try:
-            team_json = json.dumps(project.team) if project.team else json.dumps([])
+            async with self.conn.cursor(aiomysql.DictCursor) as cursor:
+                await cursor.execute(query, params)
+                self.lastrowid = cursor.lastrowid
+                self.rowcount = cursor.rowcount
+                if fetch == "all":
+                    return list(await cursor.fetchall())
+                if fetch == "one":
+                    return await cursor.fetchone()
+                return None
+        except aiomysql.Error as e:
+            raise DatabaseError(str(e)) from e
 
-            cursor.execute(
-                """INSERT INTO projects 
-                   (name, description, status, priority, deadline, budget, team, category, progress)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 0)""",
-                (project.name, project.description, project.status, project.priority,
-                 project.deadline, project.budget, team_json, project.category)
-            )
-            conn.commit()
-            project_id = cursor.lastrowid
-            logger.info(f"Project {project_id} created")
+    async def _statement_many(self, query: str, seq_params):
+        try:
+            async with self.conn.cursor() as cursor:
+                await cursor.executemany(query, seq_params)
+                self.lastrowid = cursor.lastrowid
+                self.rowcount = cursor.rowcount
+        except aiomysql.Error as e:
+            raise DatabaseError(str(e)) from e
 
-            return get_project(project_id)
-        except Error as e:
-            conn.rollback()
-            if "Duplicate entry" in str(e):
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail="Project name already exists"
-                )
-            logger.error(f"Error creating project: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create project"
-            )
+    async def stream(self, query: str, params=(), batch_size: int = 1000):
+        """Execute a query on an unbuffered cursor and yield rows batch by batch"""
+        started = time.perf_counter()
+        try:
+            async with self.conn.cursor(aiomysql.SSDictCursor) as cursor:
+                await cursor.execute(query, params)
+                while True:
+                    rows = await cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield list(rows)
+        except aiomysql.Error as e:
+            raise DatabaseError(str(e)) from e
+        finally:
+            record_statement(query, len(params), time.perf_counter() - started)
 
-@app.put("/api/projects/{project_id}", tags=["Projects"])
-def update_project(
-    project_id: int = Path(..., gt=0),
-    project: ProjectUpdate = Body(...)
-):
-    """Update a project"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    async def commit(self):
         try:
-            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Project {project_id} not found"
-                )
+            await self.conn.commit()
+        except aiomysql.Error as e:
+            raise DatabaseError(str(e)) from e
 
-            updates = []
-            values = []
+    async def rollback(self):
+        try:
+            await self.conn.rollback()
+        except aiomysql.Error as e:
+            raise DatabaseError(str(e)) from e
 
-            if project.name:
-                updates.append("name = %s")
-                values.append(project.name)
-            if project.description is not None:
-                updates.append("description = %s")
-                values.append(project.description)
-            if project.status:
-                updates.append("status = %s")
-                values.append(project.status)
-            if project.progress is not None:
-                updates.append("progress = %s")
-                values.append(project.progress)
-            if project.deadline:
-                updates.append("deadline = %s")
-                values.append(project.deadline)
-            if project.priority:
-                updates.append("priority = %s")
-                values.append(project.priority)
-            if project.budget is not None:
-                updates.append("budget = %s")
-                values.append(project.budget)
-            if project.team is not None:
-                updates.append("team = %s")
-                values.append(json.dumps(project.team))
-            if project.category:
-                updates.append("category = %s")
-                values.append(project.category)
-
-            if updates:
-                values.append(project_id)
-                query = f"UPDATE projects SET {', '.join(updates)}, updated_at = CURRENT_TIMESTAMP WHERE id = %s"
-                cursor.execute(query, values)
-                conn.commit()
-                logger.info(f"Project {project_id} updated")
-
-            return {"message": "Project updated successfully", "id": project_id}
-        except Error as e:
-            conn.rollback()
-            logger.error(f"Error updating project: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update project"
-            )
+# Statements are written for MySQL; these adapters, converters and the
+# PRIORITY collation let the SQLite engine run them with the same results
+sqlite3.register_adapter(Decimal, str)
+sqlite3.register_adapter(date, date.isoformat)
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(sep=" "))
+for _enum_type in (TaskStatus, ProjectStatus, PriorityLevel):
+    sqlite3.register_adapter(_enum_type, lambda member: member.value)
+sqlite3.register_converter("DATE", lambda raw: date.fromisoformat(raw.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda raw: datetime.fromisoformat(raw.decode()))
+sqlite3.register_converter("DECIMAL", lambda raw: Decimal(raw.decode()))
 
-@app.delete("/api/projects/{project_id}", tags=["Projects"])
-def delete_project(project_id: int = Path(..., gt=0)):
-    """Delete a project"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
-        try:
-            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Project {project_id} not found"
-                )
+_FOR_UPDATE = re.compile(r"\s+FOR UPDATE\b", re.IGNORECASE)
+_WRITE_STATEMENTS = ("INSERT", "UPDATE", "DELETE", "REPLACE", "SAVEPOINT")
 
-            cursor.execute("DELETE FROM projects WHERE id = %s", (project_id,))
-            conn.commit()
-            logger.info(f"Project {project_id} deleted")
+@lru_cache(maxsize=1024)
+def sqlite_statement(query: str) -> str:
+    """Rewrite the MySQL-specific syntax used by the handlers for SQLite"""
+    query = _FOR_UPDATE.sub("", query.replace("%s", "?"))
+    return query.replace("INSERT IGNORE", "INSERT OR IGNORE")
 
-            return {"message": "Project deleted successfully", "id": project_id}
-        except Error as e:
-            conn.rollback()
-            logger.error(f"Error deleting project: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to delete project"
-            )
+def _priority_rank(value: str) -> int:
+    if value.isdigit():
+        return int(value)
+    return PRIORITY_RANK.get(value, 0)
 
-# ===== TASK ENDPOINTS =====
+def _collate_priority(left: str, right: str) -> int:
+    """Order priority labels by ENUM position like MySQL
 
-@app.get("/api/projects/{project_id}/tasks", response_model=List[Task], tags=["Tasks"])
-def get_project_tasks(
-    project_id: int = Path(..., gt=0),
-    status_filter: Optional[str] = Query(None, alias="status")
-):
-    """Get tasks for a project"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        try:
-            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Project {project_id} not found"
-                )
+    Keyset conditions compare priority with its numeric rank, which SQLite
+    passes to the collation as text, so digits are ranked too.
+    """
+    left_rank, right_rank = _priority_rank(left), _priority_rank(right)
+    if left_rank == right_rank == 0:
+        return (left > right) - (left < right)
+    return (left_rank > right_rank) - (left_rank < right_rank)
 
-            query = "SELECT * FROM tasks WHERE project_id = %s"
-            params = [project_id]
+def _dict_row(cursor, row):
+    return {column[0]: value for column, value in zip(cursor.description, row)}
 
-            if status_filter:
-                query += " AND status = %s"
-                params.append(status_filter)
+class SQLiteSession(BaseSession):
+    """Database session over a pooled SQLite connection
 
-            query += " ORDER BY priority DESC, deadline ASC"
+    Transactions that lock rows (FOR UPDATE) or write start with BEGIN
+    IMMEDIATE, so concurrent writers queue on SQLite's write lock instead of
+    failing when they upgrade a read snapshot.
+    """
 
-            cursor.execute(query, params)
-            tasks = cursor.fetchall() or []
+    dialect = "sqlite"
 
-            return tasks
-        except Error as e:
-            logger.error(f"Error fetching tasks: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to fetch tasks"
-            )
+    def _begin(self, query: str):
+        if self.conn.in_transaction:
+            return
+        statement = query.lstrip().upper()
+        if "FOR UPDATE" in statement or statement.startswith(_WRITE_STATEMENTS):
+            self.conn.execute("BEGIN IMMEDIATE")
+        else:
+            self.conn.execute("BEGIN")
 
-@app.post("/api/projects/{project_id}/tasks", response_model=Task, status_code=status.HTTP_201_CREATED, tags=["Tasks"])
-def create_task(
-    project_id: int = Path(..., gt=0),
-    task: TaskCreate = Body(...)
-):
-    """Create a task"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
+    def _open(self, query: str, params):
+        self._begin(query)
+        return self.conn.execute(sqlite_statement(query), tuple(params))
+
+    def _run(self, query: str, params, fetch: Optional[str]):
+        cursor = self._open(query, params)
         try:
-            cursor.execute("SELECT * FROM projects WHERE id = %s", (project_id,))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Project {project_id} not found"
-                )
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount
+            if fetch == "all":
+                return cursor.fetchall()
+            if fetch == "one":
+                return cursor.fetchone()
+            return None
+        finally:
+            cursor.close()
 
-            cursor.execute(
-                """INSERT INTO tasks 
-                   (project_id, title, description, status, deadline, assignee, priority)
-                   VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (project_id, task.title, task.description, task.status, task.deadline, task.assignee, task.priority)
-            )
-            conn.commit()
-            task_id = cursor.lastrowid
+    def _run_many(self, query: str, seq_params):
+        self._begin(query)
+        cursor = self.conn.executemany(sqlite_statement(query), [tuple(params) for params in seq_params])
+        try:
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount
+        finally:
+            cursor.close()
 
-            cursor.execute("SELECT * FROM tasks WHERE id = %s", (task_id,))
-            result = cursor.fetchone()
-            logger.info(f"Task {task_id} created")
-            return result
-        except Error as e:
-            conn.rollback()
-            logger.error(f"Error creating task: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to create task"
-            )
+    def _end(self, statement: str):
+        if self.conn.in_transaction:
+            self.conn.execute(statement)
 
-@app.put("/api/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
-def update_task(
-    project_id: int = Path(..., gt=0),
-    task_id: int = Path(..., gt=0),
-    task: TaskUpdate = Body(...)
-):
-    """Update a task"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    async def _call(self, func, *args):
         try:
-            cursor.execute("SELECT * FROM tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Task {task_id} not found"
-                )
+            return await run_in_threadpool(func, *args)
+        except sqlite3.IntegrityError as e:
+            # Reuse MySQL's wording so duplicate-name handling works unchanged
+            if "UNIQUE constraint failed" in str(e):
+                raise DatabaseError(f"Duplicate entry: {e}") from e
+            raise DatabaseError(str(e)) from e
+        except sqlite3.Error as e:
+            raise DatabaseError(str(e)) from e
 
-            updates = []
-            values = []
-
-            if task.title:
-                updates.append("title = %s")
-                values.append(task.title)
-            if task.status:
-                updates.append("status = %s")
-                values.append(task.status)
-            if task.deadline:
-                updates.append("deadline = %s")
-                values.append(task.deadline)
-            if task.assignee:
-                updates.append("assignee = %s")
-                values.append(task.assignee)
-            if task.priority:
-                updates.append("priority = %s")
-                values.append(task.priority)
-            if task.description is not None:
-                updates.append("description = %s")
-                values.append(task.description)
-
-            if updates:
-                values.extend([task_id, project_id])
-                query = f"UPDATE tasks SET {', '.join(updates)}, updated_at = CURRENT_TIMESTAMP WHERE id = %s AND project_id = %s"
-                cursor.execute(query, values)
-                conn.commit()
-                logger.info(f"Task {task_id} updated")
-
-            return {"message": "Task updated successfully", "id": task_id}
-        except Error as e:
-            conn.rollback()
-            logger.error(f"Error updating task: {e}")
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail="Failed to update task"
-            )
+    async def _statement(self, query: str, params, fetch: Optional[str]):
+        return await self._call(self._run, query, params, fetch)
 
-@app.delete("/api/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
-def delete_task(
-    project_id: int = Path(..., gt=0),
-    task_id: int = Path(..., gt=0)
-):
-    """Delete a task"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor()
+    async def _statement_many(self, query: str, seq_params):
+        await self._call(self._run_many, query, seq_params)
+
+    async def executescript(self, script: str):
+        """Run a multi-statement script; SQLite commits any open transaction first"""
+        await self._call(self.conn.executescript, script)
+
+    async def stream(self, query: str, params=(), batch_size: int = 1000):
+        """Execute a query and yield rows batch by batch"""
+        started = time.perf_counter()
+        cursor = None
         try:
-            cursor.execute("SELECT * FROM tasks WHERE id = %s AND project_id = %s", (task_id, project_id))
-            if not cursor.fetchone():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Task {task_id} not found"
-                )
+            cursor = await self._call(self._open, query, params)
+            while True:
+                rows = await self._call(cursor.fetchmany, batch_size)
+                if not rows:
+                    break
+                yield rows
+        finally:
+            if cursor is not None:
+                cursor.close()
+            record_statement(query, len(params), time.perf_counter() - started)
 
-            cursor.execute("DELETE FROM tasks WHERE id = %s", (task_id,))
-            conn.commit()
-            logger.info(f"Task {task_id} deleted")
+    async def commit(self):
+        await self._call(self._end, "COMMIT")
 
+    async def rollback(self):
+        await self._call(self._end, "ROLLBACK")
+
+class SQLitePool:
+    """Fixed-size pool of connections to one SQLite database file in WAL mode"""
+
+    def __init__(self, path: str, size: int):
+        self.path = path
+        self.size = size
+        self._connections = []
+        self._idle = asyncio.Queue()
+
+    def _connect(self):
+        conn = sqlite3.connect(
+            self.path,
+            timeout=SQLITE_BUSY_TIMEOUT,
+            isolation_level=None,
+            check_same_thread=False,
+            detect_types=sqlite3.PARSE_DECLTYPES
+        )
+        conn.row_factory = _dict_row
+        conn.create_collation("PRIORITY", _collate_priority)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        return conn
+
+    async def open(self):
+        for _ in range(self.size):
+            conn = await run_in_threadpool(self._connect)
+            self._connections.append(conn)
+            self._idle.put_nowait(conn)
+
+    @property
+    def freesize(self) -> int:
+        return self._idle.qsize()
+
+    async def acquire(self):
+        return await self._idle.get()
+
+    def release(self, conn):
+        self._idle.put_nowait(conn)
+
+    def close(self):
+        for conn in self._connections:
+            conn.close()
+        self._connections.clear()
+
+def pool_size(role: str) -> int:
+    """Configured connection count of the primary or replica pool"""
+    if role == REPLICA:
+        return DB_READ_POOL_SIZE or DB_POOL_SIZE
+    return DB_POOL_SIZE
+
+def init_connection_pool(role: str = PRIMARY):
+    """Initialize a mysql.connector connection pool"""
+    try:
+        db_pools[role] = pooling.MySQLConnectionPool(
+            pool_name=f"pm{role}",
+            pool_size=pool_size(role),
+            pool_reset_session=True,
+            **(DB_READ_CONFIG if role == REPLICA else DB_CONFIG)
+        )
+        logger.info(f"Database {role} connection pool initialized successfully")
+    except Error as e:
+        logger.error(f"Error creating {role} connection pool: {e}")
+        raise
+
+async def init_async_pool(role: str = PRIMARY):
+    """Initialize an aiomysql connection pool"""
+    if aiomysql is None:
+        raise RuntimeError("DB_DRIVER=aiomysql requires the aiomysql package")
+    config = DB_READ_CONFIG if role == REPLICA else DB_CONFIG
+    try:
+        db_pools[role] = await aiomysql.create_pool(
+            host=config['host'],
+            port=config['port'],
+            user=config['user'],
+            password=config['password'],
+            db=config['database'],
+            autocommit=config['autocommit'],
+            charset='utf8mb4',
+            minsize=1,
+            maxsize=pool_size(role)
+        )
+        logger.info(f"Async database {role} connection pool initialized successfully")
+    except aiomysql.Error as e:
+        logger.error(f"Error creating async {role} connection pool: {e}")
+        raise
+
+async def init_sqlite_pool(role: str = PRIMARY):
+    """Initialize a SQLite connection pool"""
+    try:
+        pool = SQLitePool(SQLITE_PATH, pool_size(role))
+        await pool.open()
+        db_pools[role] = pool
+        logger.info(f"SQLite {role} connection pool initialized at {SQLITE_PATH}")
+    except sqlite3.Error as e:
+        logger.error(f"Error creating SQLite {role} connection pool: {e}")
+        raise
+
+async def init_pool(role: str = PRIMARY):
+    """Initialize the pool for `role` with the configured driver"""
+    if DB_DRIVER == "aiomysql":
+        await init_async_pool(role)
+    elif DB_DRIVER == "sqlite":
+        await init_sqlite_pool(role)
+    else:
+        await run_in_threadpool(init_connection_pool, role)
+    # Checkouts queue here rather than in the driver, which for
+    # mysql.connector fails at once when the pool is empty
+    admission_gates[f"{role}_pool"] = AdmissionGate(
+        f"{role}_pool", pool_size(role), DB_POOL_QUEUE_SIZE, DB_POOL_TIMEOUT
+    )
+
+async def close_pool(role: str):
+    """Close the pool for `role` if it is open"""
+    pool = db_pools.pop(role, None)
+    if pool is None:
+        return
+    try:
+        if DB_DRIVER == "aiomysql":
+            pool.close()
+            await pool.wait_closed()
+        elif DB_DRIVER == "sqlite":
+            pool.close()
+        else:
+            # MySQLConnectionPool has no public close; this drains and closes its idle connections
+            await run_in_threadpool(pool._remove_connections)
+        logger.info(f"Database {role} pool closed")
+    except Exception as e:
+        logger.error(f"Error closing {role} pool: {e}")
+
+async def _checkout(role: str):
+    """Check out a connection from the pool for `role`
+
+    Raises a 503 HTTPException when the pool's admission queue is full or
+    the wait exceeds DB_POOL_TIMEOUT.
+    """
+    pool = db_pools.get(role)
+    if pool is None:
+        raise DatabaseError(f"No {role} connection pool")
+    gate = admission_gates[f"{role}_pool"]
+    started = time.perf_counter()
+    if gate.in_use >= gate.limit:
+        metrics.pool_exhausted.inc((role,))
+    await gate.acquire()
+    try:
+        if DB_DRIVER == "aiomysql":
+            session = AsyncSession(await pool.acquire())
+        elif DB_DRIVER == "sqlite":
+            session = SQLiteSession(await pool.acquire())
+        else:
+            try:
+                session = SyncSession(await run_in_threadpool(pool.get_connection))
+            except PoolError as e:
+                metrics.pool_exhausted.inc((role,))
+                raise DatabaseError(str(e)) from e
+            except Error as e:
+                raise DatabaseError(str(e)) from e
+    except BaseException:
+        gate.release()
+        raise
+    session.gate = gate
+    session.pool = pool
+    session.role = role
+    record_pool_checkout(role, time.perf_counter() - started)
+    return session
+
+def routed_role() -> str:
+    """Pool the current request reads from: the replica only while it is healthy"""
+    if read_routing.get() == REPLICA and replica_healthy:
+        return REPLICA
+    return PRIMARY
+
+async def _acquire_session(role: str):
+    """Check out a session for `role`, failing over from the replica to the primary"""
+    global replica_healthy
+    if role == REPLICA:
+        try:
+            return await _checkout(REPLICA)
+        except DatabaseError as e:
+            replica_healthy = False
+            logger.warning(f"Replica unavailable, reading from the primary: {e}")
+    return await _checkout(PRIMARY)
+
+async def _release_session(session):
+    """Return a session's connection to its pool"""
+    metrics.pool_in_use.inc((session.role,), -1)
+    session.gate.release()
+    if isinstance(session, (AsyncSession, SQLiteSession)):
+        session.pool.release(session.conn)
+    elif session.conn.is_connected():
+        await run_in_threadpool(session.conn.close)
+
+async def check_replica() -> bool:
+    """Probe the replica and route reads to it only while it answers"""
+    global replica_healthy
+    session = None
+    healthy = False
+    try:
+        if REPLICA not in db_pools:
+            await init_pool(REPLICA)
+        session = await _checkout(REPLICA)
+        await session.fetchone("SELECT 1")
+        await session.rollback()
+        healthy = True
+    except HTTPException:
+        # Every replica connection is busy, which says nothing about its health
+        healthy = replica_healthy
+    except Exception as e:
+        if replica_healthy:
+            logger.warning(f"Replica health check failed, reading from the primary: {e}")
+    finally:
+        if session:
+            await _release_session(session)
+    if healthy and not replica_healthy:
+        logger.info("Replica healthy, routing reads to it")
+    replica_healthy = healthy
+    return healthy
+
+async def check_replica_periodically():
+    """Background loop re-probing the replica every REPLICA_CHECK_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(REPLICA_CHECK_INTERVAL)
+        await check_replica()
+
+READ_METHODS = ("GET", "HEAD")
+STICKY_COOKIE = "pm_read_primary"
+
+def _has_cookie(scope, name: str) -> bool:
+    for header, value in scope["headers"]:
+        if header == b"cookie":
+            for pair in value.decode("latin-1").split(";"):
+                if pair.strip().split("=", 1)[0] == name:
+                    return True
+    return False
+
+class ReadRoutingMiddleware:
+    """ASGI middleware routing GET requests to the replica pool
+
+    A successful write sets a short-lived cookie; requests carrying it read
+    from the primary so clients see their own writes despite replica lag.
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self.sticky_cookie = (
+            f"{STICKY_COOKIE}=1; Max-Age={max(1, int(REPLICA_STICKY_SECONDS))}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        ).encode("latin-1")
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not REPLICA_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        if scope["method"] in READ_METHODS:
+            token = read_routing.set(PRIMARY if _has_cookie(scope, STICKY_COOKIE) else REPLICA)
+            try:
+                await self.app(scope, receive, send)
+            finally:
+                read_routing.reset(token)
+            return
+
+        async def send_with_cookie(message):
+            if (message["type"] == "http.response.start" and message["status"] < 400
+                    and scope["method"] != "OPTIONS" and REPLICA_LAGS):
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.sticky_cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
+
+@asynccontextmanager
+async def db_session(role: Optional[str] = None):
+    """Async context manager yielding a database session
+
+    Without `role` the session comes from the pool the current request is
+    routed to. The transaction is committed when the block exits normally
+    and rolled back when it raises. Callables appended to
+    `session.after_commit` run once the commit has succeeded; coroutine
+    results are awaited.
+    """
+    session = None
+    try:
+        session = await _acquire_session(role or routed_role())
+        yield session
+        await session.commit()
+        for callback in session.after_commit:
+            try:
+                result = callback()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"After-commit callback failed: {e}")
+    except DatabaseError as e:
+        if session:
+            await session.rollback()
+        logger.error(f"Database error: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Database operation failed"
+        )
+    except BaseException:
+        if session:
+            await session.rollback()
+        raise
+    finally:
+        if session:
+            await _release_session(session)
+
+# ===== METRICS =====
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") == "1"
+# Statements slower than this many milliseconds are logged; 0 disables the log
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "500"))
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Route label for statements issued outside a request (startup, background jobs)
+BACKGROUND_ROUTE = "background"
+
+slow_query_logger = logging.getLogger(f"{__name__}.slow_queries")
+
+class RequestMetrics:
+    """Database counters collected while a single request is handled"""
+    __slots__ = ("statements", "db_seconds", "pool_wait_seconds")
+
+    def __init__(self):
+        self.statements = 0
+        self.db_seconds = 0.0
+        self.pool_wait_seconds = 0.0
+
+current_request_metrics: ContextVar[Optional[RequestMetrics]] = ContextVar("current_request_metrics", default=None)
+
+def _format_labels(names: tuple, values: tuple) -> str:
+    """Render Prometheus label pairs"""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return ",".join(pairs)
+
+class Histogram:
+    """Histogram with fixed upper bounds, one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple = LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self.series = {}
+
+    def observe(self, labels: tuple, value: float):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+        series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for labels, (counts, total, count) in sorted(self.series.items()):
+            base = _format_labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(f'{self.name}_bucket{{{base},le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{base}}} {total}")
+            lines.append(f"{self.name}_count{{{base}}} {count}")
+        return lines
+
+class Counter:
+    """Monotonic counter, one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.series = {}
+
+    def inc(self, labels: tuple = (), amount: float = 1):
+        self.series[labels] = self.series.get(labels, 0) + amount
+
+    metric_type = "counter"
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.metric_type}"]
+        for labels, value in sorted(self.series.items()):
+            base = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}{{{base}}} {value}" if base else f"{self.name} {value}")
+        return lines
+
+class Gauge(Counter):
+    """Value that can go up and down, one series per label tuple"""
+    metric_type = "gauge"
+
+class MetricsRegistry:
+    """In-process request, statement and connection pool metrics"""
+
+    def __init__(self):
+        self.request_latency = Histogram(
+            "pm_http_request_duration_seconds", "Request latency by route", ("method", "route")
+        )
+        self.requests = Counter(
+            "pm_http_requests_total", "Requests by route and status code", ("method", "route", "status")
+        )
+        self.statements = Counter(
+            "pm_db_statements_total", "SQL statements issued by route", ("route",)
+        )
+        self.db_seconds = Counter(
+            "pm_db_seconds_total", "Time spent executing SQL by route", ("route",)
+        )
+        self.pool_wait = Histogram(
+            "pm_db_pool_wait_seconds", "Connection pool checkout wait per request", ("route",)
+        )
+        self.slow_queries = Counter("pm_db_slow_queries_total", "Statements slower than SLOW_QUERY_MS")
+        self.pool_exhausted = Counter(
+            "pm_db_pool_exhausted_total", "Checkouts that found no free connection", ("role",)
+        )
+        self.pool_in_use = Gauge("pm_db_pool_in_use", "Connections currently checked out", ("role",))
+        self.change_subscribers = Gauge("pm_change_feed_subscribers", "Open change feed streams")
+        self.change_dropped = Counter(
+            "pm_change_feed_dropped_total", "Change feed subscribers dropped for falling behind"
+        )
+        self.admission_wait = Histogram(
+            "pm_admission_wait_seconds", "Time spent waiting to be admitted by a gate", ("gate",)
+        )
+        self.admission_rejected = Counter(
+            "pm_admission_rejected_total", "Requests shed with 503 by a gate", ("gate", "reason")
+        )
+
+    def observe_request(self, method: str, route: str, status_code: int, elapsed: float, request_metrics: RequestMetrics):
+        self.request_latency.observe((method, route), elapsed)
+        self.requests.inc((method, route, str(status_code)))
+        if request_metrics.statements:
+            self.statements.inc((route,), request_metrics.statements)
+            self.db_seconds.inc((route,), request_metrics.db_seconds)
+        self.pool_wait.observe((route,), request_metrics.pool_wait_seconds)
+
+    def render(self) -> str:
+        lines = []
+        pool_sizes = Gauge("pm_db_pool_size", "Configured connection pool size", ("role",))
+        for role in db_pools:
+            pool_sizes.inc((role,), pool_size(role))
+        gate_limits = Gauge("pm_admission_limit", "Holders a gate admits at once", ("gate",))
+        gate_in_use = Gauge("pm_admission_in_use", "Holders currently admitted by a gate", ("gate",))
+        gate_queued = Gauge("pm_admission_queue_depth", "Requests waiting to be admitted by a gate", ("gate",))
+        for name, gate in admission_gates.items():
+            gate_limits.inc((name,), gate.limit)
+            gate_in_use.inc((name,), gate.in_use)
+            gate_queued.inc((name,), len(gate.waiters))
+        for metric in (self.request_latency, self.requests, self.statements, self.db_seconds,
+                       self.pool_wait, self.slow_queries, self.pool_exhausted, self.pool_in_use, pool_sizes,
+                       self.change_subscribers, self.change_dropped,
+                       self.admission_wait, self.admission_rejected, gate_limits, gate_in_use, gate_queued):
+            lines.extend(metric.render())
+        lines.extend([
+            "# HELP pm_db_replica_healthy Whether reads are routed to the replica",
+            "# TYPE pm_db_replica_healthy gauge",
+            f"pm_db_replica_healthy {int(replica_healthy)}"
+        ])
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry()
+
+def record_statement(query: str, param_count: int, elapsed: float):
+    """Account one SQL statement to the current request and the slow-query log"""
+    if SLOW_QUERY_MS and elapsed * 1000 >= SLOW_QUERY_MS:
+        metrics.slow_queries.inc()
+        slow_query_logger.warning(
+            f"Slow query ({elapsed * 1000:.1f} ms, {param_count} params): {' '.join(query.split())}"
+        )
+    if not METRICS_ENABLED:
+        return
+    request_metrics = current_request_metrics.get()
+    if request_metrics is None:
+        metrics.statements.inc((BACKGROUND_ROUTE,))
+        metrics.db_seconds.inc((BACKGROUND_ROUTE,), elapsed)
+    else:
+        request_metrics.statements += 1
+        request_metrics.db_seconds += elapsed
+
+def record_pool_checkout(role: str, wait: float):
+    """Account a connection checkout to its pool and the current request"""
+    metrics.pool_in_use.inc((role,))
+    request_metrics = current_request_metrics.get()
+    if request_metrics is not None:
+        request_metrics.pool_wait_seconds += wait
+
+class MetricsMiddleware:
+    """ASGI middleware timing each request and attaching RequestMetrics to it"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        request_metrics = RequestMetrics()
+        token = current_request_metrics.set(request_metrics)
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Label by route template rather than raw path to bound cardinality
+            route = scope.get("route")
+            metrics.observe_request(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code,
+                time.perf_counter() - started,
+                request_metrics
+            )
+            current_request_metrics.reset(token)
+
+# ===== ADMISSION CONTROL =====
+# Retry-After seconds sent with 503 responses when a gate sheds load
+RETRY_AFTER_SECONDS = int(os.getenv("RETRY_AFTER_SECONDS", "1"))
+# Requests of each heavy route group that may run at once, so they cannot
+# take every pooled connection from the cheap routes; 0 leaves a group unlimited
+ROUTE_CONCURRENCY = {
+    "export": (("/api/export/",), int(os.getenv("EXPORT_CONCURRENCY", "2"))),
+    "analytics": (("/api/statistics", "/api/analytics/"), int(os.getenv("ANALYTICS_CONCURRENCY", "4"))),
+    "search": (("/api/search",), int(os.getenv("SEARCH_CONCURRENCY", "4")))
+}
+# Requests of one route group that may wait for a slot, and for how many seconds
+ROUTE_QUEUE_SIZE = int(os.getenv("ROUTE_QUEUE_SIZE", "20"))
+ROUTE_QUEUE_TIMEOUT = float(os.getenv("ROUTE_QUEUE_TIMEOUT", "10"))
+
+def overloaded(detail: str) -> HTTPException:
+    """503 telling the client to retry after RETRY_AFTER_SECONDS"""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail=detail,
+        headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+    )
+
+class AdmissionGate:
+    """Admits up to `limit` holders at once and queues a bounded number of waiters
+
+    Waiters are admitted in arrival order. A request is shed with 503 when
+    the queue is already full or it has waited `timeout` seconds.
+    """
+
+    def __init__(self, name: str, limit: int, queue_size: int, timeout: float):
+        self.name = name
+        self.limit = limit
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.in_use = 0
+        self.waiters = deque()
+
+    async def acquire(self):
+        if self.in_use < self.limit and not self.waiters:
+            self.in_use += 1
+            metrics.admission_wait.observe((self.name,), 0.0)
+            return
+        if len(self.waiters) >= self.queue_size:
+            metrics.admission_rejected.inc((self.name, "queue_full"))
+            raise overloaded(f"Server busy: {self.name} queue is full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.append(waiter)
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.timeout)
+        except asyncio.TimeoutError:
+            # A slot handed over just as the wait expired is still taken
+            if not waiter.done():
+                self.waiters.remove(waiter)
+                metrics.admission_rejected.inc((self.name, "timeout"))
+                raise overloaded(f"Server busy: timed out waiting for {self.name}")
+        except asyncio.CancelledError:
+            if waiter.done():
+                self.release()
+            else:
+                self.waiters.remove(waiter)
+            raise
+        finally:
+            metrics.admission_wait.observe((self.name,), time.perf_counter() - started)
+
+    def release(self):
+        if self.waiters:
+            # Hand the slot straight to the oldest waiter
+            self.waiters.popleft().set_result(None)
+        else:
+            self.in_use -= 1
+
+# Every gate by name, for the metrics; the pool gates are added by init_pool
+admission_gates: Dict[str, AdmissionGate] = {
+    name: AdmissionGate(name, limit, ROUTE_QUEUE_SIZE, ROUTE_QUEUE_TIMEOUT)
+    for name, (prefixes, limit) in ROUTE_CONCURRENCY.items() if limit > 0
+}
+route_gates = [
+    (prefixes, admission_gates[name])
+    for name, (prefixes, limit) in ROUTE_CONCURRENCY.items() if limit > 0
+]
+
+class AdmissionMiddleware:
+    """ASGI middleware holding each request of a heavy route group to its gate
+
+    The slot is kept until the response body has been sent, so streamed
+    exports count for their whole duration.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        gate = None
+        if scope["type"] == "http":
+            gate = next((gate for prefixes, gate in route_gates if scope["path"].startswith(prefixes)), None)
+        if gate is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            await gate.acquire()
+        except HTTPException as exc:
+            response = await http_exception_handler(None, exc)
+            await response(scope, receive, send)
+            return
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            gate.release()
+
+# ===== SPARSE FIELDSETS =====
+# Response fields in model order; `fields=` may only name these
+TASK_FIELDS = tuple(Task.model_fields)
+PROJECT_FIELDS = tuple(Project.model_fields)
+# Project fields backed by a column rather than loaded from the tasks table
+PROJECT_COLUMNS = tuple(
+    field for field in PROJECT_FIELDS if field not in ("tasks", "task_summary", "tasks_url", "archived_at")
+)
+ARCHIVED_PROJECT_COLUMNS = PROJECT_COLUMNS + ("archived_at",)
+# Columns always selected because task loading and the keyset cursors need them
+PROJECT_KEY_COLUMNS = ("id", "created_at", "task_total")
+ARCHIVED_PROJECT_KEY_COLUMNS = PROJECT_KEY_COLUMNS + ("archived_at",)
+TASK_KEY_COLUMNS = ("id", "priority", "deadline")
+
+def parse_fields(fields: Optional[str], allowed: tuple) -> Optional[tuple]:
+    """Validate a comma-separated `fields` parameter against an allow-list
+
+    Returns the requested fields in model order, or None when the
+    parameter was not given and the full objects should be returned.
+    """
+    if fields is None:
+        return None
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(allowed)
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}; allowed: {', '.join(allowed)}"
+            if unknown else "fields must name at least one field"
+        )
+    return tuple(field for field in allowed if field in requested)
+
+def select_list(fields: Optional[tuple], columns: tuple, key_columns: tuple) -> str:
+    """SQL select list for `fields`, built only from allow-listed column names
+
+    Key columns are always selected, including those that are not response
+    fields such as the task counter the embedded-task cap reads.
+    """
+    if fields is None:
+        return "*"
+    selected = [column for column in columns if column in fields or column in key_columns]
+    selected.extend(column for column in key_columns if column not in selected)
+    return ", ".join(selected)
+
+def embedded_tasks(include_tasks: TaskInclude, fields: Optional[tuple]) -> TaskInclude:
+    """Skip loading tasks or summaries that a sparse fieldset leaves out"""
+    if fields is None:
+        return include_tasks
+    if include_tasks == TaskInclude.FULL and "tasks" not in fields:
+        return TaskInclude.NONE
+    if include_tasks == TaskInclude.SUMMARY and "task_summary" not in fields:
+        return TaskInclude.NONE
+    return include_tasks
+
+# ===== TASK LOADING HELPERS =====
+# Maximum number of project ids bound into a single IN (...) clause
+TASK_BATCH_SIZE = 500
+# Tasks embedded per project by include_tasks=full; larger projects embed
+# their first tasks by id plus a task summary and a link to the paged task
+# list. 0 embeds every task.
+EMBEDDED_TASK_LIMIT = int(os.getenv("EMBEDDED_TASK_LIMIT", "500"))
+
+def _chunks(items: List[int], size: int):
+    """Yield successive slices of at most `size` items"""
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+async def load_tasks_for_projects(db, project_ids: List[int], table: str = "tasks") -> Dict[int, List[Dict[str, Any]]]:
+    """Fetch tasks for many projects in chunked queries and group them by project"""
+    grouped = {project_id: [] for project_id in project_ids}
+    for chunk in _chunks(project_ids, TASK_BATCH_SIZE):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        tasks = await db.fetchall(
+            f"SELECT * FROM {table} WHERE project_id IN ({placeholders}) ORDER BY project_id, id",
+            chunk
+        )
+        for task in tasks:
+            grouped[task['project_id']].append(task)
+    return grouped
+
+async def load_task_summaries(db, project_ids: List[int], table: str = "tasks") -> Dict[int, Dict[str, int]]:
+    """Fetch per-status task counts for many projects in chunked queries"""
+    summaries = {
+        project_id: {"total": 0, "pending": 0, "in_progress": 0, "completed": 0}
+        for project_id in project_ids
+    }
+    for chunk in _chunks(project_ids, TASK_BATCH_SIZE):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows = await db.fetchall(
+            f"""SELECT project_id, status, COUNT(*) as count FROM {table}
+                WHERE project_id IN ({placeholders})
+                GROUP BY project_id, status""",
+            chunk
+        )
+        for row in rows:
+            summary = summaries[row['project_id']]
+            summary[row['status'].replace('-', '_')] = row['count']
+            summary['total'] += row['count']
+    return summaries
+
+async def attach_tasks(db, projects: List[Dict[str, Any]], include_tasks: TaskInclude) -> List[Dict[str, Any]]:
+    """Decode project rows and embed their tasks according to `include_tasks`
+
+    Rows read from archived_projects carry archived_at and take their tasks
+    from archived_tasks. Projects whose task counter exceeds
+    EMBEDDED_TASK_LIMIT embed only that many tasks, with their summary.
+    """
+    tasks_by_project = {}
+    summaries = {}
+    capped = set()
+
+    for table, archived in (("tasks", False), ("archived_tasks", True)):
+        group = [project for project in projects if bool(project.get('archived_at')) == archived]
+        if group and include_tasks == TaskInclude.FULL:
+            large = {
+                project['id'] for project in group
+                if EMBEDDED_TASK_LIMIT and (project.get('task_total') or 0) > EMBEDDED_TASK_LIMIT
+            }
+            small = [project['id'] for project in group if project['id'] not in large]
+            tasks_by_project.update(await load_tasks_for_projects(db, small, table))
+            for project_id in large:
+                tasks_by_project[project_id] = await db.fetchall(
+                    f"SELECT * FROM {table} WHERE project_id = %s ORDER BY id LIMIT %s",
+                    (project_id, EMBEDDED_TASK_LIMIT)
+                )
+            if large:
+                summaries.update(await load_task_summaries(db, sorted(large), table))
+                capped.update(large)
+        elif group and include_tasks == TaskInclude.SUMMARY:
+            summaries.update(await load_task_summaries(db, [project['id'] for project in group], table))
+
+    for project in projects:
+        project['tasks'] = tasks_by_project.get(project['id'], [])
+        project['task_summary'] = summaries.get(project['id'])
+        project['tasks_url'] = None
+        if project['id'] in capped and not project.get('archived_at'):
+            project['tasks_url'] = f"/api/projects/{project['id']}/tasks?limit=100"
+        if 'team' in project:
+            project['team'] = json.loads(project['team']) if project['team'] else []
+    return projects
+
+async def fetch_project(db, project_id: int, include_tasks: TaskInclude = TaskInclude.FULL,
+                        fields: Optional[tuple] = None, include_archived: bool = False) -> Dict[str, Any]:
+    """Load one project with its tasks, raising 404 when it does not exist
+
+    With `include_archived`, a project missing from the live table is
+    looked up in the archive.
+    """
+    columns = select_list(fields, PROJECT_COLUMNS, PROJECT_KEY_COLUMNS)
+    project = await db.fetchone(f"SELECT {columns} FROM projects WHERE id = %s", (project_id,))
+    if not project and include_archived:
+        columns = select_list(fields, ARCHIVED_PROJECT_COLUMNS, ARCHIVED_PROJECT_KEY_COLUMNS)
+        project = await db.fetchone(f"SELECT {columns} FROM archived_projects WHERE id = %s", (project_id,))
+    if not project:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project {project_id} not found"
+        )
+    return (await attach_tasks(db, [project], embedded_tasks(include_tasks, fields)))[0]
+
+# ===== STATISTICS ROLLUP =====
+# Seconds a /api/statistics result may be served from memory
+STATS_CACHE_TTL = float(os.getenv("STATS_CACHE_TTL", "5"))
+
+PROJECT_STATUS_COLUMNS = {
+    'planning': 'projects_planning',
+    'in-progress': 'projects_in_progress',
+    'completed': 'projects_completed'
+}
+
+TASK_STATUS_COLUMNS = {
+    'pending': 'tasks_pending',
+    'in-progress': 'tasks_in_progress',
+    'completed': 'tasks_completed'
+}
+
+class TTLCache:
+    """Small in-process cache whose entries expire after `ttl` seconds
+
+    With `max_entries` set, the least recently used entry is evicted once
+    the cache is full.
+    """
+
+    def __init__(self, ttl: float, max_entries: Optional[int] = None):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if time.monotonic() >= expires_at:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.max_entries == 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        if self.max_entries is not None:
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key=None):
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+stats_cache = TTLCache(STATS_CACHE_TTL)
+
+def _enum_value(value):
+    """Return the plain value of an enum member, or `value` unchanged"""
+    return value.value if isinstance(value, Enum) else value
+
+def _merge_deltas(*deltas: Dict[str, Any]) -> Dict[str, Any]:
+    """Sum several rollup deltas column by column"""
+    merged = {}
+    for delta in deltas:
+        for column, amount in delta.items():
+            merged[column] = merged.get(column, 0) + amount
+    return merged
+
+def project_stats_delta(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Rollup delta for a project row changing from `before` to `after`
+
+    Either side may be None for inserts and deletes. Rows need the
+    status, progress and budget columns.
+    """
+    delta = {}
+    for row, sign in ((before, -1), (after, 1)):
+        if not row:
+            continue
+        delta = _merge_deltas(delta, {
+            PROJECT_STATUS_COLUMNS[_enum_value(row['status'])]: sign,
+            'progress_sum': sign * (row['progress'] or 0),
+            'budget_sum': sign * Decimal(str(row['budget'] or 0))
+        })
+    return delta
+
+def task_stats_delta(before_status: Optional[str], after_status: Optional[str], count: int = 1) -> Dict[str, Any]:
+    """Rollup delta for `count` tasks moving between statuses"""
+    delta = {}
+    if before_status:
+        delta = _merge_deltas(delta, {TASK_STATUS_COLUMNS[_enum_value(before_status)]: -count})
+    if after_status:
+        delta = _merge_deltas(delta, {TASK_STATUS_COLUMNS[_enum_value(after_status)]: count})
+    return delta
+
+async def read_project_state(db, project_id: int, lock: bool = False) -> Optional[Dict[str, Any]]:
+    """Read the project columns that feed the statistics rollup and task counters"""
+    query = "SELECT id, status, progress, budget, task_total, task_completed, version FROM projects WHERE id = %s"
+    if lock:
+        query += " FOR UPDATE"
+    return await db.fetchone(query, (project_id,))
+
+async def apply_stats_delta(db, delta: Dict[str, Any]):
+    """Apply a rollup delta inside the caller's transaction"""
+    delta = {column: amount for column, amount in delta.items() if amount}
+    if not delta:
+        return
+    assignments = ", ".join(f"{column} = {column} + %s" for column in delta)
+    await db.execute(f"UPDATE project_stats SET {assignments} WHERE id = 1", list(delta.values()))
+    db.after_commit.append(stats_cache.invalidate)
+
+async def rebuild_project_stats(db) -> Dict[str, Any]:
+    """Recompute the statistics rollup from the live tables"""
+    await db.execute("INSERT IGNORE INTO project_stats (id) VALUES (1)")
+    # Lock the rollup row before the first consistent read so the aggregate
+    # snapshot includes every writer that already applied its delta
+    await db.fetchone("SELECT id FROM project_stats WHERE id = 1 FOR UPDATE")
+
+    values = {column: 0 for column in (*PROJECT_STATUS_COLUMNS.values(), *TASK_STATUS_COLUMNS.values())}
+    values['progress_sum'] = 0
+    values['budget_sum'] = Decimal(0)
+
+    rows = await db.fetchall(
+        """SELECT status, COUNT(*) as count, COALESCE(SUM(progress), 0) as progress_sum,
+                  COALESCE(SUM(budget), 0) as budget_sum
+           FROM projects GROUP BY status"""
+    )
+    for row in rows:
+        values[PROJECT_STATUS_COLUMNS[row['status']]] = row['count']
+        values['progress_sum'] += int(row['progress_sum'])
+        values['budget_sum'] += Decimal(str(row['budget_sum']))
+
+    rows = await db.fetchall("SELECT status, COUNT(*) as count FROM tasks GROUP BY status")
+    for row in rows:
+        values[TASK_STATUS_COLUMNS[row['status']]] = row['count']
+
+    assignments = ", ".join(f"{column} = %s" for column in values)
+    await db.execute(f"UPDATE project_stats SET {assignments} WHERE id = 1", list(values.values()))
+    db.after_commit.append(stats_cache.invalidate)
+    return values
+
+def stats_from_rollup(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Build the ProjectStats payload from a project_stats row"""
+    total_projects = sum(row[column] for column in PROJECT_STATUS_COLUMNS.values())
+    # MySQL's AVG() over INT columns yields four decimal places
+    average_progress = round(int(row['progress_sum']) / total_projects, 4) if total_projects else 0
+    return {
+        "total_projects": total_projects,
+        "completed_projects": row['projects_completed'],
+        "in_progress_projects": row['projects_in_progress'],
+        "planning_projects": row['projects_planning'],
+        "total_tasks": sum(row[column] for column in TASK_STATUS_COLUMNS.values()),
+        "completed_tasks": row['tasks_completed'],
+        "average_progress": float(average_progress),
+        "total_budget": float(row['budget_sum'])
+    }
+
+# ===== WORKLOAD ROLLUP =====
+# Seconds a workload or assignment result may be served from memory
+WORKLOAD_CACHE_TTL = float(os.getenv("WORKLOAD_CACHE_TTL", "30"))
+# Seconds between full recounts of the overdue counts, which writes keep
+# current but which drift as the date advances; 0 disables the job
+WORKLOAD_REFRESH_INTERVAL = float(os.getenv("WORKLOAD_REFRESH_INTERVAL", "300"))
+
+workload_cache = TTLCache(WORKLOAD_CACHE_TTL, 256)
+
+def is_overdue(task_status, deadline, today: date) -> bool:
+    """Whether a task counts as overdue on `today`, matching rebuild_assignee_stats"""
+    if not deadline or _enum_value(task_status) == TaskStatus.COMPLETED.value:
+        return False
+    return _date_text(deadline) < today.isoformat()
+
+def workload_delta(deltas: Dict[tuple, Dict[str, int]], project_id: int,
+                   before: Optional[tuple], after: Optional[tuple]):
+    """Accumulate the assignee_stats change of one task moving between (assignee, status, deadline) triples
+
+    Either side may be None for inserts and deletes; unassigned tasks are
+    not counted.
+    """
+    today = date.today()
+    for side, sign in ((before, -1), (after, 1)):
+        if not side or not side[0]:
+            continue
+        assignee, task_status, deadline = side
+        counts = deltas.setdefault((assignee, project_id), {})
+        column = TASK_STATUS_COLUMNS[_enum_value(task_status)]
+        counts[column] = counts.get(column, 0) + sign
+        if is_overdue(task_status, deadline, today):
+            counts['tasks_overdue'] = counts.get('tasks_overdue', 0) + sign
+
+async def apply_workload_deltas(db, deltas: Dict[tuple, Dict[str, int]]):
+    """Apply accumulated assignee_stats deltas inside the caller's transaction"""
+    # A fixed key order keeps concurrent writers from deadlocking on the rows
+    for (assignee, project_id), counts in sorted(deltas.items()):
+        counts = {column: amount for column, amount in counts.items() if amount}
+        if not counts:
+            continue
+        await db.execute(
+            "INSERT IGNORE INTO assignee_stats (assignee, project_id) VALUES (%s, %s)",
+            (assignee, project_id)
+        )
+        assignments = ", ".join(f"{column} = {column} + %s" for column in counts)
+        await db.execute(
+            f"UPDATE assignee_stats SET {assignments} WHERE assignee = %s AND project_id = %s",
+            [*counts.values(), assignee, project_id]
+        )
+        db.after_commit.append(workload_cache.invalidate)
+
+async def rebuild_assignee_stats(db) -> int:
+    """Recompute assignee_stats from the tasks table; returns the number of rows written"""
+    await db.execute("DELETE FROM assignee_stats")
+    return await db.execute(
+        """INSERT INTO assignee_stats
+           (assignee, project_id, tasks_pending, tasks_in_progress, tasks_completed, tasks_overdue)
+           SELECT assignee, project_id,
+                  SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END),
+                  SUM(CASE WHEN status = 'in-progress' THEN 1 ELSE 0 END),
+                  SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END),
+                  SUM(CASE WHEN deadline < %s AND status != 'completed' THEN 1 ELSE 0 END)
+           FROM tasks
+           WHERE assignee IS NOT NULL AND assignee != ''
+           GROUP BY assignee, project_id""",
+        (date.today(),)
+    )
+
+async def refresh_overdue_counts() -> int:
+    """Recount overdue tasks per assignee and project as of today
+
+    The write handlers keep the counts current as of each write; tasks
+    that become overdue as the date advances are counted here.
+    Returns the number of (assignee, project) pairs with overdue tasks.
+    """
+    async with db_session(PRIMARY) as db:
+        rows = await db.fetchall(
+            """SELECT assignee, project_id, COUNT(*) AS overdue FROM tasks
+               WHERE deadline < %s AND status != 'completed' AND assignee IS NOT NULL AND assignee != ''
+               GROUP BY assignee, project_id""",
+            (date.today(),)
+        )
+        await db.execute("UPDATE assignee_stats SET tasks_overdue = 0 WHERE tasks_overdue != 0")
+        if rows:
+            await db.executemany(
+                "UPDATE assignee_stats SET tasks_overdue = %s WHERE assignee = %s AND project_id = %s",
+                [(row['overdue'], row['assignee'], row['project_id']) for row in rows]
+            )
+        db.after_commit.append(workload_cache.invalidate)
+    return len(rows)
+
+async def refresh_overdue_periodically():
+    """Background loop refreshing overdue counts every WORKLOAD_REFRESH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(WORKLOAD_REFRESH_INTERVAL)
+        try:
+            await refresh_overdue_counts()
+        except Exception as e:
+            logger.error(f"Overdue count refresh failed: {e}")
+
+# ===== DEADLINE INDEX =====
+# Seconds between full reloads of the deadline index, bounding drift from
+# writes served by other worker processes; 0 disables the reload
+DEADLINE_INDEX_RELOAD_INTERVAL = float(os.getenv("DEADLINE_INDEX_RELOAD_INTERVAL", "600"))
+# Widest window accepted by /api/tasks/due-soon
+DUE_SOON_MAX_DAYS = 365
+
+# Task columns held by the deadline index
+DEADLINE_COLUMNS = ("id", "project_id", "title", "status", "priority", "assignee", "deadline")
+
+class DeadlineIndex:
+    """In-process index of the open tasks that have a deadline
+
+    Keys are kept sorted by (deadline, priority DESC, id), so the overdue
+    and due-soon lists are a binary search and a slice instead of a scan of
+    the tasks table. `today` only moves when the deadline scheduler flips
+    it at a day boundary.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.tasks = {}
+        self.today = date.today()
+        self.loaded = False
+        self._journal = None
+
+    @staticmethod
+    def key(task: Dict[str, Any]) -> tuple:
+        return task['deadline'], -PRIORITY_RANK.get(task['priority'], 0), task['id']
+
+    def _remove(self, task_id: int):
+        entry = self.tasks.pop(task_id, None)
+        if entry is not None:
+            key = self.key(entry)
+            del self.keys[bisect_left(self.keys, key)]
+
+    def _upsert(self, task: Dict[str, Any]):
+        self._remove(task['id'])
+        if task['deadline'] and task['status'] != TaskStatus.COMPLETED.value:
+            entry = {column: _enum_value(task[column]) for column in DEADLINE_COLUMNS}
+            self.tasks[entry['id']] = entry
+            insort(self.keys, self.key(entry))
+
+    def _discard_projects(self, project_ids: set):
+        task_ids = [task_id for task_id, task in self.tasks.items() if task['project_id'] in project_ids]
+        for task_id in task_ids:
+            self._remove(task_id)
+
+    def _apply(self, method, *args):
+        method(*args)
+        if self._journal is not None:
+            self._journal.append((method, args))
+
+    def upsert(self, task: Dict[str, Any]):
+        """Add or move a task; completed tasks and tasks without a deadline are dropped"""
+        self._apply(self._upsert, task)
+
+    def discard(self, task_id: int):
+        self._apply(self._remove, task_id)
+
+    def discard_projects(self, project_ids: set):
+        self._apply(self._discard_projects, project_ids)
+
+    async def reload(self) -> int:
+        """Rebuild the index from the tasks table; returns the number of open tasks indexed
+
+        Changes committed while the query runs are replayed on top of the
+        fresh snapshot so they are not lost.
+        """
+        self._journal = []
+        try:
+            async with db_session(PRIMARY) as db:
+                rows = await db.fetchall(
+                    f"""SELECT {', '.join(DEADLINE_COLUMNS)} FROM tasks
+                        WHERE deadline IS NOT NULL AND status != 'completed'"""
+                )
+            self.tasks = {row['id']: row for row in rows}
+            self.keys = sorted(self.key(row) for row in rows)
+            for method, args in self._journal:
+                method(*args)
+        finally:
+            self._journal = None
+        self.loaded = True
+        return len(self.tasks)
+
+    def advance(self, today: date) -> List[Dict[str, Any]]:
+        """Move `today` forward and return the tasks that became overdue"""
+        start = bisect_left(self.keys, (self.today,))
+        end = bisect_left(self.keys, (today,))
+        self.today = today
+        return [self.tasks[key[2]] for key in self.keys[start:end]]
+
+    def window(self, start: Optional[date], end: date, after: Optional[tuple], limit: int,
+               project_id: Optional[int] = None, assignee: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Tasks with a deadline in [start, end), after the `after` key, at most `limit` of them"""
+        low = bisect_left(self.keys, (start,)) if start else 0
+        if after is not None:
+            low = max(low, bisect_right(self.keys, after))
+        high = bisect_left(self.keys, (end,))
+        result = []
+        for key in self.keys[low:high]:
+            task = self.tasks[key[2]]
+            if project_id is not None and task['project_id'] != project_id:
+                continue
+            if assignee is not None and task['assignee'] != assignee:
+                continue
+            result.append(dict(task, days_until_deadline=(task['deadline'] - self.today).days))
+            if len(result) == limit:
+                break
+        return result
+
+deadline_index = DeadlineIndex()
+
+def touches_deadline_index(updates: List[str]) -> bool:
+    """Whether task SET clauses change a column held by the deadline index"""
+    return any(clause.split(" ", 1)[0] in DEADLINE_COLUMNS for clause in updates)
+
+async def reindex_tasks(db, task_ids: List[int]):
+    """Re-read tasks in the caller's transaction and update the deadline index once it commits"""
+    for chunk in _chunks(task_ids, TASK_BATCH_SIZE):
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows = await db.fetchall(
+            f"SELECT {', '.join(DEADLINE_COLUMNS)} FROM tasks WHERE id IN ({placeholders})",
+            chunk
+        )
+        for row in rows:
+            db.after_commit.append(partial(deadline_index.upsert, row))
+
+def seconds_until_tomorrow() -> float:
+    """Seconds left until local midnight"""
+    now = datetime.now()
+    return (datetime.combine(now.date() + timedelta(days=1), datetime.min.time()) - now).total_seconds()
+
+async def run_deadline_scheduler():
+    """Background loop flipping tasks to overdue at each day boundary
+
+    Newly overdue tasks are published on the change feed and the workload
+    rollup's overdue counts are refreshed. The index is also reloaded every
+    DEADLINE_INDEX_RELOAD_INTERVAL seconds.
+    """
+    last_reload = time.monotonic()
+    while True:
+        wait = seconds_until_tomorrow()
+        if DEADLINE_INDEX_RELOAD_INTERVAL > 0:
+            wait = min(wait, last_reload + DEADLINE_INDEX_RELOAD_INTERVAL - time.monotonic())
+        await asyncio.sleep(max(wait, 0) + 0.01)
+        try:
+            today = date.today()
+            if today > deadline_index.today:
+                overdue = deadline_index.advance(today)
+                for task in overdue:
+                    await change_broker.publish("task.overdue", task['project_id'], task['id'], task)
+                logger.info(f"Deadline scheduler: {len(overdue)} tasks became overdue")
+                await refresh_overdue_counts()
+            if DEADLINE_INDEX_RELOAD_INTERVAL > 0 and time.monotonic() - last_reload >= DEADLINE_INDEX_RELOAD_INTERVAL:
+                await deadline_index.reload()
+                last_reload = time.monotonic()
+        except Exception as e:
+            logger.error(f"Deadline scheduler failed: {e}")
+
+# ===== FAST JSON RESPONSES =====
+# Opt-in: encode read responses straight from database rows instead of
+# validating every row through the response models first. The models stay
+# declared on the routes, so the OpenAPI schema is unchanged.
+FAST_JSON = os.getenv("FAST_JSON", "0") == "1"
+
+def _json_value(value):
+    """Convert one column value to what the response models serialize it as"""
+    if isinstance(value, (date, datetime)):
+        return _date_text(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, Enum):
+        return value.value
+    return value
+
+def task_json(task: Dict[str, Any], fields: tuple = TASK_FIELDS) -> Dict[str, Any]:
+    """JSON-ready dict of a task row, field for field what Task produces"""
+    return {field: _json_value(task.get(field)) for field in fields}
+
+def project_json(project: Dict[str, Any], fields: tuple = PROJECT_FIELDS) -> Dict[str, Any]:
+    """JSON-ready dict of a decoded project row, field for field what Project produces"""
+    data = {field: _json_value(project.get(field)) for field in fields}
+    if 'tasks' in data:
+        data['tasks'] = [task_json(task) for task in project.get('tasks') or ()]
+    if data.get('progress', 0) is None:
+        data['progress'] = 0
+    return data
+
+def dumps_json(content) -> bytes:
+    """Encode JSON-ready content the way JSONResponse does"""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+def render_models(model, rows, fields: Optional[tuple] = None) -> bytes:
+    """Encode one row or a list of rows as a `model` (Task or Project) response body
+
+    A sparse fieldset cannot pass model validation, so it is always encoded
+    through the row converters.
+    """
+    if FAST_JSON or fields is not None:
+        convert = partial(project_json if model is Project else task_json,
+                          fields=fields or tuple(model.model_fields))
+        content = [convert(row) for row in rows] if isinstance(rows, list) else convert(rows)
+        return dumps_json(content)
+    if isinstance(rows, list):
+        content = [model.model_validate(row) for row in rows]
+    else:
+        content = model.model_validate(rows)
+    return JSONResponse(jsonable_encoder(content)).body
+
+# ===== PROJECT RESPONSE CACHE =====
+PROJECT_CACHE_TTL = float(os.getenv("PROJECT_CACHE_TTL", "30"))
+PROJECT_CACHE_SIZE = int(os.getenv("PROJECT_CACHE_SIZE", "1000"))
+# Optional tier shared by worker processes: "local" selects the in-process
+# stand-in, a redis:// URL selects Redis, empty disables it
+PROJECT_CACHE_SHARED = os.getenv("PROJECT_CACHE_SHARED", "")
+
+# Generation scope covering every GET /api/projects page
+PROJECT_LIST_SCOPE = "projects"
+# Seconds, beyond PROJECT_CACHE_TTL, that an in-process generation is kept
+# after its last bump; longer than any read in flight still holding the
+# previous value
+PROJECT_CACHE_GENERATION_GRACE = 60
+
+class SharedCache(ABC):
+    """Cache tier shared by every worker process
+
+    Values are bytes; integer counters stored with incr back the cache
+    generations.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float):
+        ...
+
+    @abstractmethod
+    async def incr(self, key: str) -> int:
+        ...
+
+    async def close(self):
+        pass
+
+class LocalSharedCache(SharedCache):
+    """In-process stand-in for the shared tier, for tests and single-worker runs"""
+
+    def __init__(self):
+        self._values = {}
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._values.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at is not None and time.monotonic() >= expires_at:
+            self._values.pop(key, None)
+            return None
+        return value
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        self._values[key] = (time.monotonic() + ttl, value)
+
+    async def incr(self, key: str) -> int:
+        value = int(await self.get(key) or 0) + 1
+        self._values[key] = (None, str(value).encode())
+        return value
+
+class RedisSharedCache(SharedCache):
+    """Shared tier backed by Redis"""
+
+    KEY_PREFIX = "pm:cache:"
+
+    def __init__(self, url: str):
+        self.client = redis_asyncio.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.client.get(self.KEY_PREFIX + key)
+
+    async def set(self, key: str, value: bytes, ttl: float):
+        await self.client.set(self.KEY_PREFIX + key, value, px=max(1, int(ttl * 1000)))
+
+    async def incr(self, key: str) -> int:
+        return await self.client.incr(self.KEY_PREFIX + key)
+
+    async def close(self):
+        await self.client.close()
+
+def create_shared_cache(setting: str) -> Optional[SharedCache]:
+    """Build the shared cache tier named by PROJECT_CACHE_SHARED"""
+    if not setting:
+        return None
+    if setting == "local":
+        return LocalSharedCache()
+    if setting.startswith(("redis://", "rediss://", "unix://")):
+        if redis_asyncio is None:
+            raise RuntimeError("A redis:// PROJECT_CACHE_SHARED requires the redis package")
+        return RedisSharedCache(setting)
+    raise RuntimeError(f"Unsupported PROJECT_CACHE_SHARED value: {setting}")
+
+class CachedResponse:
+    """Encoded JSON body of a response together with its ETag and extra headers"""
+    __slots__ = ("etag", "body", "headers")
+
+    def __init__(self, etag: str, body: bytes, headers: Optional[Dict[str, str]] = None):
+        self.etag = etag
+        self.body = body
+        self.headers = headers or {}
+
+    def to_bytes(self) -> bytes:
+        return json.dumps({"etag": self.etag, "headers": self.headers, "body": self.body.decode()}).encode()
+
+    @classmethod
+    def from_bytes(cls, raw: bytes) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(data["etag"], data["body"].encode(), data["headers"])
+
+    def respond(self, if_none_match: Optional[str]) -> Response:
+        if etag_matches(if_none_match, self.etag):
+            return not_modified(self.etag, self.headers)
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers={"ETag": self.etag, **self.headers}
+        )
+
+class ProjectCache:
+    """Read-through cache of encoded project responses
+
+    Keys embed a generation counter per project and one for list queries.
+    Writes bump the generations after commit, which orphans every affected
+    entry at once and stops a read that raced the write from caching what
+    it loaded before the commit.
+
+    In-process generations are drawn from one increasing counter and are
+    forgotten once every entry and read that could use them has expired,
+    so the map stays bounded by the recent write rate.
+    """
+
+    def __init__(self, ttl: float, max_entries: int):
+        self.ttl = ttl
+        self.local = TTLCache(ttl, max_entries)
+        self.shared: Optional[SharedCache] = None
+        # scope -> (generation, monotonic time of the bump), oldest bump first
+        self._generations = OrderedDict()
+        self._last_generation = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and (self.local.max_entries != 0 or self.shared is not None)
+
+    async def generation(self, scope: str) -> Optional[int]:
+        """Current generation of `scope`, or None when it cannot be read"""
+        if self.shared is None:
+            bumped = self._generations.get(scope)
+            return bumped[0] if bumped else 0
+        try:
+            return int(await self.shared.get(f"generation:{scope}") or 0)
+        except Exception as e:
+            logger.warning(f"Shared cache unavailable: {e}")
+            return None
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self.local.get(key)
+        if entry is None and self.shared is not None:
+            try:
+                raw = await self.shared.get(key)
+            except Exception as e:
+                logger.warning(f"Shared cache unavailable: {e}")
+                return None
+            if raw:
+                entry = CachedResponse.from_bytes(raw)
+                self.local.set(key, entry)
+        return entry
+
+    async def set(self, key: str, entry: CachedResponse, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        self.local.set(key, entry, ttl)
+        if self.shared is not None:
+            try:
+                await self.shared.set(key, entry.to_bytes(), ttl)
+            except Exception as e:
+                logger.warning(f"Shared cache unavailable: {e}")
+
+    async def invalidate(self, project_id: int):
+        """Orphan the cached responses of one project and every project list"""
+        for scope in (PROJECT_LIST_SCOPE, f"project:{project_id}"):
+            if self.shared is None:
+                self._bump(scope)
+                continue
+            try:
+                await self.shared.incr(f"generation:{scope}")
+            except Exception as e:
+                logger.error(f"Failed to invalidate cached project {project_id}: {e}")
+
+    def _bump(self, scope: str):
+        """Give `scope` a fresh in-process generation and forget expired ones
+
+        A forgotten scope reads as generation 0 again. Entries cached under
+        0 were stored before its bump and have expired by then, and every
+        other generation value is never handed out twice.
+        """
+        now = time.monotonic()
+        self._last_generation += 1
+        self._generations[scope] = (self._last_generation, now)
+        self._generations.move_to_end(scope)
+        horizon = now - self.ttl - PROJECT_CACHE_GENERATION_GRACE
+        while self._generations:
+            oldest, (_, bumped_at) = next(iter(self._generations.items()))
+            if bumped_at > horizon:
+                break
+            del self._generations[oldest]
+
+project_cache = ProjectCache(PROJECT_CACHE_TTL, PROJECT_CACHE_SIZE)
+
+def invalidate_project_cache(db, project_id: int):
+    """Drop a project's cached responses once the caller's transaction commits"""
+    db.after_commit.append(partial(project_cache.invalidate, project_id))
+
+def projects_etag(projects: List[Dict[str, Any]], *parts) -> str:
+    """Weak ETag over the rows behind a project response
+
+    updated_at only has one-second resolution, so the row values it stamps
+    are hashed with it; hashing their repr is far cheaper than encoding the
+    response body.
+    """
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(f"{part}|".encode())
+    for project in projects:
+        digest.update(repr(tuple(project.values())).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(candidate.strip().removeprefix("W/") == opaque for candidate in if_none_match.split(","))
+
+def not_modified(etag: str, headers: Dict[str, str]) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag, **headers})
+
+async def serve_cached(scope: str, shape: str, if_none_match: Optional[str], load) -> Response:
+    """Serve a project response from the cache, or build it with `load` and cache it
+
+    `load` returns (etag, build, headers). `build()` returns the encoded
+    response body and is only called when the client's If-None-Match does
+    not already match.
+    """
+    generation = await project_cache.generation(scope) if project_cache.enabled else None
+    key = f"{scope}:{generation}:{shape}"
+    if generation is not None:
+        entry = await project_cache.get(key)
+        if entry is not None:
+            return entry.respond(if_none_match)
+
+    etag, build, headers = await load()
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag, headers)
+
+    entry = CachedResponse(etag, build(), headers)
+    if generation is not None:
+        # A lagging replica may have served data older than the generation;
+        # such entries live no longer than the read-your-writes window
+        lagging = REPLICA_LAGS and routed_role() == REPLICA
+        await project_cache.set(key, entry, REPLICA_STICKY_SECONDS if lagging else None)
+    return entry.respond(None)
+
+# ===== CHANGE FEED =====
+# Events each subscriber may have queued before it is dropped as too slow
+CHANGE_FEED_QUEUE_SIZE = int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "100"))
+# Recent events kept so reconnecting clients can resume from Last-Event-ID
+CHANGE_FEED_HISTORY = int(os.getenv("CHANGE_FEED_HISTORY", "1000"))
+# Seconds between keep-alive comments on an idle stream
+CHANGE_FEED_HEARTBEAT = float(os.getenv("CHANGE_FEED_HEARTBEAT", "15"))
+
+class ChangeEvent:
+    """One project or task change, encoded once as a Server-Sent Events frame"""
+    __slots__ = ("id", "kind", "project_id", "frame")
+
+    def __init__(self, event_id: int, kind: str, project_id: int, task_id: Optional[int], data: Any):
+        self.id = event_id
+        self.kind = kind
+        self.project_id = project_id
+        payload = json.dumps(
+            {"project_id": project_id, "task_id": task_id, "data": data},
+            separators=(",", ":"), default=json_default
+        )
+        self.frame = f"id: {event_id}\nevent: {kind}\ndata: {payload}\n\n"
+
+class ChangeSubscription:
+    """Bounded queue of events for one stream, optionally limited to some projects"""
+
+    def __init__(self, project_ids: Optional[set], queue_size: int):
+        self.project_ids = project_ids
+        self.queue = asyncio.Queue(queue_size)
+        self.closed_reason: Optional[str] = None
+
+    def wants(self, event: ChangeEvent) -> bool:
+        return self.project_ids is None or event.project_id in self.project_ids
+
+    def offer(self, event: ChangeEvent) -> bool:
+        """Queue an event; returns False when the subscriber has fallen too far behind"""
+        try:
+            self.queue.put_nowait(event)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def close(self, reason: str):
+        self.closed_reason = reason
+        try:
+            # Wake the stream if it is waiting for an event
+            self.queue.put_nowait(None)
+        except asyncio.QueueFull:
+            pass
+
+class ChangeBroker(ABC):
+    """Fans change events out to change feed subscribers
+
+    The in-process broker only reaches streams served by the same worker.
+    A cross-worker broker would relay publish() through a shared channel
+    and keep event ids global so that resuming works on any worker.
+    """
+
+    @abstractmethod
+    async def publish(self, kind: str, project_id: int, task_id: Optional[int] = None, data: Any = None):
+        ...
+
+    @abstractmethod
+    async def subscribe(self, project_ids: Optional[set], last_event_id: Optional[int]) -> tuple:
+        """Register a subscription; returns (subscription, missed events)
+
+        The missed events are those after `last_event_id`, or None when
+        they are no longer known and the client has to refetch.
+        """
+
+    @abstractmethod
+    async def unsubscribe(self, subscription: ChangeSubscription):
+        ...
+
+    async def close(self):
+        pass
+
+class LocalChangeBroker(ChangeBroker):
+    """Change broker delivering to the streams of this process"""
+
+    def __init__(self, history: int, queue_size: int):
+        self.queue_size = queue_size
+        self.history = deque(maxlen=history)
+        self.last_id = 0
+        self.subscriptions = set()
+
+    async def publish(self, kind: str, project_id: int, task_id: Optional[int] = None, data: Any = None):
+        self.last_id += 1
+        event = ChangeEvent(self.last_id, kind, project_id, task_id, data)
+        self.history.append(event)
+        for subscription in list(self.subscriptions):
+            if subscription.wants(event) and not subscription.offer(event):
+                self.subscriptions.discard(subscription)
+                metrics.change_dropped.inc()
+                subscription.close("overflow")
+
+    async def subscribe(self, project_ids: Optional[set], last_event_id: Optional[int]) -> tuple:
+        subscription = ChangeSubscription(project_ids, self.queue_size)
+        missed = []
+        if last_event_id is not None:
+            oldest = self.history[0].id if self.history else self.last_id + 1
+            if oldest - 1 <= last_event_id <= self.last_id:
+                missed = [event for event in self.history if event.id > last_event_id and subscription.wants(event)]
+            else:
+                missed = None
+        self.subscriptions.add(subscription)
+        return subscription, missed
+
+    async def unsubscribe(self, subscription: ChangeSubscription):
+        self.subscriptions.discard(subscription)
+
+    async def close(self):
+        for subscription in list(self.subscriptions):
+            subscription.close("shutdown")
+        self.subscriptions.clear()
+
+change_broker: ChangeBroker = LocalChangeBroker(CHANGE_FEED_HISTORY, CHANGE_FEED_QUEUE_SIZE)
+
+def publish_change(db, kind: str, project_id: int, task_id: Optional[int] = None, data: Any = None):
+    """Publish a change event once the caller's transaction commits"""
+    db.after_commit.append(partial(change_broker.publish, kind, project_id, task_id, data))
+
+async def change_stream(request: Request, subscription: ChangeSubscription, missed: Optional[List[ChangeEvent]]):
+    """Yield the Server-Sent Events frames of one subscription until it ends"""
+    metrics.change_subscribers.inc()
+    try:
+        yield f"retry: {int(CHANGE_FEED_HEARTBEAT * 1000)}\n\n"
+        if missed is None:
+            # The client missed events that are no longer kept
+            yield "event: reset\ndata: {}\n\n"
+        else:
+            for event in missed:
+                yield event.frame
+
+        # A closed subscription still delivers what it already queued, so the
+        # client's Last-Event-ID stays exact
+        while not (subscription.closed_reason and subscription.queue.empty()):
+            try:
+                event = await asyncio.wait_for(subscription.queue.get(), CHANGE_FEED_HEARTBEAT)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            if event is None:
+                break
+            yield event.frame
+
+        if subscription.closed_reason == "overflow":
+            # The client reconnects with Last-Event-ID and resumes from history
+            yield "event: overflow\ndata: {}\n\n"
+    finally:
+        metrics.change_subscribers.inc(amount=-1)
+        await change_broker.unsubscribe(subscription)
+
+# ===== CONDITIONAL WRITES =====
+# Every API write bumps a row's version column. A write sent with
+# If-Match: "<version>" only applies while the row still has that version,
+# which is checked by the write statement itself rather than by a locking
+# read held across client round trips. The task counters, progress and
+# status that task writes derive on the project row leave its version
+# alone, so editing a task never invalidates a client's project ETag.
+RETURN_REPRESENTATION = "return=representation"
+
+def version_etag(version: int) -> str:
+    """Strong ETag of one project or task row version"""
+    return f'"{version}"'
+
+def if_match_versions(if_match: Optional[str]) -> Optional[List[int]]:
+    """Row versions an If-Match header accepts; None when any version will do
+
+    If-Match uses strong comparison, so weak or malformed tags never match.
+    """
+    if not if_match or if_match.strip() == "*":
+        return None
+    versions = []
+    for candidate in if_match.split(","):
+        tag = candidate.strip()
+        if len(tag) > 2 and tag[0] == tag[-1] == '"' and tag[1:-1].isdigit():
+            versions.append(int(tag[1:-1]))
+    return versions
+
+def version_condition(versions: Optional[List[int]]) -> tuple:
+    """WHERE clause suffix and values restricting a write to the If-Match versions"""
+    if versions is None:
+        return "", []
+    if not versions:
+        return " AND 1 = 0", []
+    return f" AND version IN ({', '.join(['%s'] * len(versions))})", list(versions)
+
+def written_version(before: Optional[Dict[str, Any]], versions: Optional[List[int]]) -> Optional[int]:
+    """Version a successful write produced, when it is known without reading the row back"""
+    if before is not None:
+        return before['version'] + 1
+    if versions and len(versions) == 1:
+        return versions[0] + 1
+    return None
+
+def precondition_failed(label: str, version: int) -> HTTPException:
+    """412 for a stale If-Match, carrying the row's current ETag"""
+    return HTTPException(
+        status_code=status.HTTP_412_PRECONDITION_FAILED,
+        detail=f"{label} has changed; it is now at version {version}",
+        headers={"ETag": version_etag(version)}
+    )
+
+def check_version(row: Dict[str, Any], versions: Optional[List[int]], label: str):
+    """Raise 412 when a row read under lock does not satisfy If-Match"""
+    if versions is not None and row['version'] not in versions:
+        raise precondition_failed(label, row['version'])
+
+async def write_conflict(db, table: str, label: str, where: str, params) -> HTTPException:
+    """Explain a conditional write that matched no row: 404 when it is gone, 412 when it changed"""
+    row = await db.fetchone(f"SELECT version FROM {table} WHERE {where}", params)
+    if not row:
+        return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=f"{label} not found")
+    return precondition_failed(label, row['version'])
+
+def wants_representation(prefer: Optional[str]) -> bool:
+    """Whether a Prefer header asks for the written row in the response"""
+    if not prefer:
+        return False
+    return any(
+        preference.split(";")[0].strip().lower() == RETURN_REPRESENTATION
+        for preference in prefer.split(",")
+    )
+
+def write_response(message: str, entity_id: int, version: Optional[int]) -> JSONResponse:
+    """Default write response, carrying the row's new ETag when it is known"""
+    headers = {"ETag": version_etag(version)} if version is not None else {}
+    return JSONResponse({"message": message, "id": entity_id}, headers=headers)
+
+def representation_response(model, row: Dict[str, Any]) -> Response:
+    """Write response carrying the row as written, for Prefer: return=representation"""
+    return Response(
+        content=render_models(model, row),
+        media_type="application/json",
+        headers={"ETag": version_etag(row['version']), "Preference-Applied": RETURN_REPRESENTATION}
+    )
+
+# ===== TASK WRITE HELPERS =====
+# Projects checked per transaction by the counter reconciliation job
+RECONCILE_BATCH_SIZE = 500
+# Seconds between background reconciliation runs; 0 disables the job
+COUNTER_RECONCILE_INTERVAL = float(os.getenv("COUNTER_RECONCILE_INTERVAL", "3600"))
+
+def task_update_assignments(task: TaskUpdate) -> tuple:
+    """Build the SET clauses and values for a partial task update"""
+    updates = []
+    values = []
+
+    if task.title:
+        updates.append("title = %s")
+        values.append(task.title)
+    if task.status:
+        updates.append("status = %s")
+        values.append(task.status)
+    if task.deadline:
+        updates.append("deadline = %s")
+        values.append(task.deadline)
+    if task.assignee:
+        updates.append("assignee = %s")
+        values.append(task.assignee)
+    if task.priority:
+        updates.append("priority = %s")
+        values.append(task.priority)
+    if task.description is not None:
+        updates.append("description = %s")
+        values.append(task.description)
+
+    return updates, values
+
+def progress_from_counts(total: int, completed: int) -> tuple:
+    """Return (progress, status) exactly as UpdateProjectProgress computes them"""
+    if not total:
+        return 0, ProjectStatus.PLANNING.value
+    # MySQL evaluates completed / total to four decimal places before scaling
+    ratio = (Decimal(completed) / Decimal(total)).quantize(Decimal("0.0001"), rounding=ROUND_HALF_UP)
+    progress = int((ratio * 100).quantize(Decimal("1"), rounding=ROUND_HALF_UP))
+    if progress == 0:
+        return progress, ProjectStatus.PLANNING.value
+    if progress >= 100:
+        return progress, ProjectStatus.COMPLETED.value
+    return progress, ProjectStatus.IN_PROGRESS.value
+
+def completed_delta(before_status: Optional[str], after_status: Optional[str]) -> int:
+    """Change in completed-task count when a task moves between statuses"""
+    completed = TaskStatus.COMPLETED.value
+    return (_enum_value(after_status) == completed) - (_enum_value(before_status) == completed)
+
+async def apply_task_counts(db, project: Dict[str, Any], total_delta: int, completed_delta: int) -> Dict[str, Any]:
+    """Apply task counter deltas to a locked project row and derive progress and status
+
+    `project` must come from read_project_state(..., lock=True) in the same
+    transaction. Returns the project state after the change. When the
+    session defers task counts the deltas are only accumulated, the project
+    state is returned unchanged and flush_task_counts writes them later.
+    """
+    if not total_delta and not completed_delta:
+        return project
+    if db.task_counts is not None:
+        pending = db.task_counts.setdefault(project['id'], {'project': project, 'total': 0, 'completed': 0})
+        pending['total'] += total_delta
+        pending['completed'] += completed_delta
+        return project
+    return await write_task_counts(db, project, total_delta, completed_delta)
+
+async def write_task_counts(db, project: Dict[str, Any], total_delta: int, completed_delta: int) -> Dict[str, Any]:
+    """Write task counter deltas, progress and status to a locked project row
+
+    The project's version is not bumped; see CONDITIONAL WRITES.
+    """
+    total = project['task_total'] + total_delta
+    completed = project['task_completed'] + completed_delta
+    progress, project_status = progress_from_counts(total, completed)
+    await db.execute(
+        "UPDATE projects SET task_total = %s, task_completed = %s, progress = %s, status = %s WHERE id = %s",
+        (total, completed, progress, project_status, project['id'])
+    )
+    if progress != project.get('progress') or project_status != project.get('status'):
+        publish_change(db, "project.progress", project['id'], data={"progress": progress, "status": project_status})
+    return {**project, 'task_total': total, 'task_completed': completed,
+            'progress': progress, 'status': project_status}
+
+async def flush_task_counts(db, project_id: Optional[int] = None):
+    """Write the task counts a session deferred, for one project or all of them
+
+    Each project's counters, progress and status are written once for all
+    of its deferred deltas, together with the matching statistics delta.
+    """
+    if not db.task_counts:
+        return
+    project_ids = list(db.task_counts) if project_id is None else [project_id]
+    for pending_id in project_ids:
+        pending = db.task_counts.pop(pending_id, None)
+        if pending is None:
+            continue
+        before = pending['project']
+        after = await write_task_counts(db, before, pending['total'], pending['completed'])
+        await apply_stats_delta(db, project_stats_delta(before, after))
+
+async def reconcile_project_counters(db, project_id: int) -> bool:
+    """Recount one project's tasks and repair its counters if they drifted"""
+    project = await read_project_state(db, project_id, lock=True)
+    if not project:
+        return False
+    counts = await db.fetchone(
+        """SELECT COUNT(*) as total, COALESCE(SUM(status = 'completed'), 0) as completed
+           FROM tasks WHERE project_id = %s""",
+        (project_id,)
+    )
+    total_delta = int(counts['total']) - project['task_total']
+    completed_delta = int(counts['completed']) - project['task_completed']
+    if not total_delta and not completed_delta:
+        return False
+    after = await apply_task_counts(db, project, total_delta, completed_delta)
+    await apply_stats_delta(db, project_stats_delta(project, after))
+    invalidate_project_cache(db, project_id)
+    logger.warning(
+        f"Repaired task counters of project {project_id}: "
+        f"total {total_delta:+d}, completed {completed_delta:+d}"
+    )
+    return True
+
+async def reconcile_task_counters() -> int:
+    """Scan all projects in id batches and repair drifted task counters
+
+    Each batch runs in its own transaction so row locks are held briefly.
+    Returns the number of repaired projects.
+    """
+    repaired = 0
+    last_id = 0
+    while True:
+        async with db_session() as db:
+            rows = await db.fetchall(
+                """SELECT p.id, p.task_total, p.task_completed,
+                          COUNT(t.id) as actual_total,
+                          COALESCE(SUM(t.status = 'completed'), 0) as actual_completed
+                   FROM (SELECT id, task_total, task_completed FROM projects
+                         WHERE id > %s ORDER BY id LIMIT %s) p
+                   LEFT JOIN tasks t ON t.project_id = p.id
+                   GROUP BY p.id, p.task_total, p.task_completed
+                   ORDER BY p.id""",
+                (last_id, RECONCILE_BATCH_SIZE)
+            )
+            if not rows:
+                return repaired
+            for row in rows:
+                if (row['task_total'] != row['actual_total']
+                        or row['task_completed'] != int(row['actual_completed'])):
+                    if await reconcile_project_counters(db, row['id']):
+                        repaired += 1
+            last_id = rows[-1]['id']
+
+async def reconcile_counters_periodically():
+    """Background loop repairing task counter drift every COUNTER_RECONCILE_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(COUNTER_RECONCILE_INTERVAL)
+        try:
+            repaired = await reconcile_task_counters()
+            if repaired:
+                logger.info(f"Counter reconciliation repaired {repaired} projects")
+        except Exception as e:
+            logger.error(f"Counter reconciliation failed: {e}")
+
+# ===== PROJECT MEMBER HELPERS =====
+# project_members.member is a VARCHAR(255)
+MEMBER_NAME_LENGTH = 255
+
+async def set_project_members(db, project_id: int, team: Optional[List[str]], replace: bool = True):
+    """Make project_members mirror a project's team list inside the caller's transaction"""
+    if replace:
+        await db.execute("DELETE FROM project_members WHERE project_id = %s", (project_id,))
+    members = list(dict.fromkeys(member[:MEMBER_NAME_LENGTH] for member in team or () if member))
+    if members:
+        # IGNORE folds names that only differ in case under the column collation
+        await db.executemany(
+            "INSERT IGNORE INTO project_members (project_id, member) VALUES (%s, %s)",
+            [(project_id, member) for member in members]
+        )
+
+async def backfill_project_members() -> int:
+    """Rebuild project_members from the team column of every project in id batches
+
+    Each batch runs in its own transaction. Returns the number of projects
+    processed.
+    """
+    processed = 0
+    last_id = 0
+    while True:
+        async with db_session(PRIMARY) as db:
+            rows = await db.fetchall(
+                "SELECT id, team FROM projects WHERE id > %s ORDER BY id LIMIT %s",
+                (last_id, RECONCILE_BATCH_SIZE)
+            )
+            if not rows:
+                return processed
+            for row in rows:
+                team = row['team']
+                if isinstance(team, (str, bytes)):
+                    team = json.loads(team)
+                await set_project_members(db, row['id'], team)
+            processed += len(rows)
+            last_id = rows[-1]['id']
+
+# ===== CURSOR PAGINATION HELPERS =====
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# MySQL compares an ENUM column with an integer by its 1-based member index,
+# so keyset conditions on priority use these ranks instead of the labels
+PRIORITY_RANK = {level.value: rank for rank, level in enumerate(PriorityLevel, start=1)}
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode keyset values into an opaque URL-safe cursor"""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """Decode a cursor produced by encode_cursor"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, dict):
+            raise ValueError("cursor payload must be an object")
+        return values
+    except (ValueError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid cursor: {e}"
+        )
+
+def project_keyset(cursor: str) -> tuple:
+    """Return the (created_at, id) position stored in a project cursor"""
+    values = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(values["created_at"]), int(values["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a project cursor"
+        )
+
+def id_keyset(cursor: str) -> int:
+    """Return the id stored in a cursor over a list ordered by id"""
+    values = decode_cursor(cursor)
+    try:
+        return int(values["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not an id cursor"
+        )
+
+def project_cursor(project: Dict[str, Any]) -> str:
+    """Build the cursor pointing just past `project` in created_at DESC, id DESC order"""
+    return encode_cursor({
+        "created_at": project['created_at'].isoformat(sep=" "),
+        "id": project['id']
+    })
+
+def task_keyset(cursor: str) -> tuple:
+    """Return the (priority rank, deadline, id) position stored in a task cursor"""
+    values = decode_cursor(cursor)
+    try:
+        deadline = date.fromisoformat(values["deadline"]) if values["deadline"] else None
+        return int(values["priority"]), deadline, int(values["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a task cursor"
+        )
+
+def task_cursor(task: Dict[str, Any]) -> str:
+    """Build the cursor pointing just past `task` in priority DESC, deadline ASC, id ASC order"""
+    return encode_cursor({
+        "priority": PRIORITY_RANK[task['priority']],
+        "deadline": task['deadline'].isoformat() if task['deadline'] else None,
+        "id": task['id']
+    })
+
+def deadline_keyset(cursor: str) -> tuple:
+    """Return the deadline index key stored in a deadline cursor"""
+    values = decode_cursor(cursor)
+    try:
+        return date.fromisoformat(values["deadline"]), -int(values["priority"]), int(values["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a deadline cursor"
+        )
+
+def deadline_cursor(task: Dict[str, Any]) -> str:
+    """Build the cursor pointing just past `task` in deadline ASC, priority DESC, id ASC order"""
+    return encode_cursor({
+        "deadline": task['deadline'].isoformat(),
+        "priority": PRIORITY_RANK[task['priority']],
+        "id": task['id']
+    })
+
+def task_keyset_condition(priority_rank: int, deadline: Optional[date], task_id: int) -> tuple:
+    """SQL predicate selecting tasks after a keyset position
+
+    Deadlines sort NULL first in ascending order, so a NULL deadline in the
+    cursor is followed by every non-NULL deadline of the same priority.
+    """
+    if deadline is None:
+        later_deadline = "deadline IS NOT NULL"
+        same_deadline = "deadline IS NULL"
+        deadline_params = []
+    else:
+        later_deadline = "deadline > %s"
+        same_deadline = "deadline = %s"
+        deadline_params = [deadline]
+
+    condition = (
+        f" AND (priority < %s"
+        f" OR (priority = %s AND {later_deadline})"
+        f" OR (priority = %s AND {same_deadline} AND id > %s))"
+    )
+    params = [priority_rank, priority_rank, *deadline_params, priority_rank, *deadline_params, task_id]
+    return condition, params
+
+# ===== DELTA SYNC HELPERS =====
+# Sync tokens reach back this far before the moment they were issued, so
+# that rows stamped by transactions still in flight, or not yet replayed
+# on a lagging replica, are picked up by the next sync. Clients apply
+# changes as upserts, so rows seen twice are harmless.
+SYNC_OVERLAP_SECONDS = float(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+# Days tombstones are kept; older sync tokens must start over with a full sync
+SYNC_TOMBSTONE_DAYS = int(os.getenv("SYNC_TOMBSTONE_DAYS", "30"))
+# Seconds between tombstone pruning runs
+TOMBSTONE_PRUNE_INTERVAL = 3600
+# Row kinds a sync pages through side by side, each by its own id
+SYNC_PAGE_KINDS = ("projects", "tasks", "tombstones")
+
+async def db_now(db) -> datetime:
+    """Current time on the database clock, which stamps updated_at"""
+    now = (await db.fetchone("SELECT CURRENT_TIMESTAMP AS now"))['now']
+    return datetime.fromisoformat(now) if isinstance(now, str) else now
+
+def sync_token(now: datetime) -> str:
+    """Build the token a client passes as `since` on its next sync"""
+    since = now - timedelta(seconds=SYNC_OVERLAP_SECONDS)
+    return encode_cursor({"since": since.replace(microsecond=0).isoformat(sep=" ")})
+
+def sync_since(token: str) -> datetime:
+    """Return the position stored in a sync token"""
+    values = decode_cursor(token)
+    try:
+        return datetime.fromisoformat(values["since"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a sync token"
+        )
+
+def sync_page_cursor(issued: datetime, since_at: Optional[datetime], positions: Dict[str, int]) -> str:
+    """Build the cursor for the next page of a sync started at `issued`"""
+    return encode_cursor({
+        "issued": issued.isoformat(sep=" "),
+        "since": since_at.isoformat(sep=" ") if since_at else None,
+        **positions
+    })
+
+def sync_page_position(cursor: str) -> tuple:
+    """Return the (issued, since, positions) stored in a sync page cursor"""
+    values = decode_cursor(cursor)
+    try:
+        issued = datetime.fromisoformat(values["issued"])
+        since_at = datetime.fromisoformat(values["since"]) if values["since"] else None
+        positions = {kind: int(values[kind]) for kind in SYNC_PAGE_KINDS}
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a sync cursor"
+        )
+    return issued, since_at, positions
+
+async def record_project_tombstones(db, project_id: int):
+    """Record a project and all of its tasks as deleted; call before the delete cascades"""
+    await db.execute(
+        """INSERT INTO tombstones (entity, entity_id, project_id)
+           SELECT 'task', id, project_id FROM tasks WHERE project_id = %s""",
+        (project_id,)
+    )
+    await db.execute(
+        "INSERT INTO tombstones (entity, entity_id, project_id) VALUES ('project', %s, %s)",
+        (project_id, project_id)
+    )
+
+async def record_task_tombstones(db, project_id: int, task_ids: List[int]):
+    """Record tasks of one project as deleted"""
+    await db.executemany(
+        "INSERT INTO tombstones (entity, entity_id, project_id) VALUES ('task', %s, %s)",
+        [(task_id, project_id) for task_id in task_ids]
+    )
+
+async def prune_tombstones() -> int:
+    """Delete tombstones older than SYNC_TOMBSTONE_DAYS; returns how many were removed"""
+    async with db_session(PRIMARY) as db:
+        cutoff = await db_now(db) - timedelta(days=SYNC_TOMBSTONE_DAYS)
+        return await db.execute("DELETE FROM tombstones WHERE deleted_at < %s", (cutoff,))
+
+async def prune_tombstones_periodically():
+    """Background loop pruning expired tombstones every TOMBSTONE_PRUNE_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(TOMBSTONE_PRUNE_INTERVAL)
+        try:
+            pruned = await prune_tombstones()
+            if pruned:
+                logger.info(f"Pruned {pruned} expired tombstones")
+        except Exception as e:
+            logger.error(f"Tombstone pruning failed: {e}")
+
+# ===== ARCHIVAL =====
+# Completed projects not updated for this many days are moved to the
+# archive tables; 0 disables the background archival job
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", "180"))
+ARCHIVE_INTERVAL = float(os.getenv("ARCHIVE_INTERVAL", "86400"))
+# Projects moved per transaction, and the task count at which a batch is
+# cut short, so that each transaction holds its row locks only briefly
+ARCHIVE_BATCH_SIZE = int(os.getenv("ARCHIVE_BATCH_SIZE", "50"))
+ARCHIVE_BATCH_TASKS = int(os.getenv("ARCHIVE_BATCH_TASKS", "5000"))
+# Seconds between archival batches, leaving the tables to live traffic
+ARCHIVE_BATCH_PAUSE = float(os.getenv("ARCHIVE_BATCH_PAUSE", "0.5"))
+
+# Columns copied between the live and archive tables
+PROJECT_TABLE_COLUMNS = (
+    "id", "name", "description", "status", "progress", "deadline", "priority", "budget", "team",
+    "category", "task_total", "task_completed", "version", "created_at", "updated_at"
+)
+TASK_TABLE_COLUMNS = (
+    "id", "project_id", "title", "description", "status", "deadline", "assignee", "priority",
+    "version", "created_at", "updated_at"
+)
+
+async def archive_batch(db, cutoff: datetime) -> List[int]:
+    """Move one batch of completed projects last updated before `cutoff` to the archive
+
+    The projects and their tasks are copied into archived_projects and
+    archived_tasks and then deleted from the live tables, with the same
+    rollup, tombstone and cache bookkeeping as a delete. Returns the ids
+    of the archived projects.
+    """
+    candidates = await db.fetchall(
+        """SELECT id, status, progress, budget, task_total FROM projects
+           WHERE status = 'completed' AND updated_at < %s
+           ORDER BY updated_at, id LIMIT %s FOR UPDATE""",
+        (cutoff, ARCHIVE_BATCH_SIZE)
+    )
+    batch = []
+    batch_tasks = 0
+    for project in candidates:
+        if batch and batch_tasks + project['task_total'] > ARCHIVE_BATCH_TASKS:
+            break
+        batch.append(project)
+        batch_tasks += project['task_total']
+    if not batch:
+        return []
+
+    project_ids = [project['id'] for project in batch]
+    placeholders = ", ".join(["%s"] * len(project_ids))
+    task_counts = await db.fetchall(
+        f"SELECT status, COUNT(*) as count FROM tasks WHERE project_id IN ({placeholders}) GROUP BY status",
+        project_ids
+    )
+    project_columns = ", ".join(PROJECT_TABLE_COLUMNS)
+    task_columns = ", ".join(TASK_TABLE_COLUMNS)
+    await db.execute(
+        f"""INSERT INTO archived_projects ({project_columns})
+            SELECT {project_columns} FROM projects WHERE id IN ({placeholders})""",
+        project_ids
+    )
+    await db.execute(
+        f"""INSERT INTO archived_tasks ({task_columns})
+            SELECT {task_columns} FROM tasks WHERE project_id IN ({placeholders})""",
+        project_ids
+    )
+    for project_id in project_ids:
+        await record_project_tombstones(db, project_id)
+    # Cascades to the tasks, project_members and assignee_stats rows
+    await db.execute(f"DELETE FROM projects WHERE id IN ({placeholders})", project_ids)
+
+    await apply_stats_delta(db, _merge_deltas(
+        *(project_stats_delta(project, None) for project in batch),
+        *(task_stats_delta(row['status'], None, row['count']) for row in task_counts)
+    ))
+    for project_id in project_ids:
+        invalidate_project_cache(db, project_id)
+        publish_change(db, "project.archived", project_id)
+    db.after_commit.append(workload_cache.invalidate)
+    db.after_commit.append(partial(deadline_index.discard_projects, set(project_ids)))
+    return project_ids
+
+async def archive_projects(older_than_days: int = ARCHIVE_AFTER_DAYS) -> int:
+    """Archive completed projects not updated for `older_than_days` days in throttled batches
+
+    Each batch runs in its own transaction. Returns the number of projects
+    archived.
+    """
+    archived = 0
+    while True:
+        async with db_session(PRIMARY) as db:
+            cutoff = await db_now(db) - timedelta(days=older_than_days)
+            project_ids = await archive_batch(db, cutoff)
+        if not project_ids:
+            return archived
+        archived += len(project_ids)
+        await asyncio.sleep(ARCHIVE_BATCH_PAUSE)
+
+async def archive_projects_periodically():
+    """Background loop archiving old completed projects every ARCHIVE_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(ARCHIVE_INTERVAL)
+        try:
+            archived = await archive_projects()
+            if archived:
+                logger.info(f"Archived {archived} completed projects")
+        except Exception as e:
+            logger.error(f"Project archival failed: {e}")
+
+# ===== FULL-TEXT SEARCH HELPERS =====
+SEARCH_SNIPPET_LENGTH = 200
+
+def prefix_query(q: str) -> str:
+    """Turn free text into a BOOLEAN MODE query requiring every word as a prefix"""
+    words = re.findall(r"\w+", q)
+    if not words:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one word"
+        )
+    return " ".join(f"+{word}*" for word in words)
+
+def search_keyset(cursor: str) -> tuple:
+    """Return the (score, kind, id) position stored in a search cursor"""
+    values = decode_cursor(cursor)
+    try:
+        return float(values["score"]), str(values["kind"]), int(values["id"])
+    except (KeyError, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor: not a search cursor"
+        )
+
+def search_cursor(hit: Dict[str, Any]) -> str:
+    """Build the cursor pointing just past `hit` in score DESC, kind ASC, id ASC order"""
+    return encode_cursor({"score": float(hit['score']), "kind": hit['kind'], "id": hit['id']})
+
+# ===== EXPORT HELPERS =====
+# Rows fetched from the server-side cursor per round trip
+EXPORT_BATCH_SIZE = 1000
+
+PROJECT_EXPORT_COLUMNS = [
+    'id', 'name', 'description', 'status', 'progress', 'deadline', 'priority',
+    'budget', 'team', 'category', 'created_at', 'updated_at'
+]
+
+TASK_EXPORT_COLUMNS = [
+    'id', 'project_id', 'title', 'description', 'status', 'deadline',
+    'assignee', 'priority', 'created_at', 'updated_at'
+]
+
+EXPORT_MEDIA_TYPES = {
+    ExportFormat.NDJSON: "application/x-ndjson",
+    ExportFormat.CSV: "text/csv"
+}
+
+def json_default(value):
+    """JSON encoder fallback for values returned by the database drivers"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+async def export_rows(query: str, params: List[Any], columns: List[str], fmt: ExportFormat):
+    """Stream query results as NDJSON or CSV chunks, one chunk per fetched batch"""
+    async with db_session() as db:
+        if fmt == ExportFormat.CSV:
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(columns)
+            yield buffer.getvalue()
+
+        async for rows in db.stream(query, params, EXPORT_BATCH_SIZE):
+            if fmt == ExportFormat.CSV:
+                buffer = io.StringIO()
+                writer = csv.writer(buffer)
+                writer.writerows([_csv_value(row[column]) for column in columns] for row in rows)
+                yield buffer.getvalue()
+            else:
+                lines = []
+                for row in rows:
+                    if 'team' in row:
+                        row['team'] = json.loads(row['team']) if row['team'] else []
+                    lines.append(json.dumps(row, default=json_default))
+                yield "\n".join(lines) + "\n"
+
+def export_response(query: str, params: List[Any], columns: List[str], fmt: ExportFormat, name: str) -> StreamingResponse:
+    """Wrap export_rows in a downloadable streaming response"""
+    filename = f"{name}-{datetime.now().strftime('%Y%m%d%H%M%S')}.{fmt.value}"
+    return StreamingResponse(
+        export_rows(query, params, columns, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+# ===== FASTAPI APPLICATION INITIALIZATION =====
+app = FastAPI(
+    title="Enterprise Project Management API",
+    description="Professional-grade API for comprehensive project management",
+    version="1.0.0",
+    docs_url="/api/docs",
+    redoc_url="/api/redoc"
+)
+
+# ===== ADMISSION CONTROL MIDDLEWARE =====
+# Added first so it runs innermost and its 503 responses carry CORS headers
+app.add_middleware(AdmissionMiddleware)
+
+# ===== CORS MIDDLEWARE =====
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Retry-After", "Preference-Applied"],
+    max_age=3600
+)
+
+# ===== METRICS MIDDLEWARE =====
+app.add_middleware(MetricsMiddleware)
+
+# ===== READ ROUTING MIDDLEWARE =====
+app.add_middleware(ReadRoutingMiddleware)
+
+# ===== STARTUP AND SHUTDOWN EVENTS =====
+@app.on_event("startup")
+async def startup_event():
+    """Initialize database on startup"""
+    try:
+        await init_pool(PRIMARY)
+        await init_db()
+        project_cache.shared = create_shared_cache(PROJECT_CACHE_SHARED)
+        if REPLICA_ENABLED:
+            # An unreachable replica must not block startup; reads use the
+            # primary until a health check succeeds
+            await check_replica()
+            background_tasks.append(asyncio.create_task(check_replica_periodically()))
+        if COUNTER_RECONCILE_INTERVAL > 0:
+            background_tasks.append(asyncio.create_task(reconcile_counters_periodically()))
+        if SYNC_TOMBSTONE_DAYS > 0:
+            background_tasks.append(asyncio.create_task(prune_tombstones_periodically()))
+        if WORKLOAD_REFRESH_INTERVAL > 0:
+            background_tasks.append(asyncio.create_task(refresh_overdue_periodically()))
+        await deadline_index.reload()
+        background_tasks.append(asyncio.create_task(run_deadline_scheduler()))
+        if ARCHIVE_AFTER_DAYS > 0 and ARCHIVE_INTERVAL > 0:
+            background_tasks.append(asyncio.create_task(archive_projects_periodically()))
+        logger.info(f"Application started successfully using {DB_DRIVER}")
+    except Exception as e:
+        logger.error(f"Startup error: {e}")
+        raise
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Cleanup on shutdown"""
+    global replica_healthy
+    for task in background_tasks:
+        task.cancel()
+    background_tasks.clear()
+    await change_broker.close()
+    if project_cache.shared:
+        await project_cache.shared.close()
+        project_cache.shared = None
+    replica_healthy = False
+    await close_pool(REPLICA)
+    await close_pool(PRIMARY)
+
+# ===== DATABASE INITIALIZATION =====
+async def ensure_column(db, table: str, column: str, definition: str) -> bool:
+    """Add a column to an existing table if it is missing; returns True when added"""
+    exists = await db.fetchone(
+        """SELECT 1 FROM information_schema.COLUMNS
+           WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND COLUMN_NAME = %s""",
+        (table, column)
+    )
+    if exists:
+        return False
+    await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {definition}")
+    logger.info(f"Added column {table}.{column}")
+    return True
+
+async def table_exists(db, table: str) -> bool:
+    """Whether a table exists in the current database"""
+    if db.dialect == "sqlite":
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s"
+    else:
+        query = "SELECT 1 FROM information_schema.TABLES WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s"
+    return bool(await db.fetchone(query, (table,)))
+
+async def ensure_index(db, table: str, index: str, columns: str) -> bool:
+    """Add an index to an existing table if it is missing; returns True when added"""
+    exists = await db.fetchone(
+        """SELECT 1 FROM information_schema.STATISTICS
+           WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s AND INDEX_NAME = %s
+           LIMIT 1""",
+        (table, index)
+    )
+    if exists:
+        return False
+    await db.execute(f"ALTER TABLE {table} ADD INDEX {index} ({columns})")
+    logger.info(f"Added index {table}.{index}")
+    return True
+
+# SQLite rendition of the MySQL schema: ENUMs become CHECK constraints,
+# priority sorts by ENUM position through the PRIORITY collation and the
+# ON UPDATE CURRENT_TIMESTAMP columns are maintained by triggers. Progress
+# and task counters are maintained by the API, exactly as on MySQL.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE COLLATE NOCASE,
+    description TEXT,
+    status TEXT DEFAULT 'planning' CHECK (status IN ('planning', 'in-progress', 'completed')),
+    progress INTEGER DEFAULT 0 CHECK (progress >= 0 AND progress <= 100),
+    deadline DATE,
+    priority TEXT COLLATE PRIORITY DEFAULT 'medium' CHECK (priority IN ('low', 'medium', 'high', 'critical')),
+    budget DECIMAL(15, 2) DEFAULT 0,
+    team TEXT,
+    category TEXT,
+    task_total INTEGER NOT NULL DEFAULT 0,
+    task_completed INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_projects_status ON projects (status);
+CREATE INDEX IF NOT EXISTS idx_projects_priority ON projects (priority);
+CREATE INDEX IF NOT EXISTS idx_projects_created_at ON projects (created_at);
+CREATE INDEX IF NOT EXISTS idx_projects_updated_at ON projects (updated_at);
+
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT DEFAULT 'pending' CHECK (status IN ('pending', 'in-progress', 'completed')),
+    deadline DATE,
+    assignee TEXT,
+    priority TEXT COLLATE PRIORITY DEFAULT 'medium' CHECK (priority IN ('low', 'medium', 'high', 'critical')),
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_id ON tasks (project_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status);
+CREATE INDEX IF NOT EXISTS idx_tasks_updated_at ON tasks (updated_at);
+CREATE INDEX IF NOT EXISTS idx_tasks_assignee ON tasks (assignee);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_status_priority ON tasks (project_id, status, priority DESC, deadline);
+CREATE INDEX IF NOT EXISTS idx_tasks_project_priority ON tasks (project_id, priority DESC, deadline);
+
+CREATE TABLE IF NOT EXISTS project_members (
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    member TEXT NOT NULL COLLATE NOCASE,
+    PRIMARY KEY (project_id, member)
+);
+CREATE INDEX IF NOT EXISTS idx_project_members_member ON project_members (member, project_id);
+
+CREATE TABLE IF NOT EXISTS project_stats (
+    id INTEGER PRIMARY KEY,
+    projects_planning INTEGER NOT NULL DEFAULT 0,
+    projects_in_progress INTEGER NOT NULL DEFAULT 0,
+    projects_completed INTEGER NOT NULL DEFAULT 0,
+    tasks_pending INTEGER NOT NULL DEFAULT 0,
+    tasks_in_progress INTEGER NOT NULL DEFAULT 0,
+    tasks_completed INTEGER NOT NULL DEFAULT 0,
+    progress_sum INTEGER NOT NULL DEFAULT 0,
+    budget_sum DECIMAL(20, 2) NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS assignee_stats (
+    assignee TEXT NOT NULL,
+    project_id INTEGER NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    tasks_pending INTEGER NOT NULL DEFAULT 0,
+    tasks_in_progress INTEGER NOT NULL DEFAULT 0,
+    tasks_completed INTEGER NOT NULL DEFAULT 0,
+    tasks_overdue INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (assignee, project_id)
+);
+CREATE INDEX IF NOT EXISTS idx_assignee_stats_project_id ON assignee_stats (project_id);
+
+CREATE TABLE IF NOT EXISTS tombstones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity TEXT NOT NULL CHECK (entity IN ('project', 'task')),
+    entity_id INTEGER NOT NULL,
+    project_id INTEGER NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON tombstones (deleted_at);
+
+CREATE INDEX IF NOT EXISTS idx_projects_status_updated_at ON projects (status, updated_at);
+
+CREATE TABLE IF NOT EXISTS archived_projects (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL COLLATE NOCASE,
+    description TEXT,
+    status TEXT,
+    progress INTEGER,
+    deadline DATE,
+    priority TEXT COLLATE PRIORITY,
+    budget DECIMAL(15, 2),
+    team TEXT,
+    category TEXT,
+    task_total INTEGER NOT NULL DEFAULT 0,
+    task_completed INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_archived_projects_created_at ON archived_projects (created_at);
+
+CREATE TABLE IF NOT EXISTS archived_tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL,
+    title TEXT NOT NULL,
+    description TEXT,
+    status TEXT,
+    deadline DATE,
+    assignee TEXT,
+    priority TEXT COLLATE PRIORITY,
+    version INTEGER NOT NULL DEFAULT 1,
+    created_at TIMESTAMP,
+    updated_at TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_archived_tasks_project_id ON archived_tasks (project_id);
+
+CREATE TRIGGER IF NOT EXISTS projects_touch_updated_at
+AFTER UPDATE ON projects FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE projects SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS tasks_touch_updated_at
+AFTER UPDATE ON tasks FOR EACH ROW WHEN NEW.updated_at IS OLD.updated_at
+BEGIN
+    UPDATE tasks SET updated_at = CURRENT_TIMESTAMP WHERE id = NEW.id;
+END;
+"""
+
+async def create_mysql_schema(db) -> bool:
+    """Create the MySQL tables; returns True when the task counters had to be added"""
+    # Create projects table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS projects (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL UNIQUE,
+            description TEXT,
+            status ENUM('planning', 'in-progress', 'completed') DEFAULT 'planning',
+            progress INT DEFAULT 0 CHECK (progress >= 0 AND progress <= 100),
+            deadline DATE,
+            priority ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
+            budget DECIMAL(15, 2) DEFAULT 0,
+            team JSON,
+            category VARCHAR(100),
+            task_total INT NOT NULL DEFAULT 0,
+            task_completed INT NOT NULL DEFAULT 0,
+            version INT NOT NULL DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            INDEX idx_status (status),
+            INDEX idx_priority (priority),
+            INDEX idx_created_at (created_at),
+            INDEX idx_updated_at (updated_at),
+            FULLTEXT INDEX ft_name_description (name, description)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create tasks table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INT AUTO_INCREMENT PRIMARY KEY,
+            project_id INT NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            description TEXT,
+            status ENUM('pending', 'in-progress', 'completed') DEFAULT 'pending',
+            deadline DATE,
+            assignee VARCHAR(255),
+            priority ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
+            version INT NOT NULL DEFAULT 1,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE,
+            INDEX idx_project_id (project_id),
+            INDEX idx_status (status),
+            INDEX idx_updated_at (updated_at),
+            INDEX idx_assignee (assignee),
+            INDEX idx_project_status_priority (project_id, status, priority DESC, deadline),
+            INDEX idx_project_priority (project_id, priority DESC, deadline),
+            FULLTEXT INDEX ft_title_description (title, description)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create statistics rollup table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS project_stats (
+            id TINYINT PRIMARY KEY,
+            projects_planning INT NOT NULL DEFAULT 0,
+            projects_in_progress INT NOT NULL DEFAULT 0,
+            projects_completed INT NOT NULL DEFAULT 0,
+            tasks_pending INT NOT NULL DEFAULT 0,
+            tasks_in_progress INT NOT NULL DEFAULT 0,
+            tasks_completed INT NOT NULL DEFAULT 0,
+            progress_sum BIGINT NOT NULL DEFAULT 0,
+            budget_sum DECIMAL(20, 2) NOT NULL DEFAULT 0
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create team membership index mirroring projects.team
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS project_members (
+            project_id INT NOT NULL,
+            member VARCHAR(255) NOT NULL,
+            PRIMARY KEY (project_id, member),
+            INDEX idx_member_project (member, project_id),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create per-assignee workload rollup table
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS assignee_stats (
+            assignee VARCHAR(255) NOT NULL,
+            project_id INT NOT NULL,
+            tasks_pending INT NOT NULL DEFAULT 0,
+            tasks_in_progress INT NOT NULL DEFAULT 0,
+            tasks_completed INT NOT NULL DEFAULT 0,
+            tasks_overdue INT NOT NULL DEFAULT 0,
+            PRIMARY KEY (assignee, project_id),
+            INDEX idx_project_id (project_id),
+            FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create tombstone table recording deletes for /api/sync
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS tombstones (
+            id BIGINT AUTO_INCREMENT PRIMARY KEY,
+            entity ENUM('project', 'task') NOT NULL,
+            entity_id INT NOT NULL,
+            project_id INT NOT NULL,
+            deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_deleted_at (deleted_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Create archive tables for old completed projects and their tasks
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS archived_projects (
+            id INT PRIMARY KEY,
+            name VARCHAR(255) NOT NULL,
+            description TEXT,
+            status ENUM('planning', 'in-progress', 'completed'),
+            progress INT,
+            deadline DATE,
+            priority ENUM('low', 'medium', 'high', 'critical'),
+            budget DECIMAL(15, 2),
+            team JSON,
+            category VARCHAR(100),
+            task_total INT NOT NULL DEFAULT 0,
+            task_completed INT NOT NULL DEFAULT 0,
+            version INT NOT NULL DEFAULT 1,
+            created_at TIMESTAMP NULL,
+            updated_at TIMESTAMP NULL,
+            archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            INDEX idx_created_at (created_at)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+    await db.execute("""
+        CREATE TABLE IF NOT EXISTS archived_tasks (
+            id INT PRIMARY KEY,
+            project_id INT NOT NULL,
+            title VARCHAR(255) NOT NULL,
+            description TEXT,
+            status ENUM('pending', 'in-progress', 'completed'),
+            deadline DATE,
+            assignee VARCHAR(255),
+            priority ENUM('low', 'medium', 'high', 'critical'),
+            version INT NOT NULL DEFAULT 1,
+            created_at TIMESTAMP NULL,
+            updated_at TIMESTAMP NULL,
+            INDEX idx_project_id (project_id)
+        ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4
+    """)
+
+    # Databases created before archival existed
+    await ensure_index(db, 'projects', 'idx_status_updated_at', 'status, updated_at')
+
+    # Databases created before delta sync existed
+    await ensure_index(db, 'projects', 'idx_updated_at', 'updated_at')
+    await ensure_index(db, 'tasks', 'idx_updated_at', 'updated_at')
+    await ensure_index(db, 'tasks', 'idx_assignee', 'assignee')
+
+    # Databases created before the task list was paged by priority; the
+    # descending key matches ORDER BY priority DESC, deadline ASC
+    await ensure_index(db, 'tasks', 'idx_project_status_priority', 'project_id, status, priority DESC, deadline')
+    await ensure_index(db, 'tasks', 'idx_project_priority', 'project_id, priority DESC, deadline')
+
+    # Databases created before conditional writes existed
+    for table in ('projects', 'tasks', 'archived_projects', 'archived_tasks'):
+        await ensure_column(db, table, 'version', 'INT NOT NULL DEFAULT 1')
+
+    # Databases created before the task counters existed
+    counters_added = await ensure_column(db, 'projects', 'task_total', 'INT NOT NULL DEFAULT 0')
+    counters_added |= await ensure_column(db, 'projects', 'task_completed', 'INT NOT NULL DEFAULT 0')
+    # Databases built from the old database.sql recount progress with
+    # per-row triggers that the counters replace
+    for trigger in ('update_progress_on_task_insert', 'update_progress_on_task_update',
+                    'update_progress_on_task_delete'):
+        await db.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    return counters_added
+
+async def init_db():
+    """Initialize database with tables"""
+    counters_added = False
+    members_added = False
+    async with db_session() as db:
+        try:
+            members_added = not await table_exists(db, 'project_members')
+            workload_added = not await table_exists(db, 'assignee_stats')
+            if db.dialect == "sqlite":
+                await db.executescript(SQLITE_SCHEMA)
+            else:
+                counters_added = await create_mysql_schema(db)
+
+            if not await db.fetchone("SELECT id FROM project_stats WHERE id = 1"):
+                await rebuild_project_stats(db)
+
+            if workload_added:
+                await rebuild_assignee_stats(db)
+
+            logger.info("Database tables initialized")
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error initializing database: {e}")
+
+    if counters_added:
+        repaired = await reconcile_task_counters()
+        logger.info(f"Backfilled task counters for {repaired} projects")
+
+    if members_added:
+        processed = await backfill_project_members()
+        logger.info(f"Backfilled team members for {processed} projects")
+
+# ===== HEALTH CHECK ENDPOINT =====
+@app.get("/api/health", tags=["Health"])
+async def health_check():
+    """Health check endpoint"""
+    try:
+        async with db_session(PRIMARY) as db:
+            await db.fetchone("SELECT 1")
+        if not REPLICA_ENABLED:
+            replica = "disabled"
+        else:
+            replica = "healthy" if replica_healthy else "unavailable"
+        return {
+            "status": "ok",
+            "message": "API is running",
+            "driver": DB_DRIVER,
+            "replica": replica,
+            "timestamp": datetime.now().isoformat()
+        }
+    except Exception as e:
+        logger.error(f"Health check failed: {e}")
+        return JSONResponse(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            content={"status": "error", "detail": str(e)}
+        )
+
+# ===== METRICS ENDPOINT =====
+@app.get("/api/metrics", tags=["Health"], response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus text exposition of request, SQL and pool metrics"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+# ===== PROJECT ENDPOINTS =====
+
+@app.get("/api/projects", response_model=List[Project], tags=["Projects"])
+async def get_all_projects(
+    status_filter: Optional[str] = Query(None, alias="status"),
+    priority_filter: Optional[str] = Query(None, alias="priority"),
+    skip: int = Query(0, ge=0, description="Legacy offset paging; prefer cursor"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    include_tasks: TaskInclude = Query(TaskInclude.FULL),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return"),
+    include_archived: bool = Query(False, description="Also list archived projects"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get all projects with optional filtering
+
+    Pages are ordered by newest first. When more rows exist, the cursor for the
+    next page is returned in the X-Next-Cursor response header. Pages are
+    served from the project cache and carry an ETag for conditional requests.
+    With `fields`, only those columns are read and returned. Archived
+    projects are only listed with `include_archived`; they carry archived_at.
+    """
+    if cursor and skip:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Use either cursor or skip, not both"
+        )
+
+    fields = parse_fields(fields, PROJECT_FIELDS)
+    shape = json.dumps([status_filter, priority_filter, skip, limit, cursor, include_tasks.value, fields, include_archived])
+    return await serve_cached(
+        PROJECT_LIST_SCOPE, shape, if_none_match,
+        partial(load_project_page, status_filter, priority_filter, skip, limit, cursor, include_tasks, fields,
+                include_archived)
+    )
+
+async def load_project_page(status_filter: Optional[str], priority_filter: Optional[str], skip: int,
+                            limit: int, cursor: Optional[str], include_tasks: TaskInclude,
+                            fields: Optional[tuple] = None, include_archived: bool = False):
+    """Load one page of projects for get_all_projects"""
+    async with db_session() as db:
+        try:
+            conditions = " WHERE 1=1"
+            params = []
+
+            if status_filter:
+                conditions += " AND status = %s"
+                params.append(status_filter)
+
+            if priority_filter:
+                conditions += " AND priority = %s"
+                params.append(priority_filter)
+
+            if cursor:
+                # InnoDB secondary indexes carry the primary key, so
+                # idx_created_at already serves the (created_at, id) ordering
+                created_at, last_id = project_keyset(cursor)
+                conditions += " AND (created_at < %s OR (created_at = %s AND id < %s))"
+                params.extend([created_at, created_at, last_id])
+
+            order = " ORDER BY created_at DESC, id DESC LIMIT %s OFFSET %s"
+            columns = select_list(fields, PROJECT_COLUMNS, PROJECT_KEY_COLUMNS)
+            if include_archived:
+                # Either table may supply the whole page, so read enough of
+                # both and merge them in page order
+                projects = await db.fetchall(f"SELECT {columns} FROM projects{conditions}{order}",
+                                             [*params, skip + limit + 1, 0])
+                columns = select_list(fields, ARCHIVED_PROJECT_COLUMNS, ARCHIVED_PROJECT_KEY_COLUMNS)
+                projects += await db.fetchall(f"SELECT {columns} FROM archived_projects{conditions}{order}",
+                                              [*params, skip + limit + 1, 0])
+                projects.sort(key=lambda project: (project['created_at'], project['id']), reverse=True)
+                projects = projects[skip:skip + limit + 1]
+            else:
+                projects = await db.fetchall(f"SELECT {columns} FROM projects{conditions}{order}",
+                                             [*params, limit + 1, skip])
+
+            headers = {}
+            if len(projects) > limit:
+                projects = projects[:limit]
+                headers[NEXT_CURSOR_HEADER] = project_cursor(projects[-1])
+
+            projects = await attach_tasks(db, projects, embedded_tasks(include_tasks, fields))
+            etag = projects_etag(projects, include_tasks.value, fields, headers.get(NEXT_CURSOR_HEADER))
+            return etag, partial(render_models, Project, projects, fields), headers
+        except DatabaseError as e:
+            logger.error(f"Error fetching projects: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch projects"
+            )
+
+@app.get("/api/projects/{project_id}", response_model=Project, tags=["Projects"])
+async def get_project(
+    project_id: int = Path(..., gt=0),
+    include_tasks: TaskInclude = Query(TaskInclude.FULL),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return"),
+    include_archived: bool = Query(False, description="Fall back to the archive when the project is not live"),
+    if_none_match: Optional[str] = Header(None)
+):
+    """Get a specific project, served from the project cache with an ETag"""
+    fields = parse_fields(fields, PROJECT_FIELDS)
+    return await serve_cached(
+        f"project:{project_id}", json.dumps([include_tasks.value, fields, include_archived]), if_none_match,
+        partial(load_project, project_id, include_tasks, fields, include_archived)
+    )
+
+async def load_project(project_id: int, include_tasks: TaskInclude, fields: Optional[tuple] = None,
+                       include_archived: bool = False):
+    """Load one project for get_project"""
+    async with db_session() as db:
+        try:
+            project = await fetch_project(db, project_id, include_tasks, fields, include_archived)
+            etag = projects_etag([project], include_tasks.value, fields)
+            return etag, partial(render_models, Project, project, fields), {}
+        except DatabaseError as e:
+            logger.error(f"Error fetching project: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch project"
+            )
+
+async def insert_project(db, project: ProjectCreate) -> Dict[str, Any]:
+    """Create a project in the caller's transaction and return it"""
+    team_json = json.dumps(project.team) if project.team else json.dumps([])
+
+    try:
+        await db.execute(
+            """INSERT INTO projects
+               (name, description, status, priority, deadline, budget, team, category, progress)
+               VALUES (%s, %s, %s, %s, %s, %s, %s, %s, 0)""",
+            (project.name, project.description, project.status, project.priority,
+             project.deadline, project.budget, team_json, project.category)
+        )
+    except DatabaseError as e:
+        if "Duplicate entry" in str(e):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Project name already exists"
+            )
+        raise
+    project_id = db.lastrowid
+    invalidate_project_cache(db, project_id)
+    await set_project_members(db, project_id, project.team, replace=False)
+    await apply_stats_delta(db, project_stats_delta(
+        None, {'status': project.status, 'progress': 0, 'budget': project.budget}
+    ))
+    logger.info(f"Project {project_id} created")
+
+    created = await fetch_project(db, project_id)
+    publish_change(db, "project.created", project_id, data=project_json(created, PROJECT_COLUMNS))
+    return created
+
+@app.post("/api/projects", response_model=Project, status_code=status.HTTP_201_CREATED, tags=["Projects"])
+async def create_project(project: ProjectCreate):
+    """Create a new project"""
+    async with db_session() as db:
+        try:
+            return await insert_project(db, project)
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error creating project: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create project"
+            )
+
+async def write_project_update(db, project_id: int, project: ProjectUpdate, versions: Optional[List[int]],
+                               representation: bool = False) -> tuple:
+    """Update a project in the caller's transaction
+
+    Returns (project, version): the updated project when `representation`
+    is set (None otherwise) and its new version when that is known.
+    """
+    label = f"Project {project_id}"
+    # Task counts a batch deferred feed the status and progress read below
+    await flush_task_counts(db, project_id)
+
+    updates = []
+    values = []
+
+    if project.name:
+        updates.append("name = %s")
+        values.append(project.name)
+    if project.description is not None:
+        updates.append("description = %s")
+        values.append(project.description)
+    if project.status:
+        updates.append("status = %s")
+        values.append(project.status)
+    if project.progress is not None:
+        updates.append("progress = %s")
+        values.append(project.progress)
+    if project.deadline:
+        updates.append("deadline = %s")
+        values.append(project.deadline)
+    if project.priority:
+        updates.append("priority = %s")
+        values.append(project.priority)
+    if project.budget is not None:
+        updates.append("budget = %s")
+        values.append(project.budget)
+    if project.team is not None:
+        updates.append("team = %s")
+        values.append(json.dumps(project.team))
+    if project.category:
+        updates.append("category = %s")
+        values.append(project.category)
+
+    # The statistics rollup moves with the current status, progress and
+    # budget, so only those updates lock and read the row first; any
+    # other update is a single conditional statement
+    before = None
+    if not updates or project.status or project.progress is not None or project.budget is not None:
+        before = await read_project_state(db, project_id, lock=bool(updates))
+        if not before:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{label} not found"
+            )
+        check_version(before, versions, label)
+
+    if updates:
+        condition, condition_values = version_condition(None if before else versions)
+        values.append(project_id)
+        values.extend(condition_values)
+        query = (f"UPDATE projects SET {', '.join(updates)}, version = version + 1, "
+                 f"updated_at = CURRENT_TIMESTAMP WHERE id = %s{condition}")
+        if not await db.execute(query, values):
+            raise await write_conflict(db, "projects", label, "id = %s", (project_id,))
+        invalidate_project_cache(db, project_id)
+        if project.team is not None:
+            await set_project_members(db, project_id, project.team)
+
+        if before:
+            after = dict(before)
+            if project.status:
+                after['status'] = project.status
+            if project.progress is not None:
+                after['progress'] = project.progress
+            if project.budget is not None:
+                after['budget'] = project.budget
+            await apply_stats_delta(db, project_stats_delta(before, after))
+        publish_change(db, "project.updated", project_id, data=project.model_dump(exclude_unset=True, mode="json"))
+        logger.info(f"Project {project_id} updated")
+
+    if representation:
+        updated = await fetch_project(db, project_id)
+        return updated, updated['version']
+    return None, written_version(before, versions) if updates else before['version']
+
+@app.put("/api/projects/{project_id}", tags=["Projects"])
+async def update_project(
+    project_id: int = Path(..., gt=0),
+    project: ProjectUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
+    prefer: Optional[str] = Header(None)
+):
+    """Update a project
+
+    With If-Match the update only applies to the project version it names
+    (412 otherwise). Prefer: return=representation returns the updated project.
+    """
+    async with db_session() as db:
+        try:
+            updated, version = await write_project_update(
+                db, project_id, project, if_match_versions(if_match), wants_representation(prefer)
+            )
+            if updated is not None:
+                return representation_response(Project, updated)
+            return write_response("Project updated successfully", project_id, version)
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error updating project: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to update project"
+            )
+
+async def remove_project(db, project_id: int, versions: Optional[List[int]]):
+    """Delete a project and its tasks in the caller's transaction"""
+    # Deferred task counts of the project are folded into its statistics first
+    await flush_task_counts(db, project_id)
+    before = await read_project_state(db, project_id, lock=True)
+    if not before:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project {project_id} not found"
+        )
+    check_version(before, versions, f"Project {project_id}")
+
+    task_counts = await db.fetchall(
+        "SELECT status, COUNT(*) as count FROM tasks WHERE project_id = %s GROUP BY status",
+        (project_id,)
+    )
+
+    await record_project_tombstones(db, project_id)
+    await db.execute("DELETE FROM projects WHERE id = %s", (project_id,))
+    invalidate_project_cache(db, project_id)
+    # The delete cascades to the project's assignee_stats rows
+    db.after_commit.append(workload_cache.invalidate)
+    db.after_commit.append(partial(deadline_index.discard_projects, {project_id}))
+    await apply_stats_delta(db, _merge_deltas(
+        project_stats_delta(before, None),
+        *(task_stats_delta(row['status'], None, row['count']) for row in task_counts)
+    ))
+    publish_change(db, "project.deleted", project_id)
+    logger.info(f"Project {project_id} deleted")
+
+@app.delete("/api/projects/{project_id}", tags=["Projects"])
+async def delete_project(
+    project_id: int = Path(..., gt=0),
+    if_match: Optional[str] = Header(None)
+):
+    """Delete a project, only at the version named by If-Match when one is sent"""
+    async with db_session() as db:
+        try:
+            await remove_project(db, project_id, if_match_versions(if_match))
+            return {"message": "Project deleted successfully", "id": project_id}
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error deleting project: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to delete project"
+            )
+
+@app.post("/api/projects/{project_id}/restore", response_model=Project, tags=["Projects"])
+async def restore_project(project_id: int = Path(..., gt=0)):
+    """Move an archived project and its tasks back into the live tables"""
+    async with db_session() as db:
+        try:
+            archived = await db.fetchone("SELECT * FROM archived_projects WHERE id = %s FOR UPDATE", (project_id,))
+            if not archived:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Archived project {project_id} not found"
+                )
+            if await db.fetchone("SELECT id FROM projects WHERE name = %s", (archived['name'],)):
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"A live project named '{archived['name']}' already exists"
+                )
+
+            # updated_at is refreshed so that delta sync clients pick the rows up again
+            project_columns = ", ".join(column for column in PROJECT_TABLE_COLUMNS if column != 'updated_at')
+            task_columns = ", ".join(column for column in TASK_TABLE_COLUMNS if column != 'updated_at')
+            await db.execute(
+                f"""INSERT INTO projects ({project_columns}, updated_at)
+                    SELECT {project_columns}, CURRENT_TIMESTAMP FROM archived_projects WHERE id = %s""",
+                (project_id,)
+            )
+            await db.execute(
+                f"""INSERT INTO tasks ({task_columns}, updated_at)
+                    SELECT {task_columns}, CURRENT_TIMESTAMP FROM archived_tasks WHERE project_id = %s""",
+                (project_id,)
+            )
+            tasks = await db.fetchall(
+                f"SELECT {', '.join(DEADLINE_COLUMNS)} FROM tasks WHERE project_id = %s", (project_id,)
+            )
+            await db.execute("DELETE FROM archived_tasks WHERE project_id = %s", (project_id,))
+            await db.execute("DELETE FROM archived_projects WHERE id = %s", (project_id,))
+
+            team = archived['team']
+            if isinstance(team, (str, bytes)):
+                team = json.loads(team)
+            await set_project_members(db, project_id, team)
+            await apply_stats_delta(db, _merge_deltas(
+                project_stats_delta(None, archived),
+                *(task_stats_delta(None, task['status']) for task in tasks)
+            ))
+            workload = {}
+            for task in tasks:
+                workload_delta(workload, project_id, None, (task['assignee'], task['status'], task['deadline']))
+                db.after_commit.append(partial(deadline_index.upsert, task))
+            await apply_workload_deltas(db, workload)
+            invalidate_project_cache(db, project_id)
+            publish_change(db, "project.restored", project_id)
+
+            result = await fetch_project(db, project_id)
+            logger.info(f"Project {project_id} restored from the archive with {len(tasks)} tasks")
+            return result
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error restoring project: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to restore project"
+            )
+
+# ===== TASK ENDPOINTS =====
+
+@app.get("/api/projects/{project_id}/tasks", response_model=List[Task], tags=["Tasks"])
+async def get_project_tasks(
+    response: Response,
+    project_id: int = Path(..., gt=0),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    assignee: Optional[str] = Query(None, max_length=MEMBER_NAME_LENGTH),
+    deadline_from: Optional[date] = Query(None, description="Only tasks due on or after this date"),
+    deadline_to: Optional[date] = Query(None, description="Only tasks due on or before this date"),
+    limit: Optional[int] = Query(None, ge=1, le=1000, description="Page size; omit to return every task"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return")
+):
+    """Get tasks for a project
+
+    Tasks are ordered by priority DESC, deadline ASC, id ASC, which the
+    (project_id, status, priority, deadline) indexes serve without a sort.
+    Without limit or cursor every task is returned. Otherwise results are paged
+    and the cursor for the next page is returned in the X-Next-Cursor header.
+    With `fields`, only those columns are read and returned.
+    """
+    fields = parse_fields(fields, TASK_FIELDS)
+    if cursor and limit is None:
+        limit = 100
+
+    async with db_session() as db:
+        try:
+            if not await db.fetchone("SELECT id FROM projects WHERE id = %s", (project_id,)):
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Project {project_id} not found"
+                )
+
+            query = f"SELECT {select_list(fields, TASK_FIELDS, TASK_KEY_COLUMNS)} FROM tasks WHERE project_id = %s"
+            params = [project_id]
+
+            if status_filter:
+                query += " AND status = %s"
+                params.append(status_filter)
+
+            if assignee:
+                query += " AND assignee = %s"
+                params.append(assignee)
+
+            if deadline_from:
+                query += " AND deadline >= %s"
+                params.append(deadline_from)
+
+            if deadline_to:
+                query += " AND deadline <= %s"
+                params.append(deadline_to)
+
+            if cursor:
+                condition, condition_params = task_keyset_condition(*task_keyset(cursor))
+                query += condition
+                params.extend(condition_params)
+
+            query += " ORDER BY priority DESC, deadline ASC, id ASC"
+
+            if limit is not None:
+                query += " LIMIT %s"
+                params.append(limit + 1)
+
+            tasks = await db.fetchall(query, params)
+
+            if limit is not None and len(tasks) > limit:
+                tasks = tasks[:limit]
+                response.headers[NEXT_CURSOR_HEADER] = task_cursor(tasks[-1])
+
+            if FAST_JSON or fields is not None:
+                return Response(
+                    content=render_models(Task, tasks, fields),
+                    media_type="application/json",
+                    headers={
+                        name: value for name, value in response.headers.items()
+                        if name == NEXT_CURSOR_HEADER.lower()
+                    }
+                )
+            return tasks
+        except DatabaseError as e:
+            logger.error(f"Error fetching tasks: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch tasks"
+            )
+
+async def insert_task(db, project_id: int, task: TaskCreate) -> Dict[str, Any]:
+    """Create a task in the caller's transaction and return it"""
+    project_before = await read_project_state(db, project_id, lock=True)
+    if not project_before:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Project {project_id} not found"
+        )
+
+    await db.execute(
+        """INSERT INTO tasks
+           (project_id, title, description, status, deadline, assignee, priority)
+           VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+        (project_id, task.title, task.description, task.status, task.deadline, task.assignee, task.priority)
+    )
+    task_id = db.lastrowid
+    invalidate_project_cache(db, project_id)
+    result = await db.fetchone("SELECT * FROM tasks WHERE id = %s", (task_id,))
+    publish_change(db, "task.created", project_id, task_id, task_json(result))
+    db.after_commit.append(partial(deadline_index.upsert, result))
+
+    project_after = await apply_task_counts(db, project_before, 1, completed_delta(None, task.status))
+    await apply_stats_delta(db, _merge_deltas(
+        task_stats_delta(None, task.status),
+        project_stats_delta(project_before, project_after)
+    ))
+    workload = {}
+    workload_delta(workload, project_id, None, (task.assignee, task.status, task.deadline))
+    await apply_workload_deltas(db, workload)
+
+    logger.info(f"Task {task_id} created")
+    return result
+
+@app.post("/api/projects/{project_id}/tasks", response_model=Task, status_code=status.HTTP_201_CREATED, tags=["Tasks"])
+async def create_task(
+    project_id: int = Path(..., gt=0),
+    task: TaskCreate = Body(...)
+):
+    """Create a task"""
+    async with db_session() as db:
+        try:
+            return await insert_task(db, project_id, task)
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error creating task: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to create task"
+            )
+
+async def write_task_update(db, project_id: int, task_id: int, task: TaskUpdate, versions: Optional[List[int]],
+                            representation: bool = False) -> tuple:
+    """Update a task in the caller's transaction
+
+    Returns (task, version): the updated task when `representation` is set
+    (None otherwise) and its new version when that is known.
+    """
+    label = f"Task {task_id}"
+    updates, values = task_update_assignments(task)
+
+    # Status, assignee and deadline changes move the project's counters and
+    # the workload rollup, which need the task's current values; any other
+    # update is a single conditional statement
+    existing = None
+    project_before = None
+    if not updates or task.status or task.assignee or task.deadline:
+        # Status changes move the project's counters, so lock the
+        # project row before reading the task's current status
+        project_before = await read_project_state(db, project_id, lock=True) if task.status else None
+        query = "SELECT id, status, assignee, deadline, version FROM tasks WHERE id = %s AND project_id = %s"
+        if updates:
+            query += " FOR UPDATE"
+        existing = await db.fetchone(query, (task_id, project_id))
+        if not existing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"{label} not found"
+            )
+        check_version(existing, versions, label)
+
+    if updates:
+        condition, condition_values = version_condition(None if existing else versions)
+        values.extend([task_id, project_id, *condition_values])
+        query = (f"UPDATE tasks SET {', '.join(updates)}, version = version + 1, "
+                 f"updated_at = CURRENT_TIMESTAMP WHERE id = %s AND project_id = %s{condition}")
+        if not await db.execute(query, values):
+            raise await write_conflict(db, "tasks", label, "id = %s AND project_id = %s", (task_id, project_id))
+        invalidate_project_cache(db, project_id)
+        publish_change(db, "task.updated", project_id, task_id, task.model_dump(exclude_unset=True, mode="json"))
+        if touches_deadline_index(updates):
+            await reindex_tasks(db, [task_id])
+
+        status_changed = bool(task.status) and _enum_value(task.status) != existing['status']
+        if status_changed:
+            project_after = await apply_task_counts(
+                db, project_before, 0, completed_delta(existing['status'], task.status)
+            )
+            await apply_stats_delta(db, _merge_deltas(
+                task_stats_delta(existing['status'], task.status),
+                project_stats_delta(project_before, project_after)
+            ))
+
+        if existing:
+            before = (existing['assignee'], existing['status'], existing['deadline'])
+            after = (
+                existing['assignee'] if not task.assignee else task.assignee,
+                existing['status'] if not task.status else _enum_value(task.status),
+                existing['deadline'] if not task.deadline else task.deadline
+            )
+            if before != after:
+                workload = {}
+                workload_delta(workload, project_id, before, after)
+                await apply_workload_deltas(db, workload)
+        logger.info(f"Task {task_id} updated")
+
+    if representation:
+        updated = await db.fetchone("SELECT * FROM tasks WHERE id = %s", (task_id,))
+        return updated, updated['version']
+    return None, written_version(existing, versions) if updates else existing['version']
+
+@app.put("/api/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
+async def update_task(
+    project_id: int = Path(..., gt=0),
+    task_id: int = Path(..., gt=0),
+    task: TaskUpdate = Body(...),
+    if_match: Optional[str] = Header(None),
+    prefer: Optional[str] = Header(None)
+):
+    """Update a task
+
+    With If-Match the update only applies to the task version it names
+    (412 otherwise). Prefer: return=representation returns the updated task.
+    """
+    async with db_session() as db:
+        try:
+            updated, version = await write_task_update(
+                db, project_id, task_id, task, if_match_versions(if_match), wants_representation(prefer)
+            )
+            if updated is not None:
+                return representation_response(Task, updated)
+            return write_response("Task updated successfully", task_id, version)
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error updating task: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to update task"
+            )
+
+async def remove_task(db, project_id: int, task_id: int, versions: Optional[List[int]]):
+    """Delete a task in the caller's transaction"""
+    project_before = await read_project_state(db, project_id, lock=True)
+    existing = await db.fetchone(
+        "SELECT id, status, assignee, deadline, version FROM tasks WHERE id = %s AND project_id = %s FOR UPDATE",
+        (task_id, project_id)
+    )
+    if not existing:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Task {task_id} not found"
+        )
+    check_version(existing, versions, f"Task {task_id}")
+
+    await record_task_tombstones(db, project_id, [task_id])
+    await db.execute("DELETE FROM tasks WHERE id = %s", (task_id,))
+    invalidate_project_cache(db, project_id)
+    publish_change(db, "task.deleted", project_id, task_id)
+    db.after_commit.append(partial(deadline_index.discard, task_id))
+    project_after = await apply_task_counts(db, project_before, -1, completed_delta(existing['status'], None))
+    await apply_stats_delta(db, _merge_deltas(
+        task_stats_delta(existing['status'], None),
+        project_stats_delta(project_before, project_after)
+    ))
+    workload = {}
+    workload_delta(workload, project_id, (existing['assignee'], existing['status'], existing['deadline']), None)
+    await apply_workload_deltas(db, workload)
+    logger.info(f"Task {task_id} deleted")
+
+@app.delete("/api/projects/{project_id}/tasks/{task_id}", tags=["Tasks"])
+async def delete_task(
+    project_id: int = Path(..., gt=0),
+    task_id: int = Path(..., gt=0),
+    if_match: Optional[str] = Header(None)
+):
+    """Delete a task, only at the version named by If-Match when one is sent"""
+    async with db_session() as db:
+        try:
+            await remove_task(db, project_id, task_id, if_match_versions(if_match))
             return {"message": "Task deleted successfully", "id": task_id}
-        except Error as e:
-            conn.rollback()
+        except DatabaseError as e:
+            await db.rollback()
             logger.error(f"Error deleting task: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to delete task"
             )
 
+@app.post("/api/projects/{project_id}/tasks:bulk", response_model=TaskBulkResult, tags=["Tasks"])
+async def bulk_tasks(
+    project_id: int = Path(..., gt=0),
+    request: TaskBulkRequest = Body(...)
+):
+    """Create, update and delete many tasks of a project in one transaction
+
+    The project's task counters, progress and status are updated once for
+    the whole batch.
+    """
+    update_ids = [item.id for item in request.update]
+    touched_ids = update_ids + request.delete
+
+    if len(touched_ids) != len(set(touched_ids)):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each task id may appear only once across update and delete"
+        )
+
+    async with db_session() as db:
+        try:
+            project_before = await read_project_state(db, project_id, lock=True)
+            if not project_before:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Project {project_id} not found"
+                )
+
+            existing = {}
+            assignees = {}
+            deadlines = {}
+            for chunk in _chunks(touched_ids, TASK_BATCH_SIZE):
+                placeholders = ", ".join(["%s"] * len(chunk))
+                rows = await db.fetchall(
+                    f"""SELECT id, status, assignee, deadline FROM tasks
+                        WHERE project_id = %s AND id IN ({placeholders}) FOR UPDATE""",
+                    [project_id, *chunk]
+                )
+                existing.update({row['id']: row['status'] for row in rows})
+                assignees.update({row['id']: row['assignee'] for row in rows})
+                deadlines.update({row['id']: row['deadline'] for row in rows})
+
+            missing = [task_id for task_id in touched_ids if task_id not in existing]
+            if missing:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"Tasks not found in project {project_id}: {missing}"
+                )
+
+            deltas = []
+            workload = {}
+            total_delta = 0
+            completed_change = 0
+
+            if request.delete:
+                await record_task_tombstones(db, project_id, request.delete)
+                for chunk in _chunks(request.delete, TASK_BATCH_SIZE):
+                    placeholders = ", ".join(["%s"] * len(chunk))
+                    await db.execute(
+                        f"DELETE FROM tasks WHERE project_id = %s AND id IN ({placeholders})",
+                        [project_id, *chunk]
+                    )
+                for task_id in request.delete:
+                    db.after_commit.append(partial(deadline_index.discard, task_id))
+                    deltas.append(task_stats_delta(existing[task_id], None))
+                    completed_change += completed_delta(existing[task_id], None)
+                    workload_delta(
+                        workload, project_id, (assignees[task_id], existing[task_id], deadlines[task_id]), None
+                    )
+                total_delta -= len(request.delete)
+
+            # Updates touching the same columns share one executemany call
+            statements = {}
+            reindexed = []
+            for item in request.update:
+                updates, values = task_update_assignments(item)
+                if not updates:
+                    continue
+                statements.setdefault(tuple(updates), []).append((*values, item.id, project_id))
+                if touches_deadline_index(updates):
+                    reindexed.append(item.id)
+                if item.status:
+                    deltas.append(task_stats_delta(existing[item.id], item.status))
+                    completed_change += completed_delta(existing[item.id], item.status)
+                if item.status or item.assignee or item.deadline:
+                    workload_delta(
+                        workload, project_id,
+                        (assignees[item.id], existing[item.id], deadlines[item.id]),
+                        (assignees[item.id] if not item.assignee else item.assignee, item.status or existing[item.id],
+                         deadlines[item.id] if not item.deadline else item.deadline)
+                    )
+            for updates, seq_params in statements.items():
+                await db.executemany(
+                    f"""UPDATE tasks SET {', '.join(updates)}, version = version + 1, updated_at = CURRENT_TIMESTAMP
+                        WHERE id = %s AND project_id = %s""",
+                    seq_params
+                )
+            await reindex_tasks(db, reindexed)
+
+            created = []
+            if request.create:
+                last_id = (await db.fetchone(
+                    "SELECT COALESCE(MAX(id), 0) as last_id FROM tasks WHERE project_id = %s",
+                    (project_id,)
+                ))['last_id']
+                await db.executemany(
+                    """INSERT INTO tasks
+                       (project_id, title, description, status, deadline, assignee, priority)
+                       VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+                    [(project_id, task.title, task.description, task.status, task.deadline, task.assignee, task.priority)
+                     for task in request.create]
+                )
+                for task in request.create:
+                    deltas.append(task_stats_delta(None, task.status))
+                    completed_change += completed_delta(None, task.status)
+                total_delta += len(request.create)
+                # The project row lock keeps other writers from adding tasks
+                # to this project, so every newer id belongs to this batch
+                created = await db.fetchall(
+                    "SELECT * FROM tasks WHERE project_id = %s AND id > %s ORDER BY id",
+                    (project_id, last_id)
+                )
+                for task in created:
+                    workload_delta(workload, project_id, None, (task['assignee'], task['status'], task['deadline']))
+                    db.after_commit.append(partial(deadline_index.upsert, task))
+
+            publish_change(db, "tasks.bulk", project_id, data={
+                "created": [task['id'] for task in created], "updated": update_ids, "deleted": request.delete
+            })
+            project_after = await apply_task_counts(db, project_before, total_delta, completed_change)
+            await apply_stats_delta(db, _merge_deltas(*deltas, project_stats_delta(project_before, project_after)))
+            await apply_workload_deltas(db, workload)
+            invalidate_project_cache(db, project_id)
+
+            logger.info(
+                f"Bulk task write on project {project_id}: {len(created)} created, "
+                f"{len(update_ids)} updated, {len(request.delete)} deleted"
+            )
+            return {"created": created, "updated": update_ids, "deleted": request.delete}
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error in bulk task write: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to write tasks"
+            )
+
+# ===== BATCH ENDPOINT =====
+# Savepoint each operation of an independent batch runs under
+BATCH_SAVEPOINT = "batch_operation"
+
+async def run_batch_operation(db, operation, representation: bool) -> tuple:
+    """Run one batch operation; returns (status code, JSON-ready body, version)"""
+    if operation.op == "project.create":
+        created = await insert_project(db, operation.body)
+        return status.HTTP_201_CREATED, project_json(created), created['version']
+    if operation.op == "project.update":
+        updated, version = await write_project_update(
+            db, operation.project_id, operation.body, if_match_versions(operation.if_match), representation
+        )
+        if updated is not None:
+            return status.HTTP_200_OK, project_json(updated), version
+        return status.HTTP_200_OK, {"message": "Project updated successfully", "id": operation.project_id}, version
+    if operation.op == "project.delete":
+        await remove_project(db, operation.project_id, if_match_versions(operation.if_match))
+        return status.HTTP_200_OK, {"message": "Project deleted successfully", "id": operation.project_id}, None
+    if operation.op == "task.create":
+        created = await insert_task(db, operation.project_id, operation.body)
+        return status.HTTP_201_CREATED, task_json(created), created['version']
+    if operation.op == "task.update":
+        updated, version = await write_task_update(
+            db, operation.project_id, operation.task_id, operation.body,
+            if_match_versions(operation.if_match), representation
+        )
+        if updated is not None:
+            return status.HTTP_200_OK, task_json(updated), version
+        return status.HTTP_200_OK, {"message": "Task updated successfully", "id": operation.task_id}, version
+    await remove_task(db, operation.project_id, operation.task_id, if_match_versions(operation.if_match))
+    return status.HTTP_200_OK, {"message": "Task deleted successfully", "id": operation.task_id}, None
+
+def batch_result(index: int, status_code: int, body: Any, version: Optional[int] = None) -> Dict[str, Any]:
+    """Batch result of one operation, with the row's new ETag when it is known"""
+    return {
+        "index": index,
+        "status": status_code,
+        "outcome": BatchOutcome.COMMITTED.value,
+        "body": body,
+        "etag": version_etag(version) if version is not None else None
+    }
+
+def batch_failure(index: int, error: Exception) -> Dict[str, Any]:
+    """Batch result of a failed operation, shaped like the endpoint's error response"""
+    if isinstance(error, HTTPException):
+        return {
+            "index": index,
+            "status": error.status_code,
+            "outcome": BatchOutcome.FAILED.value,
+            "body": {"error": "HTTP Error", "detail": error.detail},
+            "etag": (error.headers or {}).get("ETag")
+        }
+    logger.error(f"Batch operation {index} failed: {error}")
+    return {
+        "index": index,
+        "status": status.HTTP_500_INTERNAL_SERVER_ERROR,
+        "outcome": BatchOutcome.FAILED.value,
+        "body": {"error": "HTTP Error", "detail": "Database operation failed"},
+        "etag": None
+    }
+
+def batch_skipped(index: int, failed_index: int) -> Dict[str, Any]:
+    """Result of an atomic batch operation undone or never run because another one failed"""
+    rolled_back = index < failed_index
+    detail = f"{'Rolled back' if rolled_back else 'Not executed'} because operation {failed_index} failed"
+    return {
+        "index": index,
+        "status": status.HTTP_424_FAILED_DEPENDENCY,
+        "outcome": (BatchOutcome.ROLLED_BACK if rolled_back else BatchOutcome.NOT_EXECUTED).value,
+        "body": {"error": "HTTP Error", "detail": detail},
+        "etag": None
+    }
+
+@app.post("/api/batch", response_model=BatchResponse, tags=["Batch"])
+async def run_batch(
+    request: BatchRequest = Body(...),
+    prefer: Optional[str] = Header(None)
+):
+    """Run an ordered list of project and task writes on one connection in one transaction
+
+    Every operation is validated and executed exactly as its single-operation
+    endpoint would, and its result carries the status code that endpoint would
+    have answered. In `atomic` mode the first failing operation rolls the whole
+    batch back and its status becomes the response status; the operations
+    before it are reported as rolled back and those after it as not executed,
+    both with 424. In `independent` mode each operation runs under a
+    savepoint, so a failing operation is rolled back on its own and the rest
+    commit. Task counters, progress and status are written once per project
+    for the whole batch.
+    Prefer: return=representation applies to every update.
+    """
+    representation = wants_representation(prefer)
+    atomic = request.mode == BatchMode.ATOMIC
+    results = []
+    failure = None
+    try:
+        async with db_session() as db:
+            db.task_counts = {}
+            for index, operation in enumerate(request.operations):
+                if not atomic:
+                    callbacks = len(db.after_commit)
+                    task_counts = {project_id: dict(pending) for project_id, pending in db.task_counts.items()}
+                    await db.execute(f"SAVEPOINT {BATCH_SAVEPOINT}")
+                try:
+                    results.append(batch_result(index, *await run_batch_operation(db, operation, representation)))
+                except (HTTPException, DatabaseError) as e:
+                    if atomic:
+                        failure = batch_failure(index, e)
+                        raise
+                    await db.execute(f"ROLLBACK TO SAVEPOINT {BATCH_SAVEPOINT}")
+                    del db.after_commit[callbacks:]
+                    db.task_counts = task_counts
+                    results.append(batch_failure(index, e))
+                if not atomic:
+                    await db.execute(f"RELEASE SAVEPOINT {BATCH_SAVEPOINT}")
+            await flush_task_counts(db)
+    except HTTPException:
+        if failure is None:
+            raise
+        logger.info(f"Batch of {len(request.operations)} operations rolled back at operation {failure['index']}")
+        results = [
+            failure if index == failure['index'] else batch_skipped(index, failure['index'])
+            for index in range(len(request.operations))
+        ]
+        return JSONResponse(status_code=failure['status'], content={"committed": False, "results": results})
+
+    failed = sum(result['status'] >= 400 for result in results)
+    logger.info(f"Batch of {len(request.operations)} operations committed with {failed} failures")
+    return JSONResponse(content={"committed": True, "results": results})
+
+# ===== DEADLINE ENDPOINTS =====
+def deadline_page(start: Optional[date], end: date, project_id: Optional[int], assignee: Optional[str],
+                  limit: int, cursor: Optional[str]) -> Response:
+    """One page of the deadline index as a DueTask list response"""
+    after = deadline_keyset(cursor) if cursor else None
+    tasks = deadline_index.window(start, end, after, limit + 1, project_id, assignee)
+    headers = {}
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        headers[NEXT_CURSOR_HEADER] = deadline_cursor(tasks[-1])
+    return Response(content=render_models(DueTask, tasks), media_type="application/json", headers=headers)
+
+@app.get("/api/tasks/overdue", response_model=List[DueTask], tags=["Tasks"])
+async def get_overdue_tasks(
+    project_id: Optional[int] = Query(None, gt=0),
+    assignee: Optional[str] = Query(None, max_length=MEMBER_NAME_LENGTH),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get open tasks whose deadline has passed, oldest deadline first
+
+    Served from the in-process deadline index without querying the
+    database; the cursor for the next page is returned in the
+    X-Next-Cursor header.
+    """
+    return deadline_page(None, deadline_index.today, project_id, assignee, limit, cursor)
+
+@app.get("/api/tasks/due-soon", response_model=List[DueTask], tags=["Tasks"])
+async def get_due_soon_tasks(
+    days: int = Query(7, ge=0, le=DUE_SOON_MAX_DAYS, description="Include deadlines up to this many days ahead"),
+    project_id: Optional[int] = Query(None, gt=0),
+    assignee: Optional[str] = Query(None, max_length=MEMBER_NAME_LENGTH),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get open tasks due between today and `days` days from now, soonest first
+
+    Served from the in-process deadline index like /api/tasks/overdue.
+    """
+    today = deadline_index.today
+    return deadline_page(today, today + timedelta(days=days + 1), project_id, assignee, limit, cursor)
+
+# ===== MEMBER ENDPOINTS =====
+
+@app.get("/api/members/{name}/projects", response_model=List[Project], tags=["Members"])
+async def get_member_projects(
+    name: str = Path(..., min_length=1, max_length=MEMBER_NAME_LENGTH),
+    include_tasks: TaskInclude = Query(TaskInclude.NONE),
+    fields: Optional[str] = Query(None, description="Comma-separated project fields to return"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get the projects whose team includes a member, found through project_members
+
+    Projects are ordered by id; the cursor for the next page is returned in
+    the X-Next-Cursor header.
+    """
+    fields = parse_fields(fields, PROJECT_FIELDS)
+    query = f"""SELECT {select_list(fields, PROJECT_COLUMNS, PROJECT_KEY_COLUMNS)} FROM projects
+                WHERE id IN (SELECT project_id FROM project_members WHERE member = %s)"""
+    params = [name]
+    if cursor:
+        query += " AND id > %s"
+        params.append(id_keyset(cursor))
+    query += " ORDER BY id LIMIT %s"
+    params.append(limit + 1)
+
+    async with db_session() as db:
+        try:
+            projects = await db.fetchall(query, params)
+            headers = {}
+            if len(projects) > limit:
+                projects = projects[:limit]
+                headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": projects[-1]['id']})
+            projects = await attach_tasks(db, projects, embedded_tasks(include_tasks, fields))
+        except DatabaseError as e:
+            logger.error(f"Error fetching member projects: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch member projects"
+            )
+
+    return Response(content=render_models(Project, projects, fields), media_type="application/json", headers=headers)
+
+@app.get("/api/members/{name}/tasks", response_model=List[Task], tags=["Members"])
+async def get_member_tasks(
+    name: str = Path(..., min_length=1, max_length=MEMBER_NAME_LENGTH),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    fields: Optional[str] = Query(None, description="Comma-separated task fields to return"),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get the tasks assigned to a member across all projects
+
+    Tasks are ordered by id; the cursor for the next page is returned in the
+    X-Next-Cursor header.
+    """
+    fields = parse_fields(fields, TASK_FIELDS)
+    query = f"SELECT {select_list(fields, TASK_FIELDS, TASK_KEY_COLUMNS)} FROM tasks WHERE assignee = %s"
+    params = [name]
+    if status_filter:
+        query += " AND status = %s"
+        params.append(status_filter)
+    if cursor:
+        query += " AND id > %s"
+        params.append(id_keyset(cursor))
+    query += " ORDER BY id LIMIT %s"
+    params.append(limit + 1)
+
+    async with db_session() as db:
+        try:
+            tasks = await db.fetchall(query, params)
+        except DatabaseError as e:
+            logger.error(f"Error fetching member tasks: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch member tasks"
+            )
+
+    headers = {}
+    if len(tasks) > limit:
+        tasks = tasks[:limit]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor({"id": tasks[-1]['id']})
+    return Response(content=render_models(Task, tasks, fields), media_type="application/json", headers=headers)
+
+# ===== SYNC ENDPOINT =====
+
+@app.get("/api/sync", response_model=SyncResult, tags=["Sync"])
+async def sync_changes(
+    response: Response,
+    since: Optional[str] = Query(None, description="Token returned by the previous sync; omit for a full snapshot"),
+    limit: int = Query(1000, ge=1, le=5000, description="Maximum projects, tasks and deletions each per page"),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get the projects and tasks created, updated or deleted since a sync token
+
+    Without `since` every project and task is returned. Results are paged
+    by id: while the X-Next-Cursor header is present, fetch the next page
+    with `cursor` in place of `since`. Only the last page carries the token
+    to pass on the next sync. Embedded tasks are not returned; tasks are
+    synced on their own.
+    """
+    if cursor:
+        issued, since_at, positions = sync_page_position(cursor)
+    else:
+        issued, since_at, positions = None, sync_since(since) if since else None, dict.fromkeys(SYNC_PAGE_KINDS, 0)
+
+    async with db_session() as db:
+        try:
+            now = await db_now(db)
+            # Every page reports changes up to the moment the first one was read
+            issued = issued or now
+            if since_at and SYNC_TOMBSTONE_DAYS > 0 and since_at < now - timedelta(days=SYNC_TOMBSTONE_DAYS):
+                raise HTTPException(
+                    status_code=status.HTTP_410_GONE,
+                    detail="Sync token expired; sync again without since"
+                )
+
+            changed = " AND updated_at >= %s" if since_at else ""
+            changed_params = [since_at] if since_at else []
+            projects = await db.fetchall(
+                f"SELECT * FROM projects WHERE id > %s{changed} ORDER BY id LIMIT %s",
+                [positions['projects'], *changed_params, limit + 1]
+            )
+            tasks = await db.fetchall(
+                f"SELECT * FROM tasks WHERE id > %s{changed} ORDER BY id LIMIT %s",
+                [positions['tasks'], *changed_params, limit + 1]
+            )
+            tombstones = []
+            if since_at:
+                # A row restored from the archive after its tombstone was
+                # written is live again and comes back through the changed rows
+                tombstones = await db.fetchall(
+                    """SELECT t.id, t.entity, t.entity_id FROM tombstones t
+                       WHERE t.id > %s AND t.deleted_at >= %s
+                       AND NOT EXISTS (SELECT 1 FROM projects p WHERE t.entity = 'project' AND p.id = t.entity_id)
+                       AND NOT EXISTS (SELECT 1 FROM tasks k WHERE t.entity = 'task' AND k.id = t.entity_id)
+                       ORDER BY t.id LIMIT %s""",
+                    (positions['tombstones'], since_at, limit + 1)
+                )
+
+            more = False
+            for kind, rows in (("projects", projects), ("tasks", tasks), ("tombstones", tombstones)):
+                if len(rows) > limit:
+                    more = True
+                    del rows[limit:]
+                if rows:
+                    positions[kind] = rows[-1]['id']
+
+            projects = await attach_tasks(db, projects, TaskInclude.NONE)
+        except DatabaseError as e:
+            logger.error(f"Error syncing changes: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to sync changes"
+            )
+
+    headers = {NEXT_CURSOR_HEADER: sync_page_cursor(issued, since_at, positions)} if more else {}
+    result = {
+        "token": None if more else sync_token(issued),
+        "projects": projects,
+        "tasks": tasks,
+        "deleted_projects": [row['entity_id'] for row in tombstones if row['entity'] == 'project'],
+        "deleted_tasks": [row['entity_id'] for row in tombstones if row['entity'] == 'task']
+    }
+    if FAST_JSON:
+        result['projects'] = [project_json(project) for project in projects]
+        result['tasks'] = [task_json(task) for task in tasks]
+        return Response(content=dumps_json(result), media_type="application/json", headers=headers)
+    response.headers.update(headers)
+    return result
+
+# ===== CHANGE FEED ENDPOINT =====
+
+@app.get("/api/changes", tags=["Sync"])
+async def stream_changes(
+    request: Request,
+    project_id: Optional[List[int]] = Query(None, description="Only stream changes of these projects"),
+    last_event_id: Optional[int] = Header(None, description="Resume after this event id")
+):
+    """Stream project and task changes as Server-Sent Events
+
+    Events are named project.created, project.updated, project.deleted,
+    project.progress, task.created, task.updated, task.deleted and
+    tasks.bulk. A `reset` event means changes were missed and the client
+    should refetch; an `overflow` event ends a stream that fell behind.
+    """
+    subscription, missed = await change_broker.subscribe(set(project_id) if project_id else None, last_event_id)
+    return StreamingResponse(
+        change_stream(request, subscription, missed),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 # ===== STATISTICS ENDPOINT =====
 
 @app.get("/api/statistics", response_model=ProjectStats, tags=["Analytics"])
-def get_statistics():
-    """Get project statistics"""
-    with get_db_connection() as conn:
-        cursor = conn.cursor(dictionary=True)
-        try:
-            cursor.execute("SELECT status, COUNT(*) as count FROM projects GROUP BY status")
-            project_stats = {row['status']: row['count'] for row in cursor.fetchall()}
-
-            cursor.execute("SELECT status, COUNT(*) as count FROM tasks GROUP BY status")
-            task_stats = {row['status']: row['count'] for row in cursor.fetchall()}
-
-            cursor.execute("SELECT COUNT(*) as total FROM projects")
-            total_projects = cursor.fetchone()['total']
-
-            cursor.execute("SELECT AVG(progress) as avg_progress FROM projects")
-            avg_progress = cursor.fetchone()['avg_progress'] or 0
-
-            cursor.execute("SELECT COALESCE(SUM(budget), 0) as total_budget FROM projects")
-            total_budget = cursor.fetchone()['total_budget'] or 0
-
-            return {
-                "total_projects": total_projects,
-                "completed_projects": project_stats.get('completed', 0),
-                "in_progress_projects": project_stats.get('in-progress', 0),
-                "planning_projects": project_stats.get('planning', 0),
-                "total_tasks": sum(task_stats.values()),
-                "completed_tasks": task_stats.get('completed', 0),
-                "average_progress": float(avg_progress),
-                "total_budget": float(total_budget)
-            }
-        except Error as e:
+async def get_statistics():
+    """Get project statistics from the incrementally maintained rollup"""
+    cached = stats_cache.get("statistics")
+    if cached is not None:
+        return cached
+
+    async with db_session() as db:
+        try:
+            row = await db.fetchone("SELECT * FROM project_stats WHERE id = 1")
+            if not row:
+                # The rebuild writes, so it cannot run on the replica. On the
+                # primary it reuses this session: waiting for a second slot of
+                # the pool gate while holding one could wait on itself. The
+                # read transaction ends first so the rebuild's locking read
+                # starts a fresh one. A replica session may wait for a
+                # primary one, since nothing holding a primary slot waits
+                # for a replica slot.
+                if db.role == PRIMARY:
+                    await db.commit()
+                    row = await rebuild_project_stats(db)
+                else:
+                    async with db_session(PRIMARY) as primary:
+                        row = await rebuild_project_stats(primary)
+
+            result = stats_from_rollup(row)
+            stats_cache.set("statistics", result)
+            return result
+        except DatabaseError as e:
             logger.error(f"Error fetching statistics: {e}")
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to fetch statistics"
             )
 
+# ===== WORKLOAD ANALYTICS ENDPOINTS =====
+
+@app.get("/api/analytics/workload", response_model=List[MemberWorkload], tags=["Analytics"])
+async def get_workload():
+    """Get every assignee's task counts from the incrementally maintained workload rollup
+
+    Overdue counts are refreshed every WORKLOAD_REFRESH_INTERVAL seconds.
+    """
+    cached = workload_cache.get("workload")
+    if cached is not None:
+        return cached
+
+    async with db_session() as db:
+        try:
+            rows = await db.fetchall(
+                """SELECT assignee,
+                          SUM(tasks_pending + tasks_in_progress + tasks_completed) AS total_tasks,
+                          SUM(tasks_pending) AS pending_tasks,
+                          SUM(tasks_in_progress) AS in_progress_tasks,
+                          SUM(tasks_completed) AS completed_tasks,
+                          SUM(tasks_overdue) AS overdue_tasks,
+                          SUM(CASE WHEN tasks_pending + tasks_in_progress + tasks_completed > 0
+                                   THEN 1 ELSE 0 END) AS projects_count
+                   FROM assignee_stats
+                   GROUP BY assignee
+                   HAVING SUM(tasks_pending + tasks_in_progress + tasks_completed) > 0
+                   ORDER BY total_tasks DESC, assignee"""
+            )
+        except DatabaseError as e:
+            logger.error(f"Error fetching workload: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch workload"
+            )
+
+    result = [{column: value if column == 'assignee' else int(value) for column, value in row.items()} for row in rows]
+    workload_cache.set("workload", result)
+    return result
+
+@app.get("/api/analytics/assignments", response_model=List[AssignmentSummary], tags=["Analytics"])
+async def get_assignments(
+    response: Response,
+    assignee: Optional[str] = Query(None, max_length=255),
+    project_id: Optional[int] = Query(None, gt=0),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Get per-project task counts of each assignee from the workload rollup
+
+    Rows are ordered by assignee and project; the cursor for the next page is
+    returned in the X-Next-Cursor header.
+    """
+    key = json.dumps(["assignments", assignee, project_id, limit, cursor])
+    cached = workload_cache.get(key)
+    if cached is None:
+        cached = await load_assignments(assignee, project_id, limit, cursor)
+        workload_cache.set(key, cached)
+
+    rows, next_cursor = cached
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return rows
+
+async def load_assignments(assignee: Optional[str], project_id: Optional[int], limit: int, cursor: Optional[str]):
+    """Load one page of assignment summaries for get_assignments"""
+    query = """SELECT s.assignee, s.project_id, p.name AS project_name, p.status AS project_status,
+                      s.tasks_pending + s.tasks_in_progress + s.tasks_completed AS total_tasks,
+                      s.tasks_pending AS pending_tasks, s.tasks_in_progress AS in_progress_tasks,
+                      s.tasks_completed AS completed_tasks, s.tasks_overdue AS overdue_tasks
+               FROM assignee_stats s JOIN projects p ON p.id = s.project_id
+               WHERE s.tasks_pending + s.tasks_in_progress + s.tasks_completed > 0"""
+    params = []
+    if assignee:
+        query += " AND s.assignee = %s"
+        params.append(assignee)
+    if project_id:
+        query += " AND s.project_id = %s"
+        params.append(project_id)
+    if cursor:
+        values = decode_cursor(cursor)
+        try:
+            last_assignee, last_project_id = str(values["assignee"]), int(values["project_id"])
+        except (KeyError, ValueError, TypeError):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid cursor: not an assignment cursor"
+            )
+        query += " AND (s.assignee > %s OR (s.assignee = %s AND s.project_id > %s))"
+        params.extend([last_assignee, last_assignee, last_project_id])
+    query += " ORDER BY s.assignee, s.project_id LIMIT %s"
+    params.append(limit + 1)
+
+    async with db_session() as db:
+        try:
+            rows = await db.fetchall(query, params)
+        except DatabaseError as e:
+            logger.error(f"Error fetching assignments: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to fetch assignments"
+            )
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor({"assignee": rows[-1]['assignee'], "project_id": rows[-1]['project_id']})
+    return rows, next_cursor
+
+# ===== SEARCH ENDPOINT =====
+
+@app.get("/api/search", response_model=List[SearchHit], tags=["Search"])
+async def search(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=255),
+    scope: SearchScope = Query(SearchScope.ALL),
+    mode: SearchMode = Query(SearchMode.NATURAL, description="Use prefix for type-ahead"),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    priority_filter: Optional[str] = Query(None, alias="priority"),
+    category: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description=f"Opaque cursor from the {NEXT_CURSOR_HEADER} header")
+):
+    """Search projects and tasks through the FULLTEXT indexes, best matches first"""
+    if DB_DRIVER == "sqlite":
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail="Full-text search requires the MySQL backend"
+        )
+    if mode == SearchMode.PREFIX:
+        against = "AGAINST (%s IN BOOLEAN MODE)"
+        term = prefix_query(q)
+    else:
+        against = "AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        term = q
+
+    selects = []
+    params = []
+
+    if scope in (SearchScope.ALL, SearchScope.PROJECTS):
+        match = f"MATCH(p.name, p.description) {against}"
+        query = f"""SELECT 'project' AS kind, p.id, p.id AS project_id, p.name AS title,
+                           p.description, p.status, p.priority, p.category, {match} AS score
+                    FROM projects p WHERE {match}"""
+        params.extend([term, term])
+        if status_filter:
+            query += " AND p.status = %s"
+            params.append(status_filter)
+        if priority_filter:
+            query += " AND p.priority = %s"
+            params.append(priority_filter)
+        if category:
+            query += " AND p.category = %s"
+            params.append(category)
+        selects.append(query)
+
+    if scope in (SearchScope.ALL, SearchScope.TASKS):
+        match = f"MATCH(t.title, t.description) {against}"
+        query = f"""SELECT 'task' AS kind, t.id, t.project_id, t.title,
+                           t.description, t.status, t.priority, p.category, {match} AS score
+                    FROM tasks t JOIN projects p ON p.id = t.project_id WHERE {match}"""
+        params.extend([term, term])
+        if status_filter:
+            query += " AND t.status = %s"
+            params.append(status_filter)
+        if priority_filter:
+            query += " AND t.priority = %s"
+            params.append(priority_filter)
+        if category:
+            query += " AND p.category = %s"
+            params.append(category)
+        selects.append(query)
+
+    query = f"SELECT * FROM ({' UNION ALL '.join(selects)}) hits"
+
+    if cursor:
+        score, kind, last_id = search_keyset(cursor)
+        query += " WHERE (score < %s OR (score = %s AND (kind > %s OR (kind = %s AND id > %s))))"
+        params.extend([score, score, kind, kind, last_id])
+
+    query += " ORDER BY score DESC, kind ASC, id ASC LIMIT %s"
+    params.append(limit + 1)
+
+    async with db_session() as db:
+        try:
+            hits = await db.fetchall(query, params)
+        except DatabaseError as e:
+            logger.error(f"Error searching: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to search"
+            )
+
+    if len(hits) > limit:
+        hits = hits[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = search_cursor(hits[-1])
+
+    for hit in hits:
+        description = hit.pop('description') or ""
+        hit['snippet'] = description[:SEARCH_SNIPPET_LENGTH] or None
+    return hits
+
+# ===== EXPORT ENDPOINTS =====
+
+@app.get("/api/export/projects", tags=["Export"])
+async def export_projects(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    updated_since: Optional[datetime] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status")
+):
+    """Stream every matching project as NDJSON or CSV"""
+    query = f"SELECT {', '.join(PROJECT_EXPORT_COLUMNS)} FROM projects WHERE 1=1"
+    params = []
+
+    if updated_since:
+        query += " AND updated_at >= %s"
+        params.append(updated_since)
+
+    if status_filter:
+        query += " AND status = %s"
+        params.append(status_filter)
+
+    query += " ORDER BY id"
+    return export_response(query, params, PROJECT_EXPORT_COLUMNS, fmt, "projects")
+
+@app.get("/api/export/tasks", tags=["Export"])
+async def export_tasks(
+    fmt: ExportFormat = Query(ExportFormat.NDJSON, alias="format"),
+    updated_since: Optional[datetime] = Query(None),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    project_id: Optional[int] = Query(None, gt=0)
+):
+    """Stream every matching task as NDJSON or CSV"""
+    query = f"SELECT {', '.join(TASK_EXPORT_COLUMNS)} FROM tasks WHERE 1=1"
+    params = []
+
+    if updated_since:
+        query += " AND updated_at >= %s"
+        params.append(updated_since)
+
+    if status_filter:
+        query += " AND status = %s"
+        params.append(status_filter)
+
+    if project_id:
+        query += " AND project_id = %s"
+        params.append(project_id)
+
+    query += " ORDER BY id"
+    return export_response(query, params, TASK_EXPORT_COLUMNS, fmt, "tasks")
+
+# ===== ADMIN ENDPOINTS =====
+
+@app.post("/api/admin/statistics/rebuild", response_model=ProjectStats, tags=["Admin"])
+async def rebuild_statistics():
+    """Rebuild the statistics rollup from the projects and tasks tables"""
+    async with db_session() as db:
+        try:
+            values = await rebuild_project_stats(db)
+            logger.info("Statistics rollup rebuilt")
+            return stats_from_rollup(values)
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error rebuilding statistics: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to rebuild statistics"
+            )
+
+@app.post("/api/admin/task-counters/reconcile", tags=["Admin"])
+async def reconcile_counters():
+    """Recount tasks for every project and repair drifted progress counters"""
+    repaired = await reconcile_task_counters()
+    return {"message": "Task counters reconciled", "repaired_projects": repaired}
+
+@app.post("/api/admin/workload/rebuild", tags=["Admin"])
+async def rebuild_workload():
+    """Rebuild the per-assignee workload rollup from the tasks table"""
+    async with db_session() as db:
+        try:
+            rows = await rebuild_assignee_stats(db)
+            db.after_commit.append(workload_cache.invalidate)
+            logger.info("Workload rollup rebuilt")
+            return {"message": "Workload rollup rebuilt", "rows": rows}
+        except DatabaseError as e:
+            await db.rollback()
+            logger.error(f"Error rebuilding workload rollup: {e}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Failed to rebuild workload rollup"
+            )
+
+@app.post("/api/admin/archive", tags=["Admin"])
+async def run_archival(
+    older_than_days: int = Query(..., ge=0, description="Archive completed projects not updated for this many days")
+):
+    """Move old completed projects and their tasks to the archive tables now"""
+    archived = await archive_projects(older_than_days)
+    logger.info(f"Archived {archived} completed projects")
+    return {"message": "Archival finished", "archived": archived}
+
+@app.post("/api/admin/deadline-index/reload", tags=["Admin"])
+async def reload_deadline_index():
+    """Rebuild the in-process deadline index of this worker from the tasks table"""
+    indexed = await deadline_index.reload()
+    logger.info(f"Deadline index reloaded with {indexed} open tasks")
+    return {"message": "Deadline index reloaded", "tasks": indexed}
+
+@app.post("/api/admin/members/backfill", tags=["Admin"])
+async def backfill_members():
+    """Rebuild the project_members index from every project's team list"""
+    processed = await backfill_project_members()
+    return {"message": "Project members backfilled", "projects": processed}
+
 # ===== ERROR HANDLERS =====
 
 @app.exception_handler(HTTPException)
@@ -715,7 +5148,8 @@ async def http_exception_handler(request, exc):
             "error": "HTTP Error",
             "detail": exc.detail,
             "timestamp": datetime.now().isoformat()
-        }
+        },
+        headers=exc.headers
     )
 
 @app.exception_handler(Exception)
@@ -0,0 +1,508 @@
+# Project Management System - Benchmark Suite
+# Seeds a synthetic dataset into a local database and drives the real FastAPI
+# app in-process, reporting latency percentiles, throughput and SQL statements
+# per request. Results can be stored as a JSON baseline and later runs fail
+# when a scenario regresses past the configured threshold.
+#
+#   python benchmark.py --scale 10k
+#   python benchmark.py --scale 10k --update-baseline
+#   python benchmark.py --scale 100k --concurrency 32 --scenarios statistics,mixed
+#   python benchmark.py --scale 10k --cache
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import math
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ===== CONFIGURATION =====
+SCALES = {
+    "1k": 1_000,
+    "10k": 10_000,
+    "100k": 100_000,
+    "1m": 1_000_000
+}
+
+# Regular projects carry this many tasks; one extra project holds a large share
+TASKS_PER_PROJECT = 50
+LARGE_PROJECT_SHARE = 0.1
+LARGE_PROJECT_MAX_TASKS = 100_000
+SEED_BATCH_SIZE = 5_000
+# (project_id, task_id) pairs kept in memory for update requests
+TASK_SAMPLE_SIZE = 10_000
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baselines")
+
+TASK_STATUSES = ("pending", "in-progress", "completed")
+PRIORITIES = ("low", "medium", "high", "critical")
+ASSIGNEES = [f"member{index:03d}" for index in range(200)]
+CATEGORIES = ("engineering", "marketing", "operations", "research", "design")
+
+logger = logging.getLogger("benchmark")
+
+# ===== DATASET SEEDING =====
+class Dataset:
+    """Identifiers of the seeded rows that scenarios pick from"""
+
+    def __init__(self):
+        self.project_ids: List[int] = []
+        self.large_project_id: Optional[int] = None
+        self.task_sample: List[Tuple[int, int]] = []
+        self.task_count = 0
+
+def _task_row(rng: random.Random, project_id: int, index: int, status: str) -> tuple:
+    deadline = date(2026, 1, 1) + timedelta(days=rng.randrange(730))
+    return (
+        project_id,
+        f"Task {index} of project {project_id}",
+        "Synthetic benchmark task",
+        status,
+        deadline.isoformat(),
+        rng.choice(ASSIGNEES),
+        rng.choice(PRIORITIES)
+    )
+
+async def _insert_tasks(backend, rows: List[tuple]):
+    async with backend.db_session() as db:
+        await db.executemany(
+            """INSERT INTO tasks (project_id, title, description, status, deadline, assignee, priority)
+               VALUES (%s, %s, %s, %s, %s, %s, %s)""",
+            rows
+        )
+
+async def seed_dataset(backend, total_tasks: int, seed: int) -> Dataset:
+    """Insert projects and tasks with consistent counters, progress and rollup"""
+    rng = random.Random(seed)
+    large_tasks = min(int(total_tasks * LARGE_PROJECT_SHARE), LARGE_PROJECT_MAX_TASKS)
+    regular_tasks = total_tasks - large_tasks
+    project_count = max(1, regular_tasks // TASKS_PER_PROJECT)
+
+    # Decide every project's task mix up front so the counters are seeded
+    # together with the project rows
+    plans = []
+    for index in range(project_count + 1):
+        if index == project_count:
+            total = large_tasks
+        else:
+            total = regular_tasks // project_count + (1 if index < regular_tasks % project_count else 0)
+        completed = rng.randint(0, total) if total else 0
+        plans.append((total, completed))
+
+    project_rows = []
+    for index, (total, completed) in enumerate(plans):
+        progress, status = backend.progress_from_counts(total, completed)
+        name = "Large benchmark project" if index == project_count else f"Benchmark project {index:07d}"
+        project_rows.append((
+            name,
+            "Synthetic benchmark project",
+            status,
+            progress,
+            (date(2026, 1, 1) + timedelta(days=rng.randrange(730))).isoformat(),
+            rng.choice(PRIORITIES),
+            rng.randrange(1_000, 500_000),
+            json.dumps(rng.sample(ASSIGNEES, 3)),
+            rng.choice(CATEGORIES),
+            total,
+            completed
+        ))
+
+    async with backend.db_session() as db:
+        first_id = (await db.fetchone("SELECT COALESCE(MAX(id), 0) AS max_id FROM projects"))['max_id'] + 1
+        for start in range(0, len(project_rows), SEED_BATCH_SIZE):
+            await db.executemany(
+                """INSERT INTO projects (name, description, status, progress, deadline, priority,
+                                         budget, team, category, task_total, task_completed)
+                   VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)""",
+                project_rows[start:start + SEED_BATCH_SIZE]
+            )
+        rows = await db.fetchall("SELECT id FROM projects WHERE id >= %s ORDER BY id", (first_id,))
+
+    dataset = Dataset()
+    dataset.project_ids = [row['id'] for row in rows]
+    dataset.large_project_id = dataset.project_ids[-1]
+
+    batch = []
+    for project_id, (total, completed) in zip(dataset.project_ids, plans):
+        for index in range(total):
+            status = "completed" if index < completed else rng.choice(TASK_STATUSES[:2])
+            batch.append(_task_row(rng, project_id, index, status))
+            if len(batch) >= SEED_BATCH_SIZE:
+                await _insert_tasks(backend, batch)
+                batch = []
+    if batch:
+        await _insert_tasks(backend, batch)
+
+    await backend.backfill_project_members()
+    async with backend.db_session() as db:
+        await backend.rebuild_project_stats(db)
+        await backend.rebuild_assignee_stats(db)
+        dataset.task_count = (await db.fetchone("SELECT COUNT(*) AS count FROM tasks"))['count']
+        await load_task_sample(db, dataset, rng)
+    await backend.deadline_index.reload()
+    return dataset
+
+async def load_task_sample(db, dataset: Dataset, rng: random.Random):
+    """Pick a random sample of existing tasks for update requests"""
+    bounds = await db.fetchone("SELECT MIN(id) AS low, MAX(id) AS high FROM tasks")
+    if not bounds or bounds['low'] is None:
+        return
+    ids = sorted({rng.randint(bounds['low'], bounds['high']) for _ in range(TASK_SAMPLE_SIZE)})
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        placeholders = ", ".join(["%s"] * len(chunk))
+        rows = await db.fetchall(f"SELECT id, project_id FROM tasks WHERE id IN ({placeholders})", chunk)
+        dataset.task_sample.extend((row['project_id'], row['id']) for row in rows)
+
+async def load_dataset(backend, seed: int) -> Dataset:
+    """Describe a database seeded by an earlier run"""
+    rng = random.Random(seed)
+    dataset = Dataset()
+    async with backend.db_session() as db:
+        rows = await db.fetchall("SELECT id, task_total FROM projects ORDER BY id")
+        dataset.project_ids = [row['id'] for row in rows]
+        dataset.large_project_id = max(rows, key=lambda row: row['task_total'])['id'] if rows else None
+        dataset.task_count = (await db.fetchone("SELECT COUNT(*) AS count FROM tasks"))['count']
+        await load_task_sample(db, dataset, rng)
+    return dataset
+
+# ===== SCENARIOS =====
+# A scenario turns (dataset, rng) into one request: (method, path, params, body)
+Request = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+def list_projects(page_size: int, include_tasks: str = "summary",
+                  fields: Optional[str] = None) -> Callable[[Dataset, random.Random], Request]:
+    params = {"limit": page_size, "include_tasks": include_tasks}
+    if fields:
+        params["fields"] = fields
+    return lambda dataset, rng: ("GET", "/api/projects", params, None)
+
+def get_project(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", f"/api/projects/{rng.choice(dataset.project_ids[:-1] or dataset.project_ids)}", None, None)
+
+def get_large_project(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", f"/api/projects/{dataset.large_project_id}", None, None)
+
+def get_statistics(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", "/api/statistics", None, None)
+
+def get_workload(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", "/api/analytics/workload", None, None)
+
+def member_projects(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", f"/api/members/{rng.choice(ASSIGNEES)}/projects", {"limit": 100}, None)
+
+def member_tasks(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", f"/api/members/{rng.choice(ASSIGNEES)}/tasks", {"limit": 100}, None)
+
+def overdue_tasks(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", "/api/tasks/overdue", {"assignee": rng.choice(ASSIGNEES), "limit": 100}, None)
+
+def due_soon_tasks(dataset: Dataset, rng: random.Random) -> Request:
+    return ("GET", "/api/tasks/due-soon", {"days": 14, "limit": 100}, None)
+
+def create_task(dataset: Dataset, rng: random.Random) -> Request:
+    project_id = rng.choice(dataset.project_ids)
+    body = {
+        "title": f"Benchmark task {rng.randrange(10 ** 9)}",
+        "status": rng.choice(TASK_STATUSES),
+        "priority": rng.choice(PRIORITIES),
+        "assignee": rng.choice(ASSIGNEES),
+        "deadline": (date(2026, 1, 1) + timedelta(days=rng.randrange(730))).isoformat()
+    }
+    return ("POST", f"/api/projects/{project_id}/tasks", None, body)
+
+def update_task(dataset: Dataset, rng: random.Random) -> Request:
+    project_id, task_id = rng.choice(dataset.task_sample)
+    return ("PUT", f"/api/projects/{project_id}/tasks/{task_id}", None, {"status": rng.choice(TASK_STATUSES)})
+
+def batch_updates(size: int) -> Callable[[Dataset, random.Random], Request]:
+    """`size` task status changes sent as one /api/batch request"""
+    def scenario(dataset: Dataset, rng: random.Random) -> Request:
+        operations = [
+            {"op": "task.update", "project_id": project_id, "task_id": task_id,
+             "body": {"status": rng.choice(TASK_STATUSES)}}
+            for project_id, task_id in rng.sample(dataset.task_sample, min(size, len(dataset.task_sample)))
+        ]
+        return ("POST", "/api/batch", None, {"operations": operations})
+    return scenario
+
+MIXED_WORKLOAD = (
+    (0.30, list_projects(20)),
+    (0.30, get_project),
+    (0.20, get_statistics),
+    (0.15, update_task),
+    (0.05, create_task)
+)
+
+def mixed(dataset: Dataset, rng: random.Random) -> Request:
+    """80% reads, 20% writes"""
+    pick = rng.random()
+    for weight, scenario in MIXED_WORKLOAD:
+        if pick < weight:
+            return scenario(dataset, rng)
+        pick -= weight
+    return MIXED_WORKLOAD[-1][1](dataset, rng)
+
+SCENARIOS = {
+    "list_projects_20": list_projects(20),
+    "list_projects_100": list_projects(100),
+    "list_projects_500": list_projects(500),
+    "list_projects_100_full": list_projects(100, "full"),
+    "list_projects_100_tiles": list_projects(100, "none", "id,name,status,progress"),
+    "get_project": get_project,
+    "get_large_project": get_large_project,
+    "statistics": get_statistics,
+    "member_projects": member_projects,
+    "member_tasks": member_tasks,
+    "workload": get_workload,
+    "overdue_tasks": overdue_tasks,
+    "due_soon_tasks": due_soon_tasks,
+    "create_tasks": create_task,
+    "update_tasks": update_task,
+    "batch_updates_20": batch_updates(20),
+    "mixed": mixed
+}
+
+# ===== LOAD DRIVER =====
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def statements_issued(backend) -> float:
+    """Total SQL statements attributed to requests so far"""
+    return sum(
+        value for (route,), value in backend.metrics.statements.series.items()
+        if route != backend.BACKGROUND_ROUTE
+    )
+
+async def run_scenario(client, backend, dataset: Dataset, name: str, requests: int,
+                       warmup: int, concurrency: int, seed: int) -> Dict[str, Any]:
+    """Issue `requests` requests from `concurrency` workers and summarize them"""
+    scenario = SCENARIOS[name]
+    rng = random.Random(f"{seed}:{name}")
+    latencies: List[float] = []
+    errors = 0
+
+    async def issue(record: bool):
+        nonlocal errors
+        method, path, params, body = scenario(dataset, rng)
+        started = time.perf_counter()
+        response = await client.request(method, path, params=params, json=body)
+        elapsed = time.perf_counter() - started
+        if response.status_code >= 400:
+            errors += 1
+            if errors <= 3:
+                logger.warning(f"{name}: {method} {path} -> {response.status_code} {response.text[:200]}")
+        if record:
+            latencies.append(elapsed)
+
+    for _ in range(warmup):
+        await issue(False)
+
+    remaining = requests
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            remaining -= 1
+            await issue(True)
+
+    statements_before = statements_issued(backend)
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(concurrency, requests))))
+    wall = time.perf_counter() - started
+    statements = statements_issued(backend) - statements_before
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "concurrency": concurrency,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 3),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 3),
+        "p99_ms": round(percentile(latencies, 0.99) * 1000, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else 0.0,
+        "queries_per_request": round(statements / len(latencies), 2) if latencies else 0.0
+    }
+
+# ===== BASELINES =====
+LATENCY_KEYS = ("p50_ms", "p95_ms", "p99_ms")
+
+def find_regressions(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Describe every metric that is worse than the baseline by more than `threshold`"""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+        for key in LATENCY_KEYS:
+            if previous[key] and current[key] > previous[key] * (1 + threshold):
+                regressions.append(f"{name}: {key} {previous[key]} -> {current[key]}")
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(f"{name}: throughput_rps {previous['throughput_rps']} -> {current['throughput_rps']}")
+        # Statement counts are deterministic enough that any real increase matters
+        if current["queries_per_request"] > previous["queries_per_request"] * (1 + threshold) + 0.5:
+            regressions.append(
+                f"{name}: queries_per_request {previous['queries_per_request']} -> {current['queries_per_request']}"
+            )
+        if current["errors"] > previous["errors"]:
+            regressions.append(f"{name}: errors {previous['errors']} -> {current['errors']}")
+    return regressions
+
+def print_report(results: Dict[str, Any]):
+    meta = results["meta"]
+    print(f"\nscale={meta['scale']} tasks={meta['tasks']} projects={meta['projects']} driver={meta['driver']} "
+          f"project_cache_ttl={meta.get('project_cache_ttl', 0):g}")
+    header = f"{'scenario':<24}{'reqs':>7}{'err':>5}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'q/req':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, row in results["scenarios"].items():
+        print(
+            f"{name:<24}{row['requests']:>7}{row['errors']:>5}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}"
+            f"{row['p99_ms']:>10.2f}{row['throughput_rps']:>10.1f}{row['queries_per_request']:>8.2f}"
+        )
+
+# ===== MAIN ENTRY POINT =====
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Project Management API hot paths")
+    parser.add_argument("--scale", choices=SCALES, default="10k", help="Number of seeded tasks")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help="Comma-separated scenarios to run, in order")
+    parser.add_argument("--requests", type=int, default=300, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent in-flight requests")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for data and requests")
+    parser.add_argument("--db", help="SQLite file to use; defaults to a temporary file")
+    parser.add_argument("--reuse", action="store_true", help="Skip seeding when --db already holds data")
+    parser.add_argument("--cache", action="store_true",
+                        help="Serve reads from the project response cache; off by default so every request "
+                             "reaches the handlers and the database")
+    parser.add_argument("--output", help="Also write the results JSON to this path")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against (default: benchmark_baselines/<scale>.json)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store these results as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="Allowed relative slowdown before a metric counts as a regression")
+    args = parser.parse_args(argv)
+    unknown = [name for name in args.scenarios.split(",") if name not in SCENARIOS]
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(unknown)}")
+    return args
+
+async def run(args) -> int:
+    """Seed, benchmark and compare; returns the process exit code"""
+    import httpx
+
+    backend = importlib.import_module("backend")
+    logging.getLogger("backend").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    await backend.startup_event()
+    try:
+        async with backend.db_session() as db:
+            existing = (await db.fetchone("SELECT COUNT(*) AS count FROM tasks"))['count']
+        if args.reuse and existing:
+            logger.info(f"Reusing {existing} seeded tasks")
+            dataset = await load_dataset(backend, args.seed)
+        else:
+            if existing:
+                raise SystemExit("Database already holds tasks; pass --reuse or use an empty database")
+            started = time.perf_counter()
+            dataset = await seed_dataset(backend, SCALES[args.scale], args.seed)
+            logger.info(f"Seeded {dataset.task_count} tasks in {len(dataset.project_ids)} projects "
+                        f"in {time.perf_counter() - started:.1f}s")
+
+        results = {
+            "meta": {
+                "scale": args.scale,
+                "tasks": dataset.task_count,
+                "projects": len(dataset.project_ids),
+                "driver": backend.DB_DRIVER,
+                "pool_size": backend.DB_POOL_SIZE,
+                "read_pool_size": backend.pool_size(backend.REPLICA) if backend.REPLICA_ENABLED else 0,
+                "fast_json": backend.FAST_JSON,
+                "project_cache_ttl": backend.PROJECT_CACHE_TTL,
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "recorded_at": datetime.now().isoformat(timespec="seconds")
+            },
+            "scenarios": {}
+        }
+
+        transport = httpx.ASGITransport(app=backend.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=None) as client:
+            for name in args.scenarios.split(","):
+                logger.info(f"Running {name}")
+                results["scenarios"][name] = await run_scenario(
+                    client, backend, dataset, name, args.requests, args.warmup, args.concurrency, args.seed
+                )
+    finally:
+        await backend.shutdown_event()
+
+    print_report(results)
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+    baseline_path = args.baseline or os.path.join(BASELINE_DIR, f"{args.scale}.json")
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, "w") as handle:
+            json.dump(results, handle, indent=2)
+        print(f"\nBaseline written to {baseline_path}")
+        return 0
+
+    if not os.path.exists(baseline_path):
+        print(f"\nNo baseline at {baseline_path}; run with --update-baseline to create one")
+        return 0
+
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    if baseline.get("meta", {}).get("scale") != args.scale:
+        print(f"\nBaseline {baseline_path} was recorded at another scale; not comparing")
+        return 2
+    if baseline["meta"].get("project_cache_ttl", 0) != results["meta"]["project_cache_ttl"]:
+        print(f"\nBaseline {baseline_path} was recorded with another project cache setting; not comparing")
+        return 2
+
+    regressions = find_regressions(results, baseline, args.threshold)
+    if regressions:
+        print(f"\nRegressions beyond {args.threshold:.0%} against {baseline_path}:")
+        for line in regressions:
+            print(f"  {line}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%} against {baseline_path}")
+    return 0
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    # backend.py reads its configuration at import time
+    db_path = args.db or os.path.join(tempfile.mkdtemp(prefix="pm-benchmark-"), "benchmark.db")
+    os.environ.setdefault("DB_DRIVER", "sqlite")
+    os.environ["SQLITE_PATH"] = db_path
+    os.environ.setdefault("COUNTER_RECONCILE_INTERVAL", "0")
+    os.environ.setdefault("SLOW_QUERY_MS", "0")
+    # A warm project cache would answer the read scenarios without running
+    # their handlers or queries, hiding regressions on those paths
+    if not args.cache:
+        os.environ.setdefault("PROJECT_CACHE_TTL", "0")
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,11 @@ CREATE TABLE IF NOT EXISTS projects (
     budget DECIMAL(15, 2) DEFAULT 0 CHECK (budget >= 0),
     team JSON,
     category VARCHAR(100),
+    -- Task counters maintained by the API; progress and status derive from them
+    task_total INT NOT NULL DEFAULT 0,
+    task_completed INT NOT NULL DEFAULT 0,
+    -- Bumped by every write; If-Match on API writes compares against it
+    version INT NOT NULL DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
@@ -29,6 +34,8 @@ CREATE TABLE IF NOT EXISTS projects (
     INDEX idx_status (status),
     INDEX idx_priority (priority),
     INDEX idx_created_at (created_at),
+    INDEX idx_updated_at (updated_at),
+    INDEX idx_status_updated_at (status, updated_at),
     INDEX idx_deadline (deadline),
     INDEX idx_progress (progress),
     INDEX idx_category (category),
@@ -48,6 +55,8 @@ CREATE TABLE IF NOT EXISTS tasks (
     deadline DATE,
     assignee VARCHAR(255) COLLATE utf8mb4_unicode_ci,
     priority ENUM('low', 'medium', 'high', 'critical') DEFAULT 'medium',
+    -- Bumped by every write; If-Match on API writes compares against it
+    version INT NOT NULL DEFAULT 1,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     
@@ -61,11 +70,113 @@ CREATE TABLE IF NOT EXISTS tasks (
     INDEX idx_deadline (deadline),
     INDEX idx_assignee (assignee),
     INDEX idx_project_status (project_id, status),
+    -- Serve the paged task list (ORDER BY priority DESC, deadline ASC)
+    -- with and without a status filter
+    INDEX idx_project_status_priority (project_id, status, priority DESC, deadline),
+    INDEX idx_project_priority (project_id, priority DESC, deadline),
+    INDEX idx_updated_at (updated_at),
     
     -- Full-text search indexes
     FULLTEXT INDEX ft_title_description (title, description)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ===== STATISTICS ROLLUP TABLE =====
+-- Single-row counters maintained by the API write handlers so that
+-- /api/statistics does not aggregate the projects and tasks tables
+CREATE TABLE IF NOT EXISTS project_stats (
+    id TINYINT PRIMARY KEY,
+    projects_planning INT NOT NULL DEFAULT 0,
+    projects_in_progress INT NOT NULL DEFAULT 0,
+    projects_completed INT NOT NULL DEFAULT 0,
+    tasks_pending INT NOT NULL DEFAULT 0,
+    tasks_in_progress INT NOT NULL DEFAULT 0,
+    tasks_completed INT NOT NULL DEFAULT 0,
+    progress_sum BIGINT NOT NULL DEFAULT 0,
+    budget_sum DECIMAL(20, 2) NOT NULL DEFAULT 0
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ===== PROJECT MEMBERS TABLE =====
+-- Normalized copy of projects.team kept in sync by the API project
+-- handlers; rebuild with POST /api/admin/members/backfill
+CREATE TABLE IF NOT EXISTS project_members (
+    project_id INT NOT NULL,
+    member VARCHAR(255) NOT NULL COLLATE utf8mb4_unicode_ci,
+    PRIMARY KEY (project_id, member),
+    INDEX idx_member_project (member, project_id),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ===== WORKLOAD ROLLUP TABLE =====
+-- Task counts per assignee and project maintained by the API task write
+-- handlers, so that /api/analytics/workload and /api/analytics/assignments
+-- do not aggregate the tasks table. Overdue counts depend on the date and
+-- are refreshed by the API every WORKLOAD_REFRESH_INTERVAL seconds; rebuild
+-- at any time with POST /api/admin/workload/rebuild
+CREATE TABLE IF NOT EXISTS assignee_stats (
+    assignee VARCHAR(255) NOT NULL COLLATE utf8mb4_unicode_ci,
+    project_id INT NOT NULL,
+    tasks_pending INT NOT NULL DEFAULT 0,
+    tasks_in_progress INT NOT NULL DEFAULT 0,
+    tasks_completed INT NOT NULL DEFAULT 0,
+    tasks_overdue INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (assignee, project_id),
+    INDEX idx_project_id (project_id),
+    FOREIGN KEY (project_id) REFERENCES projects(id) ON DELETE CASCADE ON UPDATE CASCADE
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ===== ARCHIVE TABLES =====
+-- Completed projects not updated for ARCHIVE_AFTER_DAYS days, and their
+-- tasks, moved out of the live tables in batches by the API archival job
+-- (or POST /api/admin/archive); POST /api/projects/{id}/restore moves a
+-- project back. Rows keep their live ids.
+CREATE TABLE IF NOT EXISTS archived_projects (
+    id INT PRIMARY KEY,
+    name VARCHAR(255) NOT NULL,
+    description TEXT COLLATE utf8mb4_unicode_ci,
+    status ENUM('planning', 'in-progress', 'completed'),
+    progress INT,
+    deadline DATE,
+    priority ENUM('low', 'medium', 'high', 'critical'),
+    budget DECIMAL(15, 2),
+    team JSON,
+    category VARCHAR(100),
+    task_total INT NOT NULL DEFAULT 0,
+    task_completed INT NOT NULL DEFAULT 0,
+    version INT NOT NULL DEFAULT 1,
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_created_at (created_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+CREATE TABLE IF NOT EXISTS archived_tasks (
+    id INT PRIMARY KEY,
+    project_id INT NOT NULL,
+    title VARCHAR(255) NOT NULL COLLATE utf8mb4_unicode_ci,
+    description TEXT COLLATE utf8mb4_unicode_ci,
+    status ENUM('pending', 'in-progress', 'completed'),
+    deadline DATE,
+    assignee VARCHAR(255) COLLATE utf8mb4_unicode_ci,
+    priority ENUM('low', 'medium', 'high', 'critical'),
+    version INT NOT NULL DEFAULT 1,
+    created_at TIMESTAMP NULL,
+    updated_at TIMESTAMP NULL,
+    INDEX idx_project_id (project_id)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
+-- ===== TOMBSTONES TABLE =====
+-- Deleted projects and tasks, written by the API delete handlers (including
+-- the tasks removed by a project's cascade) so that /api/sync can report
+-- deletes; rows older than SYNC_TOMBSTONE_DAYS are pruned by the API
+CREATE TABLE IF NOT EXISTS tombstones (
+    id BIGINT AUTO_INCREMENT PRIMARY KEY,
+    entity ENUM('project', 'task') NOT NULL,
+    entity_id INT NOT NULL,
+    project_id INT NOT NULL,
+    deleted_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_deleted_at (deleted_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- ===== VIEWS FOR ANALYTICS AND REPORTING =====
 
 -- Comprehensive project summary with task aggregation
@@ -148,7 +259,8 @@ GROUP BY
 
 DELIMITER //
 
--- Calculate and update project progress based on task completion
+-- Recount a project's tasks and update its counters, progress and status.
+-- The API maintains these incrementally; this procedure repairs one project.
 CREATE PROCEDURE UpdateProjectProgress(IN projectId INT)
 BEGIN
     DECLARE total_tasks INT DEFAULT 0;
@@ -178,7 +290,8 @@ BEGIN
     END IF;
     
     UPDATE projects 
-    SET progress = new_progress, status = new_status 
+    SET progress = new_progress, status = new_status,
+        task_total = total_tasks, task_completed = completed_tasks
     WHERE id = projectId;
 END //
 
@@ -230,13 +343,14 @@ BEGIN
     ORDER BY t.deadline ASC, t.priority DESC;
 END //
 
--- Archive completed projects
+-- Mark fully progressed projects completed; the API archival job moves
+-- old completed projects to the archive tables
 CREATE PROCEDURE ArchiveCompletedProjects()
 BEGIN
     DECLARE affected_rows INT;
     
     UPDATE projects 
-    SET status = 'completed' 
+    SET status = 'completed', version = version + 1
     WHERE progress = 100 AND status != 'completed';
     
     SET affected_rows = ROW_COUNT();
@@ -296,31 +410,10 @@ DELIMITER ;
 
 DELIMITER //
 
--- Update project progress when task status changes
-CREATE TRIGGER update_progress_on_task_update
-AFTER UPDATE ON tasks
-FOR EACH ROW
-BEGIN
-    IF NEW.status != OLD.status THEN
-        CALL UpdateProjectProgress(NEW.project_id);
-    END IF;
-END //
-
--- Update project progress when task is inserted
-CREATE TRIGGER update_progress_on_task_insert
-AFTER INSERT ON tasks
-FOR EACH ROW
-BEGIN
-    CALL UpdateProjectProgress(NEW.project_id);
-END //
-
--- Update project progress when task is deleted
-CREATE TRIGGER update_progress_on_task_delete
-AFTER DELETE ON tasks
-FOR EACH ROW
-BEGIN
-    CALL UpdateProjectProgress(OLD.project_id);
-END //
+-- Project progress is no longer recounted by per-row triggers on tasks.
+-- The API task handlers update projects.task_total / task_completed by
+-- delta and derive progress and status from them; drift is repaired by
+-- POST /api/admin/task-counters/reconcile or CALL UpdateProjectProgress(id).
 
 -- Automatically update project timestamp
 CREATE TRIGGER update_project_timestamp
@@ -370,16 +463,17 @@ ON SCHEDULE EVERY 1 DAY
 STARTS CURRENT_TIMESTAMP
 DO
     UPDATE projects 
-    SET status = 'completed' 
+    SET status = 'completed', version = version + 1
     WHERE progress = 100 AND status != 'completed';
 
--- Event to archive old completed projects quarterly
+-- Event to mark old finished projects completed quarterly; moving them to
+-- the archive tables is done by the API archival job
 CREATE EVENT IF NOT EXISTS archive_old_projects
 ON SCHEDULE EVERY 3 MONTH
 STARTS CURRENT_TIMESTAMP
 DO
     UPDATE projects 
-    SET status = 'completed' 
+    SET status = 'completed', version = version + 1
     WHERE progress = 100 
     AND updated_at < DATE_SUB(NOW(), INTERVAL 6 MONTH)
     AND status != 'completed';
@@ -421,6 +515,60 @@ INSERT INTO tasks (project_id, title, description, status, deadline, priority, a
 (4, 'API Endpoint Development', 'Develop all required API endpoints', 'in-progress', '2025-12-15', 'high', 'Joseph Daniel Garcia'),
 (4, 'API Documentation and Testing', 'Write documentation and perform comprehensive testing', 'pending', '2025-12-30', 'high', 'Kevin James Harris');
 
+-- ===== SEED TASK COUNTERS =====
+UPDATE projects p
+JOIN (
+    SELECT project_id, COUNT(*) AS total, SUM(status = 'completed') AS completed
+    FROM tasks
+    GROUP BY project_id
+) c ON c.project_id = p.id
+SET p.task_total = c.total,
+    p.task_completed = c.completed,
+    p.progress = ROUND((c.completed / c.total) * 100),
+    p.status = CASE
+        WHEN ROUND((c.completed / c.total) * 100) = 0 THEN 'planning'
+        WHEN ROUND((c.completed / c.total) * 100) >= 100 THEN 'completed'
+        ELSE 'in-progress'
+    END;
+
+-- ===== SEED PROJECT MEMBERS =====
+INSERT IGNORE INTO project_members (project_id, member)
+SELECT p.id, m.member
+FROM projects p,
+     JSON_TABLE(p.team, '$[*]' COLUMNS (member VARCHAR(255) PATH '$')) m
+WHERE m.member IS NOT NULL AND m.member <> '';
+
+-- ===== SEED WORKLOAD ROLLUP =====
+INSERT INTO assignee_stats
+    (assignee, project_id, tasks_pending, tasks_in_progress, tasks_completed, tasks_overdue)
+SELECT
+    assignee,
+    project_id,
+    SUM(status = 'pending'),
+    SUM(status = 'in-progress'),
+    SUM(status = 'completed'),
+    SUM(deadline < CURDATE() AND status != 'completed')
+FROM tasks
+WHERE assignee IS NOT NULL AND assignee != ''
+GROUP BY assignee, project_id;
+
+-- ===== SEED STATISTICS ROLLUP =====
+-- Rebuild at any time with POST /api/admin/statistics/rebuild
+INSERT INTO project_stats (
+    id, projects_planning, projects_in_progress, projects_completed,
+    tasks_pending, tasks_in_progress, tasks_completed, progress_sum, budget_sum
+)
+SELECT
+    1,
+    (SELECT COUNT(*) FROM projects WHERE status = 'planning'),
+    (SELECT COUNT(*) FROM projects WHERE status = 'in-progress'),
+    (SELECT COUNT(*) FROM projects WHERE status = 'completed'),
+    (SELECT COUNT(*) FROM tasks WHERE status = 'pending'),
+    (SELECT COUNT(*) FROM tasks WHERE status = 'in-progress'),
+    (SELECT COUNT(*) FROM tasks WHERE status = 'completed'),
+    (SELECT COALESCE(SUM(progress), 0) FROM projects),
+    (SELECT COALESCE(SUM(budget), 0) FROM projects);
+
 -- ===== SAMPLE QUERIES FOR TESTING =====
 
 -- Get all projects with task summary
@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import backend
+
+
+def test_gate_queues_waiters_and_sheds_a_full_queue():
+    async def scenario():
+        gate = backend.AdmissionGate("test", 1, 1, 5)
+        await gate.acquire()
+        queued = asyncio.create_task(gate.acquire())
+        await asyncio.sleep(0)
+        assert len(gate.waiters) == 1
+
+        with pytest.raises(HTTPException) as shed:
+            await gate.acquire()
+        assert shed.value.status_code == 503
+        assert shed.value.headers["Retry-After"] == str(backend.RETRY_AFTER_SECONDS)
+
+        # Releasing hands the slot straight to the queued request
+        gate.release()
+        await queued
+        assert (gate.in_use, len(gate.waiters)) == (1, 0)
+        gate.release()
+        assert gate.in_use == 0
+
+    asyncio.run(scenario())
+
+
+def test_gate_sheds_a_request_that_waits_too_long():
+    async def scenario():
+        gate = backend.AdmissionGate("test", 1, 1, 0.05)
+        await gate.acquire()
+        with pytest.raises(HTTPException) as shed:
+            await gate.acquire()
+        assert shed.value.status_code == 503
+        assert "timed out" in shed.value.detail
+        assert (gate.in_use, len(gate.waiters)) == (1, 0)
+
+    asyncio.run(scenario())
+
+
+def test_busy_route_group_gets_503_with_retry_after(client, monkeypatch):
+    gate = backend.AdmissionGate("export", 1, 0, 0.05)
+    monkeypatch.setattr(backend, "route_gates", [(("/api/export/",), gate)])
+    client.portal.call(gate.acquire)
+    try:
+        response = client.get("/api/export/projects")
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == str(backend.RETRY_AFTER_SECONDS)
+        # Other routes are not held to the export gate
+        assert client.get("/api/projects").status_code == 200
+    finally:
+        gate.release()
+    assert client.get("/api/export/projects").status_code == 200
+    assert gate.in_use == 0
+
+
+async def _drop_statistics_rollup():
+    async with backend.db_session(backend.PRIMARY) as db:
+        await db.execute("DELETE FROM project_stats")
+
+
+def test_statistics_rebuild_fits_in_a_one_connection_pool(client, monkeypatch):
+    client.post("/api/projects", json={"name": "Admission statistics"})
+    client.portal.call(_drop_statistics_rollup)
+    backend.stats_cache.invalidate()
+    # No queue: a nested checkout of a second connection would be shed at once
+    gate = backend.AdmissionGate("primary_pool", 1, 0, 0.05)
+    monkeypatch.setitem(backend.admission_gates, "primary_pool", gate)
+
+    response = client.get("/api/statistics")
+    assert response.status_code == 200
+    assert response.json()["total_projects"] >= 1
+    assert gate.in_use == 0
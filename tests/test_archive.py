@@ -0,0 +1,68 @@
+import backend
+
+
+async def _backdate_project(project_id):
+    async with backend.db_session(backend.PRIMARY) as db:
+        await db.execute("UPDATE projects SET updated_at = %s WHERE id = %s", ("2000-01-01 00:00:00", project_id))
+
+
+def _archived_project(client, name):
+    project_id = client.post("/api/projects", json={"name": name}).json()["id"]
+    task_ids = [
+        client.post(f"/api/projects/{project_id}/tasks", json={
+            "title": f"archived task {i}", "assignee": "cid", "status": "completed"
+        }).json()["id"]
+        for i in range(2)
+    ]
+    assert client.get(f"/api/projects/{project_id}").json()["status"] == "completed"
+    client.portal.call(_backdate_project, project_id)
+    response = client.post("/api/admin/archive", params={"older_than_days": 30})
+    assert response.status_code == 200 and response.json()["archived"] >= 1
+    return project_id, task_ids
+
+
+def test_archive_and_restore_round_trip(client, monkeypatch):
+    monkeypatch.setattr(backend, "ARCHIVE_BATCH_PAUSE", 0)
+    token = client.get("/api/sync").json()["token"]
+    project_id, task_ids = _archived_project(client, "Archive round trip")
+
+    assert client.get(f"/api/projects/{project_id}").status_code == 404
+    archived = client.get(f"/api/projects/{project_id}", params={"include_archived": True}).json()
+    assert archived["archived_at"] is not None
+    assert [task["id"] for task in archived["tasks"]] == task_ids
+    listed = client.get("/api/projects", params={"limit": 100}).json()
+    assert project_id not in [project["id"] for project in listed]
+    listed = client.get("/api/projects", params={"limit": 100, "include_archived": True}).json()
+    assert project_id in [project["id"] for project in listed]
+
+    delta = client.get("/api/sync", params={"since": token}).json()
+    assert project_id in delta["deleted_projects"]
+    assert set(task_ids) <= set(delta["deleted_tasks"])
+
+    restored = client.post(f"/api/projects/{project_id}/restore")
+    assert restored.status_code == 200
+    assert restored.json()["id"] == project_id
+    assert restored.json()["archived_at"] is None
+    assert [task["id"] for task in restored.json()["tasks"]] == task_ids
+    assert client.get(f"/api/projects/{project_id}").status_code == 200
+    assert client.post(f"/api/projects/{project_id}/restore").status_code == 404
+
+    # The restored rows come back as changes and their tombstones are suppressed
+    delta = client.get("/api/sync", params={"since": token}).json()
+    assert project_id in [project["id"] for project in delta["projects"]]
+    assert set(task_ids) <= {task["id"] for task in delta["tasks"]}
+    assert project_id not in delta["deleted_projects"]
+    assert not set(task_ids) & set(delta["deleted_tasks"])
+
+
+def test_restore_conflicts_with_a_live_project_of_the_same_name(client, monkeypatch):
+    monkeypatch.setattr(backend, "ARCHIVE_BATCH_PAUSE", 0)
+    project_id, _ = _archived_project(client, "Archive name clash")
+    clash_id = client.post("/api/projects", json={"name": "Archive name clash"}).json()["id"]
+
+    response = client.post(f"/api/projects/{project_id}/restore")
+    assert response.status_code == 409
+    assert client.get(f"/api/projects/{project_id}", params={"include_archived": True}).json()["archived_at"]
+
+    client.delete(f"/api/projects/{clash_id}")
+    assert client.post(f"/api/projects/{project_id}/restore").status_code == 200
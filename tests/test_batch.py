@@ -0,0 +1,33 @@
+def test_atomic_failure_reports_every_operation(client):
+    project_id = client.post("/api/projects", json={"name": "Batch atomic"}).json()["id"]
+    task_id = client.post(f"/api/projects/{project_id}/tasks", json={"title": "only task"}).json()["id"]
+    before = client.get(f"/api/projects/{project_id}").json()
+
+    response = client.post("/api/batch", json={"operations": [
+        {"op": "task.update", "project_id": project_id, "task_id": task_id, "body": {"status": "completed"}},
+        {"op": "project.create", "body": {"name": "Batch atomic rolled back"}},
+        {"op": "task.delete", "project_id": project_id, "task_id": 999999},
+        {"op": "task.create", "project_id": project_id, "body": {"title": "never created"}},
+    ]})
+
+    assert response.status_code == 404
+    body = response.json()
+    assert body["committed"] is False
+    assert [result["index"] for result in body["results"]] == [0, 1, 2, 3]
+    assert [result["outcome"] for result in body["results"]] == ["rolled_back", "rolled_back", "failed", "not_executed"]
+    assert [result["status"] for result in body["results"]] == [424, 424, 404, 424]
+    assert client.get(f"/api/projects/{project_id}").json() == before
+
+
+def test_committed_batch_marks_each_operation(client):
+    project_id = client.post("/api/projects", json={"name": "Batch independent"}).json()["id"]
+
+    response = client.post("/api/batch", json={"mode": "independent", "operations": [
+        {"op": "task.create", "project_id": project_id, "body": {"title": "kept task"}},
+        {"op": "task.delete", "project_id": project_id, "task_id": 999999},
+    ]})
+
+    assert response.status_code == 200
+    assert [(result["status"], result["outcome"]) for result in response.json()["results"]] == [
+        (201, "committed"), (404, "failed")
+    ]
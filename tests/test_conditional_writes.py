@@ -0,0 +1,39 @@
+def test_task_writes_keep_the_project_etag(client):
+    created = client.post("/api/projects", json={"name": "Conditional project"})
+    project_id = created.json()["id"]
+    project_etag = f'"{created.json()["version"]}"'
+
+    task = client.post(f"/api/projects/{project_id}/tasks", json={"title": "first task"})
+    task_id = task.json()["id"]
+    client.put(f"/api/projects/{project_id}/tasks/{task_id}", json={"status": "completed"})
+    client.post(f"/api/projects/{project_id}/tasks", json={"title": "second task"})
+    client.delete(f"/api/projects/{project_id}/tasks/{task_id}")
+
+    # The task writes moved the derived counters but not the project version
+    project = client.get(f"/api/projects/{project_id}").json()
+    assert project["version"] == created.json()["version"]
+
+    response = client.put(f"/api/projects/{project_id}", json={"name": "Conditional renamed"},
+                          headers={"If-Match": project_etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != project_etag
+
+    # A project write does bump it, so the old tag is now stale
+    response = client.put(f"/api/projects/{project_id}", json={"category": "stale"},
+                          headers={"If-Match": project_etag})
+    assert response.status_code == 412
+
+
+def test_task_writes_bump_the_task_etag(client):
+    project_id = client.post("/api/projects", json={"name": "Conditional task"}).json()["id"]
+    created = client.post(f"/api/projects/{project_id}/tasks", json={"title": "versioned task"})
+    task_id = created.json()["id"]
+    task_etag = f'"{created.json()["version"]}"'
+
+    response = client.put(f"/api/projects/{project_id}/tasks/{task_id}", json={"status": "in-progress"},
+                          headers={"If-Match": task_etag})
+    assert response.status_code == 200
+    response = client.put(f"/api/projects/{project_id}/tasks/{task_id}", json={"status": "completed"},
+                          headers={"If-Match": task_etag})
+    assert response.status_code == 412
+    assert response.headers["ETag"] == f'"{created.json()["version"] + 1}"'
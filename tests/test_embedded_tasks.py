@@ -0,0 +1,35 @@
+import backend
+
+
+def _create_project(client, name, task_count):
+    project_id = client.post("/api/projects", json={"name": name}).json()["id"]
+    for i in range(task_count):
+        client.post(f"/api/projects/{project_id}/tasks", json={"title": f"task {i}"})
+    return project_id
+
+
+def test_embedded_task_cap_applies_with_and_without_fields(client, monkeypatch):
+    monkeypatch.setattr(backend, "EMBEDDED_TASK_LIMIT", 3)
+    project_id = _create_project(client, "Embedded cap", 6)
+
+    full = client.get(f"/api/projects/{project_id}").json()
+    assert len(full["tasks"]) == 3
+    assert full["task_summary"]["total"] == 6
+    assert full["tasks_url"] == f"/api/projects/{project_id}/tasks?limit=100"
+
+    sparse = client.get(f"/api/projects/{project_id}", params={"fields": "id,name,tasks"}).json()
+    assert set(sparse) == {"id", "name", "tasks"}
+    assert len(sparse["tasks"]) == 3
+
+    listed = client.get("/api/projects", params={"fields": "id,tasks", "limit": 100}).json()
+    project = next(project for project in listed if project["id"] == project_id)
+    assert set(project) == {"id", "tasks"}
+    assert len(project["tasks"]) == 3
+
+
+def test_small_projects_embed_every_task_with_fields(client, monkeypatch):
+    monkeypatch.setattr(backend, "EMBEDDED_TASK_LIMIT", 3)
+    project_id = _create_project(client, "Embedded small", 2)
+
+    sparse = client.get(f"/api/projects/{project_id}", params={"fields": "id,tasks"}).json()
+    assert len(sparse["tasks"]) == 2
@@ -0,0 +1,65 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+import backend
+
+
+def _task(task_id, **overrides):
+    row = {
+        "id": task_id, "project_id": 7, "title": f"Task {task_id}", "description": None,
+        "status": "in-progress", "deadline": date(2026, 3, 1), "assignee": "ann", "priority": "high",
+        "version": 3, "created_at": datetime(2026, 1, 2, 3, 4, 5), "updated_at": datetime(2026, 1, 5, 6, 7, 8)
+    }
+    row.update(overrides)
+    return row
+
+
+def _project(**overrides):
+    row = {
+        "id": 7, "name": "Parity", "description": "Rows as the database returns them", "status": "planning",
+        "progress": 40, "deadline": date(2026, 12, 31), "priority": "critical", "budget": Decimal("1500.50"),
+        "team": ["ann", "bob"], "category": "eng", "task_total": 2, "task_completed": 0, "version": 5,
+        "created_at": datetime(2026, 1, 1, 9, 30, 0), "updated_at": datetime(2026, 2, 1, 10, 0, 0),
+        "tasks": [_task(1), _task(2, deadline=None, assignee=None, status="pending")],
+        "task_summary": None, "tasks_url": None
+    }
+    row.update(overrides)
+    return row
+
+
+def _render(monkeypatch, fast, model, rows, fields=None):
+    monkeypatch.setattr(backend, "FAST_JSON", fast)
+    return json.loads(backend.render_models(model, rows, fields))
+
+
+@pytest.mark.parametrize("rows", [
+    _project(),
+    _project(budget=None, team=[], deadline=None, description=None, tasks=[]),
+    _project(task_summary={"total": 3, "pending": 1, "in_progress": 1, "completed": 1},
+             tasks_url="/api/projects/7/tasks?limit=100", archived_at=datetime(2026, 6, 1, 0, 0, 0)),
+    [_project(), _project(id=8, name="Second", budget=Decimal("0.00"))],
+])
+def test_project_fast_path_matches_validated_path(monkeypatch, rows):
+    assert _render(monkeypatch, True, backend.Project, rows) == _render(monkeypatch, False, backend.Project, rows)
+
+
+@pytest.mark.parametrize("rows", [
+    _task(1),
+    [_task(1), _task(2, deadline=None, description="x", priority="low", status="completed")],
+])
+def test_task_fast_path_matches_validated_path(monkeypatch, rows):
+    assert _render(monkeypatch, True, backend.Task, rows) == _render(monkeypatch, False, backend.Task, rows)
+
+
+@pytest.mark.parametrize("model, row, fields", [
+    (backend.Project, _project(), ("name", "budget", "team", "tasks", "created_at")),
+    (backend.Project, _project(), ("id", "progress", "deadline")),
+    (backend.Task, _task(1), ("title", "deadline", "created_at")),
+])
+@pytest.mark.parametrize("fast", [True, False])
+def test_field_projection_matches_validated_fields(monkeypatch, model, row, fields, fast):
+    full = _render(monkeypatch, False, model, row)
+    assert _render(monkeypatch, fast, model, row, fields) == {field: full[field] for field in fields}
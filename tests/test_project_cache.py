@@ -0,0 +1,34 @@
+import asyncio
+
+import backend
+
+
+def test_generations_are_forgotten_after_they_expire(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(backend.time, "monotonic", lambda: clock[0])
+    cache = backend.ProjectCache(ttl=30, max_entries=100)
+
+    for project_id in range(1, 501):
+        asyncio.run(cache.invalidate(project_id))
+    assert asyncio.run(cache.generation("project:7")) > 0
+    assert len(cache._generations) == 501
+
+    # Once the TTL and grace period have passed, the next bump drops every older scope
+    clock[0] += cache.ttl + backend.PROJECT_CACHE_GENERATION_GRACE + 1
+    asyncio.run(cache.invalidate(1))
+    assert set(cache._generations) == {backend.PROJECT_LIST_SCOPE, "project:1"}
+    assert asyncio.run(cache.generation("project:7")) == 0
+
+
+def test_generation_values_are_never_reused(monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(backend.time, "monotonic", lambda: clock[0])
+    cache = backend.ProjectCache(ttl=30, max_entries=100)
+
+    seen = set()
+    for _ in range(3):
+        asyncio.run(cache.invalidate(7))
+        generation = asyncio.run(cache.generation("project:7"))
+        assert generation not in seen
+        seen.add(generation)
+        clock[0] += cache.ttl + backend.PROJECT_CACHE_GENERATION_GRACE + 1
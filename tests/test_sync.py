@@ -0,0 +1,59 @@
+from datetime import datetime
+
+import backend
+
+
+def _sync(client, **params):
+    """Follow X-Next-Cursor through every page of one sync and merge the pages"""
+    merged = {"projects": [], "tasks": [], "deleted_projects": [], "deleted_tasks": []}
+    pages = 0
+    while True:
+        response = client.get("/api/sync", params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages += 1
+        for key in merged:
+            merged[key].extend(body[key])
+        cursor = response.headers.get(backend.NEXT_CURSOR_HEADER)
+        if not cursor:
+            assert body["token"]
+            merged["token"] = body["token"]
+            return merged, pages
+        assert body["token"] is None
+        params = {"cursor": cursor, "limit": params.get("limit", 1000)}
+
+
+def test_snapshot_and_delta_are_paged(client):
+    project_ids = [client.post("/api/projects", json={"name": f"Sync paged {i}"}).json()["id"] for i in range(3)]
+    task_ids = [
+        client.post(f"/api/projects/{project_ids[0]}/tasks", json={"title": f"sync task {i}"}).json()["id"]
+        for i in range(5)
+    ]
+
+    snapshot, pages = _sync(client, limit=2)
+    assert pages > 1
+    assert set(project_ids) <= {project["id"] for project in snapshot["projects"]}
+    assert set(task_ids) <= {task["id"] for task in snapshot["tasks"]}
+    assert len({task["id"] for task in snapshot["tasks"]}) == len(snapshot["tasks"])
+    assert snapshot == _sync(client)[0] | {"token": snapshot["token"]}
+
+    client.put(f"/api/projects/{project_ids[1]}/tasks/{task_ids[1]}", json={"title": "sync task renamed"})
+    client.delete(f"/api/projects/{project_ids[0]}/tasks/{task_ids[2]}")
+    client.delete(f"/api/projects/{project_ids[2]}")
+
+    delta, pages = _sync(client, since=snapshot["token"], limit=1)
+    assert pages > 1
+    assert task_ids[1] in {task["id"] for task in delta["tasks"]}
+    assert task_ids[2] in delta["deleted_tasks"]
+    assert project_ids[2] in delta["deleted_projects"]
+    assert project_ids[2] not in {project["id"] for project in delta["projects"]}
+
+
+def test_expired_sync_token_is_gone(client):
+    expired = backend.sync_token(datetime(2000, 1, 1))
+    response = client.get("/api/sync", params={"since": expired})
+    assert response.status_code == 410
+
+    cursor = backend.sync_page_cursor(datetime.now(), datetime(2000, 1, 1), dict.fromkeys(backend.SYNC_PAGE_KINDS, 0))
+    assert client.get("/api/sync", params={"cursor": cursor}).status_code == 410
+    assert client.get("/api/sync", params={"cursor": backend.encode_cursor({"id": 1})}).status_code == 400
@@ -0,0 +1,76 @@
+from datetime import date, timedelta
+
+import backend
+
+
+async def _assignee_stats():
+    async with backend.db_session(backend.PRIMARY) as db:
+        return await db.fetchall(
+            """SELECT assignee, project_id, tasks_pending, tasks_in_progress, tasks_completed, tasks_overdue
+               FROM assignee_stats ORDER BY assignee, project_id"""
+        )
+
+
+async def _rebuilt_assignee_stats():
+    async with backend.db_session(backend.PRIMARY) as db:
+        await backend.rebuild_assignee_stats(db)
+    return await _assignee_stats()
+
+
+def test_empty_assignee_update_keeps_rollup_in_step(client):
+    project_id = client.post("/api/projects", json={"name": "Workload empty assignee"}).json()["id"]
+    task_ids = [
+        client.post(f"/api/projects/{project_id}/tasks", json={"title": f"task {i}", "assignee": "ann"}).json()["id"]
+        for i in range(3)
+    ]
+
+    # An empty assignee writes no assignee clause, so the task stays with ann
+    response = client.put(f"/api/projects/{project_id}/tasks/{task_ids[0]}", json={"assignee": ""})
+    assert response.status_code == 200
+    response = client.post(f"/api/projects/{project_id}/tasks:bulk", json={
+        "update": [{"id": task_ids[1], "assignee": "", "status": "completed"}]
+    })
+    assert response.status_code == 200
+
+    incremental = client.portal.call(_assignee_stats)
+    ann = next(row for row in incremental if row['assignee'] == "ann" and row['project_id'] == project_id)
+    assert (ann['tasks_pending'], ann['tasks_completed']) == (2, 1)
+    assert incremental == client.portal.call(_rebuilt_assignee_stats)
+
+
+def test_overdue_counts_follow_task_writes(client):
+    project_id = client.post("/api/projects", json={"name": "Workload overdue"}).json()["id"]
+    past = (date.today() - timedelta(days=3)).isoformat()
+    future = (date.today() + timedelta(days=30)).isoformat()
+    task_ids = [
+        client.post(f"/api/projects/{project_id}/tasks", json={
+            "title": f"late task {i}", "assignee": "bob", "deadline": past
+        }).json()["id"]
+        for i in range(6)
+    ]
+
+    def bob():
+        rows = client.portal.call(_assignee_stats)
+        return next(row for row in rows if row['assignee'] == "bob" and row['project_id'] == project_id)
+
+    assert bob()['tasks_overdue'] == 6
+    assert client.portal.call(_assignee_stats) == client.portal.call(_rebuilt_assignee_stats)
+
+    # Completing, rescheduling and deleting each take a task off the overdue count
+    client.put(f"/api/projects/{project_id}/tasks/{task_ids[0]}", json={"status": "completed"})
+    client.put(f"/api/projects/{project_id}/tasks/{task_ids[1]}", json={"deadline": future})
+    client.delete(f"/api/projects/{project_id}/tasks/{task_ids[2]}")
+    client.post(f"/api/projects/{project_id}/tasks:bulk", json={
+        "update": [{"id": task_ids[3], "status": "completed"}, {"id": task_ids[4], "deadline": future}]
+    })
+    assert bob()['tasks_overdue'] == 1
+    assert client.portal.call(_assignee_stats) == client.portal.call(_rebuilt_assignee_stats)
+
+    # Moving a deadline into the past or reopening a late task counts it again
+    client.put(f"/api/projects/{project_id}/tasks/{task_ids[1]}", json={"deadline": past})
+    client.put(f"/api/projects/{project_id}/tasks/{task_ids[0]}", json={"status": "in-progress"})
+    assert bob()['tasks_overdue'] == 3
+    assert client.portal.call(_assignee_stats) == client.portal.call(_rebuilt_assignee_stats)
+
+    workload = {row['assignee']: row for row in client.get("/api/analytics/workload").json()}
+    assert workload["bob"]['overdue_tasks'] >= 3